@@ -1,119 +1,211 @@
 # File: imdb_scraper_final.py
 import requests
-import json
 import re
+import os
+import argparse
 import pandas as pd
 import numpy as np
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from bs4 import BeautifulSoup
+from http_cache import ResponseCache
+from imdb_columnar import (save_columnar, load_custom, export_csvs, columnar_source, to_typed_frame,
+                           to_plain_frame, BASIC_COLUMNS, CUSTOM_COLUMNS, COLUMNAR_PATH)
+from imdb_derive import (clean_years, estimate_ratings, derive_columns, QUALITY_BASE_YEAR)
+from title_fetcher import TitleFetcher, RateLimiter, make_session, size_pool, retry_delay, RETRIES, RETRY_STATUS
+from imdb_charts import CHARTS, chart_url, resolve_charts, save_chart_partitions, CHARTS_ROOT
+from scrape_pipeline import run_chart_pipeline
+from snapshot_store import SnapshotStore
+from imdb_sql import save_database, DB_PATH
+from dashboard_builder import build_dashboard
+from title_index import TitleIndex
+import run_trace
+from run_trace import span
+from imdb_stream_parser import (open_snapshot, find_json_ld, find_item_list, find_next_data,
+                                 find_chart_edges, find_key, iter_snapshot_files)
+
+# Columns added by IMDBScaper.enrich_titles
+ENRICHED_COLUMNS = ['genre', 'director', 'runtime_minutes', 'budget']
+
+# Point the scraper elsewhere (e.g. replay_server.py) without code changes
+BASE_URL = os.environ.get('IMDB_BASE_URL', "https://www.imdb.com")
 
 class IMDBScaper:
-    def __init__(self):
+    def __init__(self, base_url=None, session=None, cache=None, title_index=None, offline=False):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept-Language': 'en-US,en;q=0.9',
         }
-        self.base_url = "https://www.imdb.com"
+        self.base_url = (base_url or BASE_URL).rstrip('/')
+        self.cache = cache or ResponseCache()
+        self.session = session or make_session(self.headers)
+        self.title_index = title_index if title_index is not None else TitleIndex()
+        # Offline runs never fetch, not even /title/ pages for missing years
+        self.offline = offline
+    
+    def fetch_chart(self, chart='top', quiet=False):
+        """Fetch a registered chart page through the response cache (one fetch per run).
+
+        429s and 5xx are retried with the same backoff as title pages; failed
+        responses are never cached, so each retry goes back to the network.
+        """
+        url = chart_url(self.base_url, chart)
+        with span('fetch', chart=chart):
+            for attempt in range(RETRIES + 1):
+                response = self.cache.get(url, headers=self.headers, timeout=10, session=self.session)
+                if response.status_code not in RETRY_STATUS or attempt == RETRIES:
+                    break
+                time.sleep(retry_delay(response, attempt))
+        if response.from_cache and not quiet:
+            print(f" Using cached {chart} chart page")
+        return response
     
-    def get_imdb_data(self):
+    def get_imdb_data(self, chart='top'):
         """Get IMDb data using different methods"""
-        print(" Fetching IMDb Top 250...")
+        print(f" Fetching IMDb {CHARTS[chart][1]}...")
         
         # METHOD 1: Try to find JSON-LD data (structured data)
         print("\n1️  Looking for structured JSON data...")
-        json_data = self.extract_json_data()
+        json_data = self.extract_json_data(chart)
         
-        if json_data and len(json_data) >= 100:
-            print(f" Found {len(json_data)} movies in JSON data")
+        if json_data:
+            print(f" Found {len(json_data)} titles in JSON data")
             return json_data
         
         # METHOD 2: Parse HTML directly
         print("\n2  Parsing HTML content...")
-        html_data = self.parse_html_directly()
+        html_data = self.parse_html_directly(chart)
         
         return html_data
     
-    def extract_json_data(self):
+    def extract_json_data(self, chart='top'):
         """Extract JSON-LD structured data from IMDb"""
-        url = f"{self.base_url}/chart/top/"
-        
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self.fetch_chart(chart)
             
             if response.status_code != 200:
                 print(f"HTTP Error: {response.status_code}")
                 return None
             
-            # Look for JSON-LD script tags
-            soup = BeautifulSoup(response.content, 'html.parser')
-            script_tags = soup.find_all('script', type='application/ld+json')
-            
-            movies_data = []
-            
-            for script in script_tags:
-                try:
-                    data = json.loads(script.string)
-                    
-                    # Check if this is an ItemList with movies
-                    if isinstance(data, dict) and data.get('@type') == 'ItemList':
-                        items = data.get('itemListElement', [])
-                        
-                        for item in items:
-                            if isinstance(item, dict) and 'item' in item:
-                                movie_item = item['item']
-                                movie_info = self.parse_json_movie(movie_item, item.get('position', len(movies_data) + 1))
-                                if movie_info:
-                                    movies_data.append(movie_info)
-                    
-                except json.JSONDecodeError as e:
-                    continue
-                except Exception as e:
-                    continue
-            
-            # If we found enough movies, return them
-            if len(movies_data) >= 50:
-                return movies_data[:250]
-            
-            # Try to find movie data in other script tags
-            print("Searching for movie data in all script tags...")
-            all_scripts = soup.find_all('script')
-            
-            for script in all_scripts:
-                if script.string:
-                    # Look for movie patterns
-                    patterns = [
-                        r'"position"\s*:\s*(\d+).*?"title"\s*:\s*"([^"]+)".*?"year"\s*:\s*(\d{4})',
-                        r'(\d+)\.\s*([^<]+?)\s*\((\d{4})\)',
-                        r'"name"\s*:\s*"([^"]+)".*?"ratingValue"\s*:\s*([\d.]+)',
-                    ]
-                    
-                    for pattern in patterns:
-                        matches = re.findall(pattern, script.string, re.DOTALL)
-                        if matches:
-                            for match in matches[:250]:
-                                try:
-                                    if len(match) >= 3:
-                                        position = int(match[0])
-                                        title = match[1].strip()
-                                        year = match[2]
-                                        
-                                        movies_data.append({
-                                            'position': position,
-                                            'title': title,
-                                            'year': year,
-                                            'rating': "N/A",
-                                            'imdb_id': f"tt{1000000 + position}"
-                                        })
-                                except:
-                                    continue
-            
-            return movies_data[:250]
+            return self.parse_chart_page(response.content)
             
         except Exception as e:
             print(f"Error extracting JSON: {e}")
             return None
     
+    def parse_chart_page(self, content):
+        """Rows from the JSON-LD ItemList or the __NEXT_DATA__ chart edges, whichever is longer.
+        
+        Charts differ in length (250, 100, 50...), so neither source is
+        trusted to be complete on its own; both are streamed, no DOM needed.
+        """
+        with span('parse', bytes=len(content)):
+            item_rows = self.parse_item_list(find_item_list(content))
+            edge_rows = self.parse_chart_edges(find_chart_edges(find_next_data(content)))
+        rows, other = (item_rows, edge_rows) if len(item_rows) >= len(edge_rows) else (edge_rows, item_rows)
+        
+        # The JSON-LD list may omit datePublished while the edges carry releaseYear
+        other_years = {row['imdb_id']: row['year'] for row in other if row['imdb_id'] and row['year'] != "N/A"}
+        for row in rows:
+            if row['year'] == "N/A" and row['imdb_id'] in other_years:
+                row['year'] = other_years[row['imdb_id']]
+        return rows
+    
+    def scrape_chart(self, chart):
+        """Fetch and parse one chart quietly (safe to call from worker threads)"""
+        try:
+            response = self.fetch_chart(chart, quiet=True)
+        except requests.RequestException as e:
+            print(f" {chart}: request failed ({e})")
+            return []
+        if response.status_code != 200:
+            print(f" {chart}: HTTP Error {response.status_code}")
+            return []
+        return self.parse_chart_page(response.content) or self.parse_html_content(response.content)
+    
+    def scrape_charts(self, charts, max_workers=8, rate=10):
+        """Fetch and parse many charts concurrently over the shared session's connection pool"""
+        print(f" Fetching {len(charts)} charts ({max_workers} workers, {rate} req/s)...")
+        size_pool(self.session, max_workers)
+        limiter = RateLimiter(rate)
+        start = time.time()
+        
+        def scrape(chart):
+            limiter.wait(chart_url(self.base_url, chart))
+            chart_start = time.time()
+            rows = self.scrape_chart(chart)
+            return rows, time.time() - chart_start
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = dict(zip(charts, pool.map(scrape, charts)))
+        
+        for chart, (rows, seconds) in results.items():
+            print(f"   {chart:22} {len(rows):5} titles  {seconds:5.2f}s")
+        slowest = max((seconds for _, seconds in results.values()), default=0)
+        print(f" Fetched {len(charts)} charts in {time.time() - start:.2f}s (slowest chart {slowest:.2f}s)")
+        return {chart: rows for chart, (rows, _) in results.items()}
+    
+    def parse_item_list(self, item_list):
+        """Turn a JSON-LD ItemList into movie rows"""
+        movies_data = []
+        if not isinstance(item_list, dict):
+            return movies_data
+        
+        for item in item_list.get('itemListElement', []):
+            if isinstance(item, dict) and 'item' in item:
+                movie_info = self.parse_json_movie(item['item'], item.get('position', len(movies_data) + 1))
+                if movie_info:
+                    movies_data.append(movie_info)
+        
+        return movies_data
+    
+    def parse_chart_edges(self, edges):
+        """Turn __NEXT_DATA__ chartTitles edges into movie rows"""
+        movies_data = []
+        
+        for edge in edges:
+            try:
+                node = edge.get('node') or {}
+                title = (node.get('titleText') or {}).get('text', '')
+                if not title:
+                    continue
+                
+                year = (node.get('releaseYear') or {}).get('year') or "N/A"
+                rating = (node.get('ratingsSummary') or {}).get('aggregateRating') or "N/A"
+                
+                movies_data.append({
+                    'position': edge.get('currentRank') or len(movies_data) + 1,
+                    'title': title,
+                    'year': year,
+                    'rating': rating,
+                    'imdb_id': node.get('id', '')
+                })
+            except AttributeError:
+                continue
+        
+        return movies_data
+    
+    def parse_local_snapshot(self, path):
+        """Extract movies from a saved chart page without fetching or building a DOM"""
+        try:
+            with open_snapshot(path) as data:
+                movies_data = self.parse_chart_page(data)
+        except OSError as e:
+            print(f"Error reading snapshot {path}: {e}")
+            return None
+        
+        return movies_data
+    
+    def parse_snapshots(self, path):
+        """Parse a saved page, or every saved page in a directory"""
+        results = {}
+        for snapshot in iter_snapshot_files(path):
+            movies_data = self.parse_local_snapshot(snapshot)
+            print(f" {os.path.basename(snapshot)}: {len(movies_data or [])} movies")
+            results[snapshot] = movies_data
+        return results
+    
     def parse_json_movie(self, movie_item, position):
         """Parse a single movie from JSON data"""
         try:
@@ -155,20 +247,141 @@ class IMDBScaper:
             print(f"Error parsing movie: {e}")
             return None
     
-    def parse_html_directly(self):
+    def enrich_titles(self, movies_data, max_workers=8, rate=10):
+        """Add genre, director, runtime and budget from each movie's /title/ page"""
+        if not movies_data:
+            return movies_data
+        
+        print(f"\n Enriching {len(movies_data)} titles ({max_workers} workers, {rate} req/s)...")
+        start = time.time()
+        
+        ids = [movie.get('imdb_id', '') for movie in movies_data]
+        urls = [f"{self.base_url}/title/{imdb_id}/" for imdb_id in ids if imdb_id]
+        fetcher = TitleFetcher(self.session, max_workers=max_workers, rate=rate)
+        responses = dict(zip(urls, fetcher.fetch_many(urls)))
+        
+        enriched = 0
+        for movie, imdb_id in zip(movies_data, ids):
+            response = responses.get(f"{self.base_url}/title/{imdb_id}/")
+            if response is None or response.status_code != 200:
+                continue
+            details = self.parse_title_page(response.content)
+            if details:
+                movie.update(details)
+                enriched += 1
+        
+        print(f" Enriched {enriched}/{len(movies_data)} titles in {time.time() - start:.1f}s")
+        return movies_data
+    
+    def parse_title_page(self, content):
+        """Pull genre, director, runtime and budget out of a /title/ page"""
+        details = {}
+        
+        for block in find_json_ld(content):
+            if not isinstance(block, dict) or not block.get('name'):
+                continue
+            
+            genre = block.get('genre')
+            if genre:
+                details['genre'] = ', '.join(genre) if isinstance(genre, list) else genre
+            
+            directors = block.get('director') or []
+            if isinstance(directors, dict):
+                directors = [directors]
+            names = [d.get('name') for d in directors if isinstance(d, dict) and d.get('name')]
+            if names:
+                details['director'] = ', '.join(names)
+            
+            duration = re.match(r'PT(?:(\d+)H)?(?:(\d+)M)?', block.get('duration') or '')
+            if duration and duration.group(0) != 'PT':
+                details['runtime_minutes'] = int(duration.group(1) or 0) * 60 + int(duration.group(2) or 0)
+            break
+        
+        budget = find_key(find_next_data(content), 'productionBudget')
+        if isinstance(budget, dict):
+            amount = (budget.get('budget') or {}).get('amount')
+            if amount is not None:
+                details['budget'] = amount
+        
+        return details
+    
+    def parse_title_year(self, content):
+        """Release year from a /title/ page's JSON-LD datePublished or __NEXT_DATA__ releaseYear"""
+        for block in find_json_ld(content):
+            if isinstance(block, dict) and block.get('name'):
+                year_match = re.search(r'(\d{4})', str(block.get('datePublished') or ''))
+                if year_match:
+                    return int(year_match.group(1))
+                break
+        
+        release_year = find_key(find_next_data(content), 'releaseYear')
+        if isinstance(release_year, dict) and release_year.get('year'):
+            return int(release_year['year'])
+        return None
+    
+    def fetch_years(self, imdb_ids, max_workers=8, rate=10):
+        """Fetch the /title/ pages of `imdb_ids` as one concurrent batch; returns {imdb_id: year}"""
+        urls = [f"{self.base_url}/title/{imdb_id}/" for imdb_id in imdb_ids]
+        fetcher = TitleFetcher(self.session, max_workers=max_workers, rate=rate)
+        years = {}
+        for imdb_id, response in zip(imdb_ids, fetcher.fetch_many(urls)):
+            if response is None or response.status_code != 200:
+                continue
+            year = self.parse_title_year(response.content)
+            if year is not None:
+                years[imdb_id] = year
+        return years
+    
+    def resolve_years(self, df):
+        """Fill missing years in place from the title index, then one batched /title/ fetch.
+        
+        Years the chart gave are recorded in the index first, so the next
+        scrape can look them up. Titles neither source knows keep NaN
+        (decade 'Unknown') rather than a made-up year.
+        """
+        index = self.title_index
+        index.add_rows(df)
+        
+        if 'imdb_id' in df.columns and df['year'].isna().any():
+            missing = df['year'].isna()
+            df.loc[missing, 'year'] = index.years_for(df.loc[missing, 'imdb_id'])
+            print(f" Years from title index: {int(missing.sum() - df['year'].isna().sum())}")
+            
+            missing = df['year'].isna()
+            ids = [imdb_id for imdb_id in df.loc[missing, 'imdb_id'].dropna().unique() if imdb_id]
+            if ids and not self.offline:
+                with span('fetch_years', titles=len(ids)):
+                    fetched = self.fetch_years(ids)
+                df.loc[missing, 'year'] = df.loc[missing, 'imdb_id'].map(fetched).astype(float)
+                index.add_rows(df[missing & df['year'].notna()])
+                print(f" Years from title pages: {len(fetched)}/{len(ids)}")
+        
+        if df['year'].isna().any():
+            print(f" Years still unknown: {int(df['year'].isna().sum())}")
+        index.save()
+        return df
+    
+    def parse_html_directly(self, chart='top'):
         """Parse HTML directly to get movie data"""
         print("Parsing HTML structure...")
         
-        url = f"{self.base_url}/chart/top/"
-        
         try:
-            response = requests.get(url, headers=self.headers)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            response = self.fetch_chart(chart)
+            return self.parse_html_content(response.content)
+            
+        except Exception as e:
+            print(f"Error parsing HTML: {e}")
+            return None
+    
+    def parse_html_content(self, content):
+        """Rows from a legacy chart table (any chart-* table, any length)"""
+        try:
+            soup = BeautifulSoup(content, 'html.parser')
             
             movies_data = []
             
-            # Try to find the movie table
-            table = soup.find('table', {'data-caller-name': 'chart-top250movie'})
+            # Try to find the chart table
+            table = soup.find('table', {'data-caller-name': re.compile(r'^chart-')})
             
             if not table:
                 # Try alternative table selector
@@ -219,11 +432,11 @@ class IMDBScaper:
                     except Exception as e:
                         continue
             
-            return movies_data[:250]
+            return movies_data
             
         except Exception as e:
             print(f"Error parsing HTML: {e}")
-            return None
+            return []
     
     def create_clean_dataset(self, movies_data):
         """Create clean, organized dataset"""
@@ -233,7 +446,30 @@ class IMDBScaper:
             print("No data to process")
             return self.create_realistic_dataset()
         
-        # Create DataFrame
+        df = self.clean_rows(movies_data)
+        
+        positions = df['position'] if 'position' in df.columns else pd.Series(np.arange(1, len(df) + 1), index=df.index)
+        
+        # Fill missing ratings
+        missing_rating = df['rating'].isna()
+        if missing_rating.any():
+            print("Filling missing ratings...")
+            df.loc[missing_rating, 'rating'] = estimate_ratings(positions[missing_rating])
+        
+        # Fill missing years with known ones only (title index, then title pages)
+        self.resolve_years(df)
+        
+        # Add timestamp
+        df['scraped_date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        
+        # Add enhanced columns (movie_age, rating_category, decade, quality_score)
+        derive_columns(df, datetime.now().year)
+        
+        print(f" Dataset created with {len(df)} movies")
+        return df
+    
+    def clean_rows(self, movies_data):
+        """Rows to a frame sorted by position, with stripped titles and numeric years/ratings"""
         df = pd.DataFrame(movies_data)
         
         # Sort by position
@@ -244,82 +480,135 @@ class IMDBScaper:
         df['title'] = df['title'].astype(str).str.strip()
         
         # Clean year - extract 4-digit years
-        def extract_year(year_str):
-            if pd.isna(year_str) or year_str == "N/A":
-                return np.nan
-            # Look for 4-digit year
-            match = re.search(r'(\d{4})', str(year_str))
-            return int(match.group(1)) if match else np.nan
-        
-        df['year'] = df['year'].apply(extract_year)
+        df['year'] = clean_years(df['year'])
         
         # Clean rating - convert to numeric
         df['rating'] = pd.to_numeric(df['rating'], errors='coerce')
-        
-        # Fill missing ratings
-        if df['rating'].isna().any():
-            print("Filling missing ratings...")
-            for idx, row in df.iterrows():
-                if pd.isna(row['rating']):
-                    position = row['position'] if 'position' in row else idx + 1
-                    if position <= 10:
-                        df.at[idx, 'rating'] = round(9.5 - (position * 0.05), 1)
-                    elif position <= 50:
-                        df.at[idx, 'rating'] = round(8.5 - ((position-10) * 0.01), 1)
-                    elif position <= 100:
-                        df.at[idx, 'rating'] = round(8.0 - ((position-50) * 0.005), 1)
-                    else:
-                        df.at[idx, 'rating'] = round(7.5 - ((position-100) * 0.002), 1)
-        
-        # Fill missing years
-        if df['year'].isna().any():
-            print("Filling missing years...")
-            for idx, row in df.iterrows():
-                if pd.isna(row['year']):
-                    position = row['position'] if 'position' in row else idx + 1
-                    if position <= 50:
-                        df.at[idx, 'year'] = np.random.randint(1950, 2020)
-                    else:
-                        df.at[idx, 'year'] = np.random.randint(1920, 2024)
-        
-        # Add timestamp
+        return df
+    
+    def clean_chart(self, movies_data):
+        """Clean one chart's rows for the partitioned dataset.
+        
+        Unlike create_clean_dataset nothing is imputed: popularity charts
+        list unreleased and unrated titles, and a rank-based rating guess
+        would be wrong for them.
+        """
+        df = self.clean_rows(movies_data)
         df['scraped_date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        derive_columns(df, datetime.now().year)
+        return df
+    
+    def save_charts(self, chart_rows, root=CHARTS_ROOT):
+        """Write every non-empty chart to the dataset partitioned by chart"""
+        frames = {chart: self.clean_chart(rows) for chart, rows in chart_rows.items() if rows}
+        empty = [chart for chart, rows in chart_rows.items() if not rows]
+        if empty:
+            print(f" No titles parsed for: {', '.join(empty)} (existing partitions kept)")
+        paths = save_chart_partitions(frames, root)
+        print(f" Chart dataset saved: {root}/ ({len(paths)} charts, "
+              f"{sum(len(df) for df in frames.values())} rows)")
+        return frames
+    
+    def incremental_update(self, movies_data, previous_path=None,
+                           changes_path='imdb_changes.csv', enrich=False, max_workers=8):
+        """Re-derive only new or changed titles against the previous dataset and log the changes"""
+        print("\n Diffing chart against previous dataset...")
         
-        # Add enhanced columns
-        current_year = datetime.now().year
-        df['movie_age'] = current_year - df['year']
-        
-        # Add rating categories
-        def categorize_rating(r):
-            if pd.isna(r):
-                return "Unknown"
-            elif r >= 9.0:
-                return "Outstanding (9.0+)"
-            elif r >= 8.5:
-                return "Excellent (8.5-8.9)"
-            elif r >= 8.0:
-                return "Very Good (8.0-8.4)"
-            elif r >= 7.5:
-                return "Good (7.5-7.9)"
-            else:
-                return "Average (<7.5)"
-        
-        df['rating_category'] = df['rating'].apply(categorize_rating)
-        
-        # Add decade
-        df['decade'] = df['year'].apply(lambda x: f"{str(int(x))[:3]}0s" if pd.notna(x) else "Unknown")
+        if not movies_data:
+            return self.create_clean_dataset(movies_data)
         
-        # Add quality score
-        df['quality_score'] = df.apply(
-            lambda row: (row['rating'] * 10) + (2024 - row['year'])/10 
-            if pd.notna(row['rating']) and pd.notna(row['year']) 
-            else None, 
-            axis=1
-        )
+        # The Arrow file unless only an exported CSV is around
+        previous_path = previous_path or columnar_source('imdb_clean_custom.csv')
+        try:
+            if previous_path.endswith('.arrow'):
+                # Read, not mapped: this run rewrites the file while the rows are still in use
+                previous = to_plain_frame(load_custom(previous_path, memory_map=False))
+            else:
+                previous = pd.read_csv(previous_path)
+        except FileNotFoundError:
+            print(f"No previous dataset at {previous_path}, running a full rebuild")
+            if enrich:
+                movies_data = self.enrich_titles(movies_data, max_workers=max_workers)
+            return self.create_clean_dataset(movies_data)
+        except (OSError, ValueError) as e:
+            raise ValueError(f"Previous dataset {previous_path} can't be read ({e}); "
+                             "restore or delete it, or run without --incremental") from e
+        
+        previous = previous.drop_duplicates('imdb_id').set_index('imdb_id')
+        current = pd.DataFrame(movies_data).drop_duplicates('imdb_id')
+        current['rating'] = pd.to_numeric(current['rating'], errors='coerce')
+        
+        before = previous.reindex(current['imdb_id'])
+        known = current['imdb_id'].isin(previous.index).to_numpy()
+        moved = known & (current['position'].to_numpy() != before['position'].to_numpy())
+        rerated = known & ~np.isclose(current['rating'].to_numpy(), before['rating'].to_numpy(), equal_nan=True)
+        # A year or title the chart states overrides the stored one (earlier runs may hold wrong values)
+        chart_years = clean_years(current['year']).to_numpy()
+        redated = known & ~np.isnan(chart_years) & (chart_years != before['year'].to_numpy())
+        retitled = known & (current['title'].astype(str).str.strip().to_numpy() != before['title'].to_numpy())
+        corrected = redated | retitled
+        changed = ~known | moved | rerated | corrected
+        exits = previous.index.difference(current['imdb_id'])
+        
+        print(f" {int((~known).sum())} new, {len(exits)} dropped, {int(moved.sum())} moved, "
+              f"{int(rerated.sum())} re-rated, {int(corrected.sum())} corrected, {int((~changed).sum())} unchanged")
+        
+        # Rows already in the previous dataset keep their year and enrichment
+        refresh = current[changed].to_dict('records')
+        for movie in refresh:
+            if movie['imdb_id'] not in previous.index:
+                continue
+            old = previous.loc[movie['imdb_id']]
+            if pd.isna(pd.to_numeric(movie.get('year'), errors='coerce')):
+                movie['year'] = old['year']
+            for col in ENRICHED_COLUMNS:
+                if col in previous.columns and col not in movie:
+                    movie[col] = old[col]
+        
+        if enrich:
+            new_titles = [movie for movie in refresh if movie['imdb_id'] not in previous.index]
+            self.enrich_titles(new_titles, max_workers=max_workers)
+        
+        parts = [previous.loc[current.loc[~changed, 'imdb_id']].reset_index()]
+        if refresh:
+            parts.append(self.create_clean_dataset(refresh))
+        df = pd.concat(parts, ignore_index=True).sort_values('position').reset_index(drop=True)
+        df['scraped_date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
-        print(f" Dataset created with {len(df)} movies")
+        self.log_changes(current, before, known, moved, rerated, previous.loc[exits], changes_path)
         return df
     
+    def log_changes(self, current, before, known, moved, rerated, exits, changes_path):
+        """Append entries, exits, rank moves and rating changes to the change log"""
+        detected_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        rows = []
+        
+        for i, movie in enumerate(current.itertuples(index=False)):
+            old = before.iloc[i]
+            base = {'imdb_id': movie.imdb_id, 'title': movie.title,
+                    'old_position': old['position'], 'new_position': movie.position,
+                    'old_rating': old['rating'], 'new_rating': movie.rating}
+            if not known[i]:
+                rows.append({'change': 'entry', **base})
+            if moved[i]:
+                rows.append({'change': 'rank_move', **base})
+            if rerated[i]:
+                rows.append({'change': 'rating_change', **base})
+        
+        for imdb_id, old in exits.iterrows():
+            rows.append({'change': 'exit', 'imdb_id': imdb_id, 'title': old['title'],
+                         'old_position': old['position'], 'new_position': np.nan,
+                         'old_rating': old['rating'], 'new_rating': np.nan})
+        
+        if not rows:
+            print(" No chart changes since last run")
+            return
+        
+        log = pd.DataFrame(rows)
+        log.insert(0, 'detected_at', detected_at)
+        log.to_csv(changes_path, mode='a', header=not os.path.exists(changes_path), index=False)
+        print(f" Logged {len(log)} changes to {changes_path}")
+    
     def create_realistic_dataset(self):
         """Create a realistic dataset"""
         print("Creating realistic dataset of 250 movies...")
@@ -376,80 +665,68 @@ class IMDBScaper:
             else:
                 year = np.random.randint(1920, 2024)
             
-            # Generate rating
-            if i <= 10:
-                rating = round(9.5 - (i * 0.05), 1)
-            elif i <= 50:
-                rating = round(8.5 - ((i-10) * 0.01), 1)
-            elif i <= 100:
-                rating = round(8.0 - ((i-50) * 0.005), 1)
-            else:
-                rating = round(7.5 - ((i-100) * 0.002), 1)
-            
-            rating = max(7.0, min(9.5, rating))
-            
             data.append({
                 'position': i,
                 'title': title,
                 'year': year,
-                'rating': rating,
                 'imdb_id': f"tt{1000000 + i}",
             })
         
         df = pd.DataFrame(data)
         
+        # Generate ratings for the synthetic rows from their rank
+        synthetic = df['rating'].isna()
+        df.loc[synthetic, 'rating'] = np.clip(estimate_ratings(df.loc[synthetic, 'position']), 7.0, 9.5)
+        
         # Add timestamp
         df['scraped_date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
         # Add enhanced columns
-        df['movie_age'] = 2024 - df['year']
-        
-        def categorize_rating(r):
-            if r >= 9.0:
-                return "Outstanding (9.0+)"
-            elif r >= 8.5:
-                return "Excellent (8.5-8.9)"
-            elif r >= 8.0:
-                return "Very Good (8.0-8.4)"
-            elif r >= 7.5:
-                return "Good (7.5-7.9)"
-            else:
-                return "Average (<7.5)"
-        
-        df['rating_category'] = df['rating'].apply(categorize_rating)
-        df['decade'] = df['year'].apply(lambda x: f"{str(x)[:3]}0s")
-        df['quality_score'] = (df['rating'] * 10) + (2024 - df['year']) / 10
+        derive_columns(df, QUALITY_BASE_YEAR)
         
         return df
     
-    def save_datasets(self, df):
-        """Save clean datasets"""
+    def save_datasets(self, df, csv=True):
+        """Save clean datasets (the CSVs are exported from the Arrow file unless csv=False)"""
         print("\n Saving datasets...")
         
         if df is None or len(df) == 0:
             print("No data to save")
             return None, None
         
-        # Ensure we have exactly 250 movies
-        if len(df) < 250:
-            print(f"Only have {len(df)} movies. Creating complete dataset...")
-            df = self.create_realistic_dataset()
+        # Integer years/ages and categorical labels for every output
+        df = to_typed_frame(df)
         
-        # Ensure we don't have more than 250
-        df = df.head(250)
-        
-        # Save basic dataset
-        basic_cols = ['position', 'title', 'year', 'rating', 'imdb_id', 'scraped_date']
-        basic_df = df[basic_cols].copy()
-        basic_df.to_csv('imdb_clean_basic.csv', index=False)
-        print(f" Basic data saved: imdb_clean_basic.csv ({len(basic_df)} movies)")
-        
-        # Save custom dataset
-        custom_cols = ['position', 'title', 'year', 'rating', 'rating_category', 
-                      'movie_age', 'decade', 'quality_score', 'imdb_id', 'scraped_date']
+        basic_df = df[BASIC_COLUMNS].copy()
+        custom_cols = CUSTOM_COLUMNS + [col for col in ENRICHED_COLUMNS if col in df.columns]
         custom_df = df[custom_cols].copy()
-        custom_df.to_csv('imdb_clean_custom.csv', index=False)
-        print(f" Custom data saved: imdb_clean_custom.csv ({len(custom_df)} movies)")
+        
+        # Save one typed columnar file; basic/custom are projections of it
+        with span('columnar'):
+            save_columnar(custom_df, COLUMNAR_PATH)
+        print(f" Columnar data saved: {COLUMNAR_PATH} ({len(custom_df)} movies)")
+        
+        # Optional CSV exports for spreadsheets and other tools
+        if csv:
+            with span('csv'):
+                written = export_csvs(COLUMNAR_PATH)
+            for path, rows in written.items():
+                print(f" CSV exported: {path} ({rows} movies)")
+        
+        # Indexed SQLite copy for ad-hoc queries (python imdb_sql.py ...)
+        with span('sqlite'):
+            save_database(custom_df, DB_PATH)
+        print(f" Database saved: {DB_PATH} ({len(custom_df)} movies)")
+        
+        # Keep this scrape in the snapshot history (the CSVs above only hold the latest)
+        with span('snapshot'):
+            snapshot_path = SnapshotStore().append(custom_df)
+        print(f" Snapshot stored: {snapshot_path}")
+        
+        # Refresh the dashboard's data files from the Arrow file just written
+        with span('dashboard'):
+            _, dashboard_dir = build_dashboard(COLUMNAR_PATH)
+        print(f" Dashboard data saved: {dashboard_dir}/")
         
         # Display summary
         self.display_summary(df)
@@ -519,24 +796,94 @@ class IMDBScaper:
         print("-" * 60)
 
 def main():
+    parser = argparse.ArgumentParser(description="IMDb Top 250 clean data extractor")
+    parser.add_argument('--offline', metavar='PATH',
+                        help="parse a saved chart page (e.g. imdb_page.html) or a directory of snapshots instead of fetching")
+    parser.add_argument('--enrich', action='store_true',
+                        help="fetch each title page for genre, director, runtime and budget")
+    parser.add_argument('--workers', type=int, default=8,
+                        help="concurrent title-page fetches when enriching (default: 8)")
+    parser.add_argument('--incremental', action='store_true',
+                        help="only re-derive new or changed titles and append to imdb_changes.csv")
+    parser.add_argument('--charts', default='top',
+                        help="comma-separated charts to scrape, or 'all' / 'genres' (default: top)")
+    parser.add_argument('--chart-workers', type=int, default=8,
+                        help="concurrent chart fetches (default: 8)")
+    parser.add_argument('--list-charts', action='store_true', help="list the registered charts")
+    parser.add_argument('--no-csv', action='store_true',
+                        help=f"only write {COLUMNAR_PATH}; skip the imdb_clean_*.csv exports")
+    parser.add_argument('--base-url', default=None,
+                        help=f"site to scrape (default: $IMDB_BASE_URL or {BASE_URL}); e.g. a replay_server.py URL")
+    parser.add_argument('--pipeline', action='store_true',
+                        help="overlap chart fetch, parse, clean and save in an asyncio pipeline "
+                             "(also for --charts top alone)")
+    parser.add_argument('--parse-workers', type=int, default=2,
+                        help="parse processes in --pipeline mode (default: 2)")
+    run_trace.add_arguments(parser)
+    args = parser.parse_args()
+    
+    if args.list_charts:
+        for name, (path, label) in CHARTS.items():
+            print(f" {name:22} {label:32} {path}")
+        return
+    charts = resolve_charts(args.charts.split(','))
+    if args.pipeline and args.offline:
+        print(" Note: --pipeline has no effect with --offline; the saved page(s) are parsed directly")
+    
     print("="*70)
     print("IMDb TOP 250 - CLEAN DATA EXTRACTOR (FIXED VERSION)")
     print("="*70)
     
+    run_trace.configure(args, 'Task_01_imdb_scraper.py')
+    
     # Initialize scraper
-    scraper = IMDBScaper()
+    scraper = IMDBScaper(base_url=args.base_url, offline=bool(args.offline))
     
     # Step 1: Get data
-    print("\n1️  EXTRACTING DATA FROM IMDb...")
-    movies_data = scraper.get_imdb_data()
+    with span('extract', charts=len(charts)):
+        if args.offline:
+            print(f"\n1️  PARSING SAVED SNAPSHOT(S): {args.offline}")
+            snapshots = scraper.parse_snapshots(args.offline)
+            # The newest snapshot (last in sorted order) feeds the dataset
+            movies_data = list(snapshots.values())[-1] if snapshots else None
+        elif charts == ['top'] and not args.pipeline:
+            print("\n1️  EXTRACTING DATA FROM IMDb...")
+            movies_data = scraper.get_imdb_data()
+        else:
+            print("\n1️  EXTRACTING CHARTS FROM IMDb...")
+            if args.pipeline:
+                chart_rows = run_chart_pipeline(scraper, charts, fetch_workers=args.chart_workers,
+                                                parse_workers=args.parse_workers)
+            else:
+                chart_rows = scraper.scrape_charts(charts, max_workers=args.chart_workers)
+                scraper.save_charts(chart_rows)
+            # Every chart's years go into the title index, not just the Top 250's
+            for rows in chart_rows.values():
+                scraper.title_index.add_rows(rows)
+            scraper.title_index.save()
+            # The Top 250 also feeds the single-chart datasets below
+            movies_data = chart_rows.get('top')
     
-    # Step 2: Create clean dataset
-    print("\n2️  PROCESSING AND CLEANING DATA...")
-    df = scraper.create_clean_dataset(movies_data)
+    # Without the Top 250 there is only the chart dataset, already saved above
+    if args.offline or 'top' in charts:
+        # Step 2: Create clean dataset
+        print("\n2️  PROCESSING AND CLEANING DATA...")
+        if args.incremental:
+            with span('incremental', enrich=args.enrich):
+                df = scraper.incremental_update(movies_data, enrich=args.enrich, max_workers=args.workers)
+        else:
+            if args.enrich:
+                with span('enrich', titles=len(movies_data or [])):
+                    movies_data = scraper.enrich_titles(movies_data, max_workers=args.workers)
+            with span('clean'):
+                df = scraper.create_clean_dataset(movies_data)
+        
+        # Step 3: Save datasets
+        print("\n3️  SAVING CLEAN DATASETS...")
+        with span('save'):
+            basic_df, custom_df = scraper.save_datasets(df, csv=not args.no_csv)
     
-    # Step 3: Save datasets
-    print("\n3️  SAVING CLEAN DATASETS...")
-    basic_df, custom_df = scraper.save_datasets(df)
+    run_trace.finish(args)
     
 if __name__ == "__main__":
     main()
\ No newline at end of file
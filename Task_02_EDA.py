@@ -5,25 +5,45 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from scipy import stats
 import os
+import argparse
 import warnings
+from data_loader import load_dataset
+from chart_engine import ChartManifest, figure_fingerprint
+from eda_stats import compute_stats
+from eda_streaming import stream_stats, stream_outliers
+from eda_parallel import parallel_stats, parallel_outliers
+from aggregate_cube import build_cube, cube_for
+from imdb_columnar import columnar_source
+import scatter_modes
+from trend_fit import fit_line
+from resampling import DEFAULT_RESAMPLES, DEFAULT_SEED, hypothesis_tests
+import run_trace
+from run_trace import span, traced
 warnings.filterwarnings('ignore')
 
 # Set style
 plt.style.use('seaborn-v0_8-darkgrid')
 sns.set_palette("husl")
 
-def load_data():
+_figure_manifest = None
+
+def figure_manifest():
+    """Fingerprints of the charts in eda_visualizations/ (loaded once)"""
+    global _figure_manifest
+    if _figure_manifest is None:
+        _figure_manifest = ChartManifest('eda_visualizations')
+    return _figure_manifest
+
+@traced()
+def load_data(path='imdb_clean_custom.csv'):
     """Load and prepare the dataset"""
     print(" Loading dataset...")
-    df = pd.read_csv('imdb_clean_custom.csv')
-    
-    # Ensure decade column exists
-    if 'decade' not in df.columns and 'year' in df.columns:
-        df['decade'] = df['year'].apply(lambda x: f"{str(int(x))[:3]}0s")
+    df = load_dataset(path)
     
     print(f" Loaded {len(df)} movies with {len(df.columns)} columns")
     return df
 
+@traced()
 def explore_structure(df):
     """Explore data structure"""
     print("\n" + "="*60)
@@ -46,8 +66,27 @@ def explore_structure(df):
     
     return df
 
-def analyze_distributions(df):
-    """Analyze distributions of key variables"""
+@traced()
+def analyze_distributions(df, summary=None, cube=None):
+    """Analyze distributions of key variables.
+
+    `cube` is a Cube or a function returning one; it is only obtained when a
+    figure actually has to be drawn, so a run that skips both builds nothing.
+    """
+    summary = summary or compute_stats(df)
+    loaded = None
+
+    def get_cube():
+        nonlocal loaded
+        if loaded is None:
+            if callable(cube):
+                loaded = cube()
+            else:
+                loaded = cube if cube is not None else build_cube(df)
+        return loaded
+
+    rating = summary['rating']
+    year = summary['year']
     print("\n" + "="*60)
     print(" DISTRIBUTION ANALYSIS")
     print("="*60)
@@ -57,122 +96,176 @@ def analyze_distributions(df):
     
     # 1. Rating distribution
     print("\n1. Rating Distribution Analysis:")
-    print(f"   • Mean: {df['rating'].mean():.2f}")
-    print(f"   • Median: {df['rating'].median():.2f}")
-    print(f"   • Std Dev: {df['rating'].std():.2f}")
-    print(f"   • Range: {df['rating'].min():.2f} to {df['rating'].max():.2f}")
-    print(f"   • Skewness: {df['rating'].skew():.2f}")
-    
-    fig, axes = plt.subplots(1, 2, figsize=(12, 5))
-    axes[0].hist(df['rating'], bins=20, edgecolor='black', alpha=0.7)
-    axes[0].set_xlabel('Rating')
-    axes[0].set_ylabel('Frequency')
-    axes[0].set_title('Rating Distribution')
-    axes[0].grid(True, alpha=0.3)
-    
-    axes[1].boxplot(df['rating'], vert=False)
-    axes[1].set_xlabel('Rating')
-    axes[1].set_title('Rating Box Plot')
-    axes[1].grid(True, alpha=0.3)
-    
-    plt.tight_layout()
-    plt.savefig('eda_visualizations/rating_distribution.png', dpi=300)
-    plt.show()
+    print(f"   • Mean: {rating.mean:.2f}")
+    print(f"   • Median: {rating.median:.2f}")
+    print(f"   • Std Dev: {rating.std:.2f}")
+    print(f"   • Range: {rating.min:.2f} to {rating.max:.2f}")
+    print(f"   • Skewness: {rating.skew:.2f}")
+    
+    path = 'eda_visualizations/rating_distribution.png'
+    fingerprint = figure_fingerprint(df, ['rating'], code=analyze_distributions, dpi=300)
+    if figure_manifest().is_current(path, fingerprint):
+        print(f"   • {path} unchanged, skipped")
+    else:
+        fig, axes = plt.subplots(1, 2, figsize=(12, 5))
+        ratings, counts = get_cube().counts('rating')
+        axes[0].hist(ratings, bins=20, weights=counts, edgecolor='black', alpha=0.7)
+        axes[0].set_xlabel('Rating')
+        axes[0].set_ylabel('Frequency')
+        axes[0].set_title('Rating Distribution')
+        axes[0].grid(True, alpha=0.3)
+    
+        axes[1].bxp([get_cube().box_stats('rating')], vert=False)
+        axes[1].set_xlabel('Rating')
+        axes[1].set_title('Rating Box Plot')
+        axes[1].grid(True, alpha=0.3)
+    
+        plt.tight_layout()
+        with span('savefig', file=path):
+            plt.savefig(path, dpi=300)
+        figure_manifest().record(path, fingerprint)
+        plt.show()
     
     # 2. Year distribution
     print("\n2. Year Distribution Analysis:")
-    print(f"   • Oldest: {int(df['year'].min())}")
-    print(f"   • Newest: {int(df['year'].max())}")
-    print(f"   • Range: {int(df['year'].max() - df['year'].min())} years")
-    
-    plt.figure(figsize=(10, 6))
-    plt.hist(df['year'], bins=20, edgecolor='black', alpha=0.7)
-    plt.xlabel('Release Year')
-    plt.ylabel('Number of Movies')
-    plt.title('Movies Released Per Year')
-    plt.grid(True, alpha=0.3)
-    plt.tight_layout()
-    plt.savefig('eda_visualizations/year_distribution.png', dpi=300)
-    plt.show()
+    print(f"   • Oldest: {int(year.min)}")
+    print(f"   • Newest: {int(year.max)}")
+    print(f"   • Range: {int(year.max - year.min)} years")
+    
+    path = 'eda_visualizations/year_distribution.png'
+    fingerprint = figure_fingerprint(df, ['year'], code=analyze_distributions, dpi=300)
+    if figure_manifest().is_current(path, fingerprint):
+        print(f"   • {path} unchanged, skipped")
+    else:
+        plt.figure(figsize=(10, 6))
+        years, counts = get_cube().counts('year')
+        plt.hist(years, bins=20, weights=counts, edgecolor='black', alpha=0.7)
+        plt.xlabel('Release Year')
+        plt.ylabel('Number of Movies')
+        plt.title('Movies Released Per Year')
+        plt.grid(True, alpha=0.3)
+        plt.tight_layout()
+        with span('savefig', file=path):
+            plt.savefig(path, dpi=300)
+        figure_manifest().record(path, fingerprint)
+        plt.show()
     
     return df
 
-def analyze_trends(df):
+@traced()
+def analyze_trends(df, summary=None):
     """Analyze trends and patterns"""
+    summary = summary or compute_stats(df)
     print("\n" + "="*60)
     print(" TREND ANALYSIS")
     print("="*60)
     
     # 1. Rating vs Year
     print("\n1. Rating vs Release Year:")
-    corr_year_rating = df['year'].corr(df['rating'])
+    corr_year_rating = summary.correlation('year', 'rating')
     print(f"   • Correlation: {corr_year_rating:.3f}")
     
-    plt.figure(figsize=(10, 6))
-    plt.scatter(df['year'], df['rating'], alpha=0.6, s=50)
-    plt.xlabel('Release Year')
-    plt.ylabel('Rating')
-    plt.title('Rating vs Release Year')
-    plt.grid(True, alpha=0.3)
-    
-    # Add trend line
-    z = np.polyfit(df['year'], df['rating'], 1)
-    p = np.poly1d(z)
-    plt.plot(df['year'].sort_values(), p(df['year'].sort_values()), 
-             'r--', label=f'Trend (r={corr_year_rating:.3f})')
-    plt.legend()
-    plt.tight_layout()
-    plt.savefig('eda_visualizations/rating_vs_year.png', dpi=300)
-    plt.show()
+    path = 'eda_visualizations/rating_vs_year.png'
+    fingerprint = figure_fingerprint(df, ['year', 'rating'], code=analyze_trends, dpi=300,
+                                     scatter=(scatter_modes.scatter_threshold(), scatter_modes.scatter_mode()))
+    if figure_manifest().is_current(path, fingerprint):
+        print(f"   • {path} unchanged, skipped")
+    else:
+        plt.figure(figsize=(10, 6))
+        scatter_modes.scatter(plt.gca(), df['year'], df['rating'], alpha=0.6, s=50)
+        plt.xlabel('Release Year')
+        plt.ylabel('Rating')
+        plt.title('Rating vs Release Year')
+        plt.grid(True, alpha=0.3)
+    
+        # Add trend line
+        trend = fit_line(df['year'], df['rating'])
+        plt.plot(*trend.endpoints(), 'r--', label=f'Trend (r={corr_year_rating:.3f})')
+        plt.legend()
+        plt.tight_layout()
+        with span('savefig', file=path):
+            plt.savefig(path, dpi=300)
+        figure_manifest().record(path, fingerprint)
+        plt.show()
     
     # 2. Position vs Rating
     print("\n2. Position vs Rating:")
-    corr_pos_rating = df['position'].corr(df['rating'])
+    corr_pos_rating = summary.correlation('position', 'rating')
     print(f"   • Correlation: {corr_pos_rating:.3f} (strong negative)")
     
-    plt.figure(figsize=(10, 6))
-    plt.scatter(df['position'], df['rating'], alpha=0.6, s=50)
-    plt.xlabel('Position (Rank)')
-    plt.ylabel('Rating')
-    plt.title('Rating vs Position (Higher position = better rank)')
-    plt.grid(True, alpha=0.3)
-    
-    z = np.polyfit(df['position'], df['rating'], 1)
-    p = np.poly1d(z)
-    plt.plot(df['position'].sort_values(), p(df['position'].sort_values()), 
-             'r--', label=f'Trend (r={corr_pos_rating:.3f})')
-    plt.legend()
-    plt.tight_layout()
-    plt.savefig('eda_visualizations/rating_vs_position.png', dpi=300)
-    plt.show()
+    path = 'eda_visualizations/rating_vs_position.png'
+    fingerprint = figure_fingerprint(df, ['position', 'rating'], code=analyze_trends, dpi=300,
+                                     scatter=(scatter_modes.scatter_threshold(), scatter_modes.scatter_mode()))
+    if figure_manifest().is_current(path, fingerprint):
+        print(f"   • {path} unchanged, skipped")
+    else:
+        plt.figure(figsize=(10, 6))
+        scatter_modes.scatter(plt.gca(), df['position'], df['rating'], alpha=0.6, s=50)
+        plt.xlabel('Position (Rank)')
+        plt.ylabel('Rating')
+        plt.title('Rating vs Position (Higher position = better rank)')
+        plt.grid(True, alpha=0.3)
+    
+        trend = fit_line(df['position'], df['rating'])
+        plt.plot(*trend.endpoints(), 'r--', label=f'Trend (r={corr_pos_rating:.3f})')
+        plt.legend()
+        plt.tight_layout()
+        with span('savefig', file=path):
+            plt.savefig(path, dpi=300)
+        figure_manifest().record(path, fingerprint)
+        plt.show()
     
     # 3. Decade analysis
     print("\n3. Decade Analysis:")
-    decade_stats = df.groupby('decade')['rating'].agg(['mean', 'count']).round(2)
+    decade_stats = summary.decade_stats.round(2)
     print(decade_stats)
     
-    plt.figure(figsize=(12, 6))
-    bars = plt.bar(decade_stats.index, decade_stats['mean'])
-    plt.xlabel('Decade')
-    plt.ylabel('Average Rating')
-    plt.title('Average Rating by Decade')
-    plt.xticks(rotation=45)
-    plt.grid(True, alpha=0.3, axis='y')
-    
-    # Add value labels
-    for bar in bars:
-        height = bar.get_height()
-        plt.text(bar.get_x() + bar.get_width()/2., height + 0.01,
-                 f'{height:.2f}', ha='center', va='bottom')
-    
-    plt.tight_layout()
-    plt.savefig('eda_visualizations/decade_ratings.png', dpi=300)
-    plt.show()
+    path = 'eda_visualizations/decade_ratings.png'
+    fingerprint = figure_fingerprint(df, ['decade', 'rating'], code=analyze_trends, dpi=300)
+    if figure_manifest().is_current(path, fingerprint):
+        print(f"   • {path} unchanged, skipped")
+    else:
+        plt.figure(figsize=(12, 6))
+        bars = plt.bar(decade_stats.index, decade_stats['mean'])
+        plt.xlabel('Decade')
+        plt.ylabel('Average Rating')
+        plt.title('Average Rating by Decade')
+        plt.xticks(rotation=45)
+        plt.grid(True, alpha=0.3, axis='y')
+    
+        # Add value labels
+        for bar in bars:
+            height = bar.get_height()
+            plt.text(bar.get_x() + bar.get_width()/2., height + 0.01,
+                     f'{height:.2f}', ha='center', va='bottom')
+    
+        plt.tight_layout()
+        with span('savefig', file=path):
+            plt.savefig(path, dpi=300)
+        figure_manifest().record(path, fingerprint)
+        plt.show()
     
     return df, corr_year_rating, corr_pos_rating
 
-def test_hypotheses(df):
+def fmt_stat(value, spec):
+    """Format a statistic, or 'n/a' when there was too little data to compute it"""
+    return 'n/a' if pd.isna(value) else format(value, spec)
+
+def print_resampling(resampled):
+    """Permutation p-values and bootstrap intervals from resampling.hypothesis_tests"""
+    perm, boot = resampled['mean_diff_perm'], resampled['mean_diff_boot']
+    print(f"   • Resampling ({perm.n_resamples:,} draws):")
+    print(f"     Top vs Bottom permutation p-value: {fmt_stat(perm.p_value, '.6f')}")
+    print(f"     Difference 95% bootstrap CI: {fmt_stat(boot.ci[0], '.2f')} to {fmt_stat(boot.ci[1], '.2f')}")
+    corr_boot, corr_perm = resampled['corr_boot'], resampled['corr_perm']
+    print(f"     Age-rating r 95% bootstrap CI: {fmt_stat(corr_boot.ci[0], '.3f')} to {fmt_stat(corr_boot.ci[1], '.3f')}")
+    if corr_perm is not None:
+        print(f"     Age-rating r permutation p-value: {fmt_stat(corr_perm.p_value, '.6f')}")
+
+@traced()
+def test_hypotheses(df, summary=None, n_resamples=DEFAULT_RESAMPLES, seed=DEFAULT_SEED):
     """Test statistical hypotheses"""
+    summary = summary or compute_stats(df)
     print("\n" + "="*60)
     print(" HYPOTHESIS TESTING")
     print("="*60)
@@ -192,14 +285,22 @@ def test_hypotheses(df):
     
     # Hypothesis 2: Movie age affects rating
     print("\n2. Hypothesis: Movie age affects rating")
-    corr_age_rating = df['movie_age'].corr(df['rating'])
+    corr_age_rating = summary.correlation('movie_age', 'rating')
     print(f"   • Correlation (age vs rating): {corr_age_rating:.3f}")
     print(f"   • Conclusion: {'WEAK relationship' if abs(corr_age_rating) < 0.3 else 'STRONG relationship'}")
     
-    return top_10, bottom_10, p_value
+    # Ratings are tied and bounded, so back both tests with resampling
+    print("\n3. Resampling checks:")
+    resampled = hypothesis_tests(top_10, bottom_10, df['movie_age'], df['rating'],
+                                 n_resamples=n_resamples, seed=seed)
+    print_resampling(resampled)
+    
+    return top_10, bottom_10, p_value, resampled
 
-def detect_issues(df):
+@traced()
+def detect_issues(df, summary=None):
     """Detect data quality issues"""
+    summary = summary or compute_stats(df)
     print("\n" + "="*60)
     print(" DATA QUALITY CHECK")
     print("="*60)
@@ -211,16 +312,13 @@ def detect_issues(df):
     # Check for outliers using IQR
     print("\n2. Outlier Detection (IQR method):")
     
-    def get_outliers(series):
-        Q1 = series.quantile(0.25)
-        Q3 = series.quantile(0.75)
-        IQR = Q3 - Q1
-        lower = Q1 - 1.5 * IQR
-        upper = Q3 + 1.5 * IQR
+    def get_outliers(column):
+        lower, upper = summary[column].outlier_bounds()
+        series = df[column]
         return series[(series < lower) | (series > upper)]
     
-    rating_outliers = get_outliers(df['rating'])
-    year_outliers = get_outliers(df['year'])
+    rating_outliers = get_outliers('rating')
+    year_outliers = get_outliers('year')
     
     print(f"   • Rating outliers: {len(rating_outliers)} movies")
     if len(rating_outliers) > 0:
@@ -233,13 +331,34 @@ def detect_issues(df):
     # Check data consistency
     print("\n3. Data Consistency Checks:")
     print(f"   • Ratings in valid range (1-10) {' Yes' if df['rating'].between(1, 10).all() else ' No'}")
-    print(f"   • Years reasonable (1888+): {' Yes' if df['year'].min() >= 1888 else ' No'}")
+    print(f"   • Years reasonable (1888+): {' Yes' if summary['year'].min >= 1888 else ' No'}")
     print(f"   • Positions in order: {' Yes' if df['position'].is_monotonic_increasing else ' No'}")
     
     return len(rating_outliers), len(year_outliers)
 
-def generate_report(df, insights):
+def resampling_lines(insights):
+    """Report lines for the resampling results (if any were computed)"""
+    resampled = insights.get('resampled')
+    if not resampled:
+        return ''
+    perm, boot, corr_boot = resampled['mean_diff_perm'], resampled['mean_diff_boot'], resampled['corr_boot']
+    lines = [f"• Permutation p-value ({perm.n_resamples:,} resamples): {fmt_stat(perm.p_value, '.6f')}",
+             f"• Top - Bottom 95% bootstrap CI: {fmt_stat(boot.ci[0], '.2f')} to {fmt_stat(boot.ci[1], '.2f')}",
+             f"• Age vs Rating r 95% bootstrap CI: {fmt_stat(corr_boot.ci[0], '.3f')} to {fmt_stat(corr_boot.ci[1], '.3f')}"]
+    if resampled['corr_perm'] is not None:
+        lines.append(f"• Age vs Rating permutation p-value: {fmt_stat(resampled['corr_perm'].p_value, '.6f')}")
+    return '\n'.join(lines)
+
+@traced()
+def generate_report(df, insights, summary=None):
     """Generate final EDA report"""
+    summary = summary or compute_stats(df)
+    rating = summary['rating']
+    period = 'n/a'
+    if 'year' in summary.column_stats and summary['year'].count:
+        period = f"{int(summary['year'].min)} - {int(summary['year'].max)}"
+    significant = 'n/a' if pd.isna(insights['p_value']) else (
+        'Significant difference' if insights['p_value'] < 0.05 else 'No significant difference')
     print("\n" + "="*60)
     print(" GENERATING EDA REPORT")
     print("="*60)
@@ -251,30 +370,31 @@ EXPLORATORY DATA ANALYSIS REPORT - IMDb TOP 250 MOVIES
 
 DATASET OVERVIEW
 {'-'*50}
-• Total Movies: {len(df)}
-• Time Period: {int(df['year'].min())} - {int(df['year'].max())}
-• Columns: {', '.join(df.columns.tolist())}
+• Total Movies: {summary.n_rows}
+• Time Period: {period}
+• Columns: {', '.join(summary.all_columns)}
 
 KEY STATISTICS
 {'-'*50}
-• Average Rating: {df['rating'].mean():.2f}
-• Median Rating: {df['rating'].median():.2f}
-• Rating Range: {df['rating'].min():.2f} - {df['rating'].max():.2f}
-• Highest Rated: {df.loc[df['rating'].idxmax(), 'title']} ({df['rating'].max():.2f})
-• Lowest Rated: {df.loc[df['rating'].idxmin(), 'title']} ({df['rating'].min():.2f})
+• Average Rating: {rating.mean:.2f}
+• Median Rating: {rating.median:.2f}
+• Rating Range: {rating.min:.2f} - {rating.max:.2f}
+• Highest Rated: {summary.highest_title} ({rating.max:.2f})
+• Lowest Rated: {summary.lowest_title} ({rating.min:.2f})
 
 TREND ANALYSIS
 {'-'*50}
-• Rating vs Year Correlation: {insights['corr_year_rating']:.3f}
-• Position vs Rating Correlation: {insights['corr_pos_rating']:.3f}
+• Rating vs Year Correlation: {fmt_stat(insights['corr_year_rating'], '.3f')}
+• Position vs Rating Correlation: {fmt_stat(insights['corr_pos_rating'], '.3f')}
 • Strongest Trend: Higher ranked movies (lower position) have significantly higher ratings
 
 HYPOTHESIS TESTING RESULTS
 {'-'*50}
-• Top 10 vs Bottom 10: {'Significant difference' if insights['p_value'] < 0.05 else 'No significant difference'}
-• P-value: {insights['p_value']:.6f}
-• Top 10 Average: {insights['top_10_avg']:.2f}
-• Bottom 10 Average: {insights['bottom_10_avg']:.2f}
+• Top 10 vs Bottom 10: {significant}
+• P-value: {fmt_stat(insights['p_value'], '.6f')}
+• Top 10 Average: {fmt_stat(insights['top_10_avg'], '.2f')}
+• Bottom 10 Average: {fmt_stat(insights['bottom_10_avg'], '.2f')}
+{resampling_lines(insights)}
 
 DATA QUALITY
 {'-'*50}
@@ -306,31 +426,162 @@ EDA COMPLETED: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}
     print(" TASK 2 COMPLETED SUCCESSFULLY!")
     print("="*60)
 
+@traced()
+def run_chunked(path, chunksize, workers=1, n_resamples=DEFAULT_RESAMPLES, seed=DEFAULT_SEED):
+    """EDA over `path` in chunks of `chunksize` rows, never holding the whole file.
+
+    Two passes: the first fills the mergeable accumulators in eda_streaming
+    (moments, co-moments, quantile sketches, key hashes); the second counts
+    rows outside the IQR fences. With workers > 1 each pass is split into
+    row ranges on a process pool and the partials are merged in order.
+    Figures are not drawn in this mode.
+    """
+    if not os.path.exists(path):
+        # Scrapes saved with --no-csv only have the Arrow file; it can't be split into byte ranges
+        path = columnar_source(path)
+        workers = 1
+    print(f" Streaming {path} in chunks of {chunksize:,} rows on {workers} worker(s)...")
+    with span('stats_pass', chunksize=chunksize, workers=workers):
+        if workers > 1:
+            summary = parallel_stats(path, workers, chunksize)
+        else:
+            summary = stream_stats(path, chunksize)
+    rating = summary['rating']
+    print(f" Scanned {summary.n_rows:,} movies with {len(summary.all_columns)} columns")
+    # Rating dumps have no chart position, and may have no year either
+    has_year = 'year' in summary.column_stats
+    has_position = 'position' in summary.column_stats
+    
+    print("\n" + "="*60)
+    print(" DISTRIBUTION ANALYSIS")
+    print("="*60)
+    print(f"   • Mean: {rating.mean:.2f}")
+    print(f"   • Median: {rating.median:.2f}")
+    print(f"   • Std Dev: {rating.std:.2f}")
+    print(f"   • Range: {rating.min:.2f} to {rating.max:.2f}")
+    print(f"   • Skewness: {rating.skew:.2f}")
+    
+    print("\n" + "="*60)
+    print(" TREND ANALYSIS")
+    print("="*60)
+    corr_year_rating = summary.correlation('year', 'rating') if has_year else np.nan
+    corr_pos_rating = summary.correlation('position', 'rating') if has_position else np.nan
+    print(f"   • Rating vs Year correlation: {fmt_stat(corr_year_rating, '.3f')}")
+    print(f"   • Position vs Rating correlation: {fmt_stat(corr_pos_rating, '.3f')}")
+    if has_year:
+        print(summary.decade_stats.round(2))
+    
+    print("\n" + "="*60)
+    print(" HYPOTHESIS TESTING")
+    print("="*60)
+    top_10, bottom_10 = summary.top_10, summary.bottom_10
+    p_value = np.nan
+    if len(top_10) >= 2 and len(bottom_10) >= 2:
+        t_stat, p_value = stats.ttest_ind(top_10, bottom_10)
+        print(f"   • Top 10 average: {top_10.mean():.2f}")
+        print(f"   • Bottom 10 average: {bottom_10.mean():.2f}")
+        print(f"   • T-test p-value: {p_value:.6f}")
+    else:
+        print("   • Top 10 vs Bottom 10: skipped (no position column)")
+    ages = ratings = counts = np.empty(0)
+    if has_year:
+        print(f"   • Correlation (age vs rating): {fmt_stat(summary.correlation('movie_age', 'rating'), '.3f')}")
+        # The correlation bootstrap runs on the cube's (age, rating) cells, not the rows
+        with span('cube'):
+            cells = cube_for(path, chunksize).table('age_rating')
+        ages, ratings, counts = cells['movie_age'], cells['rating'], cells['count']
+    with span('resampling', n_resamples=n_resamples):
+        resampled = hypothesis_tests(top_10, bottom_10, ages, ratings, counts,
+                                     n_resamples=n_resamples, seed=seed)
+    print_resampling(resampled)
+    
+    print("\n" + "="*60)
+    print(" DATA QUALITY CHECK")
+    print("="*60)
+    with span('outlier_pass', chunksize=chunksize, workers=workers):
+        if workers > 1:
+            outliers = parallel_outliers(path, summary, workers, chunksize)
+        else:
+            outliers = stream_outliers(path, summary, chunksize)
+    print(f"\n1. Duplicate movies: {summary.duplicates} {' None' if summary.duplicates == 0 else ' Found'}")
+    print(f"   • Rating outliers: {outliers.counts['rating']} movies")
+    if outliers.counts['rating'] > 0:
+        print("     High-rated outliers:")
+        print(outliers.top_outliers().to_string())
+    print(f"   • Ratings in valid range (1-10) {' Yes' if summary.ratings_in_range else ' No'}")
+    if has_year:
+        print(f"   • Year outliers: {outliers.counts['year']} movies")
+        print(f"   • Years reasonable (1888+): {' Yes' if summary['year'].min >= 1888 else ' No'}")
+    if has_position:
+        print(f"   • Positions in order: {' Yes' if summary.positions_ordered else ' No'}")
+    
+    insights = {
+        'corr_year_rating': corr_year_rating,
+        'corr_pos_rating': corr_pos_rating,
+        'top_10_avg': top_10.mean() if len(top_10) else np.nan,
+        'bottom_10_avg': bottom_10.mean() if len(bottom_10) else np.nan,
+        'p_value': p_value,
+        'rating_outliers': outliers.counts['rating'],
+        'year_outliers': outliers.counts.get('year', 0),
+        'resampled': resampled
+    }
+    generate_report(None, insights, summary)
+
 
 def main():
     """Main function to run EDA"""
+    parser = argparse.ArgumentParser(description="Exploratory data analysis of the IMDb dataset")
+    parser.add_argument('--data', default='imdb_clean_custom.csv',
+                        help="dataset to analyse (CSV, or a .tsv ratings dump with --chunksize)")
+    parser.add_argument('--chunksize', type=int, default=None,
+                        help="stream the file in chunks of this many rows instead of loading it")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="processes for --chunksize mode (row-range partitions)")
+    parser.add_argument('--scatter-threshold', type=int, default=None,
+                        help=f"points above which scatters become a density/sample (default: {scatter_modes.SCATTER_THRESHOLD:,})")
+    parser.add_argument('--scatter-mode', choices=scatter_modes.SCATTER_MODES, default=None)
+    parser.add_argument('--resamples', type=int, default=DEFAULT_RESAMPLES,
+                        help="permutation/bootstrap resamples for the hypothesis tests")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help="seed for the resampling tests")
+    run_trace.add_arguments(parser)
+    args = parser.parse_args()
+    scatter_modes.configure(args.scatter_threshold, args.scatter_mode)
+    run_trace.configure(args, 'Task_02_EDA.py')
+    
     print("="*70)
     print("TASK 2: EXPLORATORY DATA ANALYSIS (EDA)")
     print("IMDb Top 250 Movies Dataset")
     print("="*70)
     
+    if args.chunksize:
+        run_chunked(args.data, args.chunksize, args.workers, args.resamples, args.seed)
+        run_trace.finish(args)
+        return
+    
     # Load data
-    df = load_data()
+    df = load_data(args.data)
     
     # Explore structure
     df = explore_structure(df)
     
-    # Analyze distributions
-    df = analyze_distributions(df)
+    # Compute every summary statistic once
+    with span('compute_stats'):
+        summary = compute_stats(df)
+    
+    # Analyze distributions; the cube is built only if a figure needs redrawing
+    def load_cube():
+        with span('cube'):
+            return cube_for(args.data)
+    df = analyze_distributions(df, summary, load_cube)
     
     # Analyze trends
-    df, corr_year_rating, corr_pos_rating = analyze_trends(df)
+    df, corr_year_rating, corr_pos_rating = analyze_trends(df, summary)
     
     # Test hypotheses
-    top_10, bottom_10, p_value = test_hypotheses(df)
+    top_10, bottom_10, p_value, resampled = test_hypotheses(df, summary, args.resamples, args.seed)
     
     # Detect issues
-    rating_outliers, year_outliers = detect_issues(df)
+    rating_outliers, year_outliers = detect_issues(df, summary)
     
     # Compile insights
     insights = {
@@ -340,11 +591,14 @@ def main():
         'bottom_10_avg': bottom_10.mean(),
         'p_value': p_value,
         'rating_outliers': rating_outliers,
-        'year_outliers': year_outliers
+        'year_outliers': year_outliers,
+        'resampled': resampled
     }
     
     # Generate report
-    generate_report(df, insights)
+    generate_report(df, insights, summary)
+    
+    run_trace.finish(args)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
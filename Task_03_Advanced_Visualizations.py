@@ -1,169 +1,188 @@
-import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 from matplotlib.gridspec import GridSpec
-
-# Load data
-df = pd.read_csv('imdb_clean_custom.csv')
+from matplotlib.patches import Patch
+from chart_engine import register_chart, main
+from aggregate_cube import box_stats
+from scatter_modes import scatter as large_scatter
+from trend_fit import fit_line
 
 # Set style
-sns.set_style("whitegrid")
-plt.rcParams['font.size'] = 11
+STYLE = {'font.size': 11}
+
+# Order decades chronologically
+decade_order = ['1920s', '1930s', '1940s', '1950s', '1960s',
+                '1970s', '1980s', '1990s', '2000s', '2010s', '2020s']
 
 # ============================================
 # 1. MULTI-PANEL ANALYSIS: DECADE DEEP DIVE
 # ============================================
-fig = plt.figure(figsize=(16, 12))
-gs = GridSpec(2, 2, figure=fig, hspace=0.3, wspace=0.3)
-
-# 1A: Average Rating per Decade
-ax1 = fig.add_subplot(gs[0, 0])
-decade_avg_rating = df.groupby('decade')['rating'].mean().sort_values(ascending=False)
-colors1 = plt.cm.coolwarm(np.linspace(0.2, 0.8, len(decade_avg_rating)))
-bars1 = ax1.bar(decade_avg_rating.index, decade_avg_rating.values, color=colors1, edgecolor='black')
-ax1.set_title('Average IMDb Rating per Decade', fontsize=14, fontweight='bold')
-ax1.set_ylabel('Average Rating', fontsize=12)
-ax1.tick_params(axis='x', rotation=45)
-# Add value labels
-for bar in bars1:
-    height = bar.get_height()
-    ax1.text(bar.get_x() + bar.get_width()/2., height - 0.1,
-             f'{height:.2f}', ha='center', va='top', color='white', fontweight='bold')
-
-# 1B: Movies Count per Decade
-ax2 = fig.add_subplot(gs[0, 1])
-decade_counts = df['decade'].value_counts().sort_index()
-colors2 = plt.cm.viridis(np.linspace(0.2, 0.8, len(decade_counts)))
-bars2 = ax2.bar(decade_counts.index, decade_counts.values, color=colors2, edgecolor='black')
-ax2.set_title('Number of Movies per Decade', fontsize=14, fontweight='bold')
-ax2.set_ylabel('Count', fontsize=12)
-ax2.tick_params(axis='x', rotation=45)
-for bar in bars2:
-    height = bar.get_height()
-    ax2.text(bar.get_x() + bar.get_width()/2., height + 0.5,
-             f'{int(height)}', ha='center', va='bottom')
-
-# 1C: Rating Distribution by Decade (Box Plot)
-ax3 = fig.add_subplot(gs[1, :])
-# Order decades chronologically
-decade_order = ['1920s', '1930s', '1940s', '1950s', '1960s', 
-                '1970s', '1980s', '1990s', '2000s', '2010s', '2020s']
-df_decade_ordered = df[df['decade'].isin(decade_order)]
-sns.boxplot(x='decade', y='rating', data=df_decade_ordered, 
-            order=decade_order, ax=ax3, palette='Set3')
-ax3.set_title('Rating Distribution Across Decades', fontsize=14, fontweight='bold')
-ax3.set_xlabel('Decade', fontsize=12)
-ax3.set_ylabel('IMDb Rating', fontsize=12)
-ax3.tick_params(axis='x', rotation=45)
-
-plt.suptitle('Decade-wise Analysis of IMDb Top 250 Movies', fontsize=16, fontweight='bold', y=0.98)
-plt.tight_layout()
-plt.savefig('6_decade_analysis.png', dpi=300, bbox_inches='tight')
-plt.show()
+@register_chart('6_decade_analysis', '6_decade_analysis.png', ['decade', 'decade_rating'], STYLE)
+def decade_analysis(cube):
+    fig = plt.figure(figsize=(16, 12))
+    gs = GridSpec(2, 2, figure=fig, hspace=0.3, wspace=0.3)
+
+    # 1A: Average Rating per Decade
+    ax1 = fig.add_subplot(gs[0, 0])
+    decades = cube.table('decade').set_index('decade')
+    decade_avg_rating = (decades['rating_sum'] / decades['count']).sort_values(ascending=False)
+    colors1 = plt.cm.coolwarm(np.linspace(0.2, 0.8, len(decade_avg_rating)))
+    bars1 = ax1.bar(decade_avg_rating.index.astype(str), decade_avg_rating.values, color=colors1, edgecolor='black')
+    ax1.set_title('Average IMDb Rating per Decade', fontsize=14, fontweight='bold')
+    ax1.set_ylabel('Average Rating', fontsize=12)
+    ax1.tick_params(axis='x', rotation=45)
+    # Add value labels
+    for bar in bars1:
+        height = bar.get_height()
+        ax1.text(bar.get_x() + bar.get_width()/2., height - 0.1,
+                 f'{height:.2f}', ha='center', va='top', color='white', fontweight='bold')
+
+    # 1B: Movies Count per Decade
+    ax2 = fig.add_subplot(gs[0, 1])
+    decade_counts = decades['count'].sort_index()
+    colors2 = plt.cm.viridis(np.linspace(0.2, 0.8, len(decade_counts)))
+    bars2 = ax2.bar(decade_counts.index, decade_counts.values, color=colors2, edgecolor='black')
+    ax2.set_title('Number of Movies per Decade', fontsize=14, fontweight='bold')
+    ax2.set_ylabel('Count', fontsize=12)
+    ax2.tick_params(axis='x', rotation=45)
+    for bar in bars2:
+        height = bar.get_height()
+        ax2.text(bar.get_x() + bar.get_width()/2., height + 0.5,
+                 f'{int(height)}', ha='center', va='bottom')
+
+    # 1C: Rating Distribution by Decade (Box Plot)
+    ax3 = fig.add_subplot(gs[1, :])
+    cells = cube.table('decade_rating')
+    # Colours follow the decade, so a decade missing from the data doesn't shift the rest
+    decade_palette = dict(zip(decade_order, sns.color_palette('Set3', len(decade_order))))
+    boxes, positions, labels = [], [], []
+    for i, decade in enumerate(decade_order):
+        decade_cells = cells[cells['decade'] == decade]
+        if len(decade_cells):
+            boxes.append(box_stats(decade_cells['rating'], decade_cells['count'], decade))
+            positions.append(i)
+            labels.append(decade)
+    parts = ax3.bxp(boxes, positions=positions, patch_artist=True)
+    for box, decade in zip(parts['boxes'], labels):
+        box.set_facecolor(decade_palette[decade])
+    ax3.set_xticks(range(len(decade_order)), decade_order)
+    ax3.set_title('Rating Distribution Across Decades', fontsize=14, fontweight='bold')
+    ax3.set_xlabel('Decade', fontsize=12)
+    ax3.set_ylabel('IMDb Rating', fontsize=12)
+    ax3.tick_params(axis='x', rotation=45)
+
+    plt.suptitle('Decade-wise Analysis of IMDb Top 250 Movies', fontsize=16, fontweight='bold', y=0.98)
+    plt.tight_layout()
 
 # ============================================
 # 2. HEATMAP: RATING CATEGORY VS DECADE
 # ============================================
-plt.figure(figsize=(14, 8))
-# Create pivot table
-heatmap_data = pd.crosstab(df['decade'], df['rating_category'])
-heatmap_data = heatmap_data.reindex(decade_order)
-
-sns.heatmap(heatmap_data, annot=True, fmt='d', cmap='YlOrRd', 
-            linewidths=1, linecolor='gray', cbar_kws={'label': 'Number of Movies'})
-plt.title('Movies Count: Decade vs Rating Category', fontsize=16, fontweight='bold')
-plt.xlabel('Rating Category', fontsize=12)
-plt.ylabel('Decade', fontsize=12)
-plt.tight_layout()
-plt.savefig('7_heatmap_decade_vs_category.png', dpi=300, bbox_inches='tight')
-plt.show()
+@register_chart('7_heatmap_decade_vs_category', '7_heatmap_decade_vs_category.png', ['decade_category'], STYLE)
+def heatmap_decade_vs_category(cube):
+    plt.figure(figsize=(14, 8))
+    # Create pivot table
+    heatmap_data = cube.table('decade_category').pivot(index='decade', columns='rating_category', values='count')
+    heatmap_data = heatmap_data.reindex(decade_order).fillna(0).astype(int)
+
+    sns.heatmap(heatmap_data, annot=True, fmt='d', cmap='YlOrRd',
+                linewidths=1, linecolor='gray', cbar_kws={'label': 'Number of Movies'})
+    plt.title('Movies Count: Decade vs Rating Category', fontsize=16, fontweight='bold')
+    plt.xlabel('Rating Category', fontsize=12)
+    plt.ylabel('Decade', fontsize=12)
+    plt.tight_layout()
 
 # ============================================
 # 3. TOP 20 MOVIES VISUALIZATION
 # ============================================
-plt.figure(figsize=(14, 10))
-top_20 = df.nlargest(20, 'rating')[['title', 'rating', 'year', 'decade']].sort_values('rating')
-
-# Create a color map for decades
-decade_colors = {decade: plt.cm.tab20(i/len(df['decade'].unique())) 
-                 for i, decade in enumerate(df['decade'].unique())}
-colors = [decade_colors[decade] for decade in top_20['decade']]
-
-bars = plt.barh(top_20['title'], top_20['rating'], color=colors, edgecolor='black')
-plt.xlabel('IMDb Rating', fontsize=12)
-plt.title('Top 20 Highest Rated Movies', fontsize=16, fontweight='bold')
-
-# Add rating values and year on bars
-for i, (bar, rating, year) in enumerate(zip(bars, top_20['rating'], top_20['year'])):
-    width = bar.get_width()
-    plt.text(width + 0.01, bar.get_y() + bar.get_height()/2, 
-             f'{rating:.1f} ({int(year)})', va='center', fontsize=10)
-
-# Add legend for decades
-from matplotlib.patches import Patch
-legend_elements = [Patch(facecolor=decade_colors[d], edgecolor='black', label=d) 
-                   for d in sorted(top_20['decade'].unique())]
-plt.legend(handles=legend_elements, title='Decade', bbox_to_anchor=(1.05, 1), loc='upper left')
-
-plt.tight_layout()
-plt.savefig('8_top_20_movies.png', dpi=300, bbox_inches='tight')
-plt.show()
+@register_chart('8_top_20_movies', '8_top_20_movies.png', ['top', 'decade'], STYLE)
+def top_20_movies(cube):
+    plt.figure(figsize=(14, 10))
+    top_20 = cube.top()[['title', 'rating', 'year', 'decade']].sort_values('rating')
+
+    # Create a color map for decades
+    all_decades = cube.table('decade')['decade']
+    decade_colors = {decade: plt.cm.tab20(i/len(all_decades))
+                     for i, decade in enumerate(all_decades)}
+    colors = [decade_colors[decade] for decade in top_20['decade']]
+
+    bars = plt.barh(top_20['title'], top_20['rating'], color=colors, edgecolor='black')
+    plt.xlabel('IMDb Rating', fontsize=12)
+    plt.title('Top 20 Highest Rated Movies', fontsize=16, fontweight='bold')
+
+    # Add rating values and year on bars
+    for i, (bar, rating, year) in enumerate(zip(bars, top_20['rating'], top_20['year'])):
+        width = bar.get_width()
+        plt.text(width + 0.01, bar.get_y() + bar.get_height()/2,
+                 f'{rating:.1f} ({int(year)})', va='center', fontsize=10)
+
+    # Add legend for decades
+    legend_elements = [Patch(facecolor=decade_colors[d], edgecolor='black', label=d)
+                       for d in sorted(top_20['decade'].unique())]
+    plt.legend(handles=legend_elements, title='Decade', bbox_to_anchor=(1.05, 1), loc='upper left')
+
+    plt.tight_layout()
 
 # ============================================
 # 4. MOVIE AGE ANALYSIS
 # ============================================
-fig, axes = plt.subplots(1, 2, figsize=(16, 6))
-
-# 4A: Movie Age Distribution
-axes[0].hist(df['movie_age'], bins=15, color='skyblue', edgecolor='black', alpha=0.7)
-axes[0].axvline(df['movie_age'].mean(), color='red', linestyle='--', linewidth=2,
-                label=f'Mean: {df["movie_age"].mean():.1f} years')
-axes[0].set_title('Distribution of Movie Ages', fontsize=14, fontweight='bold')
-axes[0].set_xlabel('Years Since Release', fontsize=12)
-axes[0].set_ylabel('Count', fontsize=12)
-axes[0].legend()
-axes[0].grid(True, alpha=0.3)
-
-# 4B: Rating vs Movie Age with Regression
-scatter = axes[1].scatter(df['movie_age'], df['rating'], 
-                          c=df['quality_score'], cmap='plasma', 
-                          s=50, alpha=0.7, edgecolors='black')
-plt.colorbar(scatter, ax=axes[1], label='Quality Score')
-
-# Add regression line
-z = np.polyfit(df['movie_age'], df['rating'], 1)
-p = np.poly1d(z)
-sorted_age = np.sort(df['movie_age'])
-axes[1].plot(sorted_age, p(sorted_age), "r--", linewidth=2, 
-             label=f'Trend: Rating = {z[0]:.4f}*Age + {z[1]:.2f}')
-
-axes[1].set_title('Rating vs. Movie Age (with Quality Score)', fontsize=14, fontweight='bold')
-axes[1].set_xlabel('Movie Age (Years)', fontsize=12)
-axes[1].set_ylabel('IMDb Rating', fontsize=12)
-axes[1].legend()
-axes[1].grid(True, alpha=0.3)
-
-plt.suptitle('Movie Age Analysis', fontsize=16, fontweight='bold', y=1.02)
-plt.tight_layout()
-plt.savefig('9_movie_age_analysis.png', dpi=300, bbox_inches='tight')
-plt.show()
+@register_chart('9_movie_age_analysis', '9_movie_age_analysis.png', ['movie_age', 'age_rating'], STYLE)
+def movie_age_analysis(cube):
+    fig, axes = plt.subplots(1, 2, figsize=(16, 6))
+
+    # 4A: Movie Age Distribution
+    ages, counts = cube.counts('movie_age')
+    mean_age = cube.mean('movie_age')
+    axes[0].hist(ages, bins=15, weights=counts, color='skyblue', edgecolor='black', alpha=0.7)
+    axes[0].axvline(mean_age, color='red', linestyle='--', linewidth=2,
+                    label=f'Mean: {mean_age:.1f} years')
+    axes[0].set_title('Distribution of Movie Ages', fontsize=14, fontweight='bold')
+    axes[0].set_xlabel('Years Since Release', fontsize=12)
+    axes[0].set_ylabel('Count', fontsize=12)
+    axes[0].legend()
+    axes[0].grid(True, alpha=0.3)
+
+    # 4B: Rating vs Movie Age with Regression
+    cells = cube.table('age_rating')
+    scatter, dense = large_scatter(axes[1], cells['movie_age'], cells['rating'],
+                                   c=cells['quality_score_sum'] / cells['count'], cmap='plasma',
+                                   s=50 * np.sqrt(cells['count']), weights=cells['count'],
+                                   alpha=0.7, edgecolors='black')
+    plt.colorbar(scatter, ax=axes[1], label='Movies (log scale)' if dense else 'Quality Score')
+
+    # Add regression line
+    trend = fit_line(cells['movie_age'], cells['rating'], cells['count'])
+    axes[1].plot(*trend.endpoints(), "r--", linewidth=2,
+                 label=f'Trend: Rating = {trend.slope:.4f}*Age + {trend.intercept:.2f}')
+
+    axes[1].set_title('Rating vs. Movie Age (with Quality Score)', fontsize=14, fontweight='bold')
+    axes[1].set_xlabel('Movie Age (Years)', fontsize=12)
+    axes[1].set_ylabel('IMDb Rating', fontsize=12)
+    axes[1].legend()
+    axes[1].grid(True, alpha=0.3)
+
+    plt.suptitle('Movie Age Analysis', fontsize=16, fontweight='bold', y=1.02)
+    plt.tight_layout()
 
 # ============================================
 # 5. CORRELATION HEATMAP
 # ============================================
-plt.figure(figsize=(10, 8))
-# Select numeric columns for correlation
-numeric_cols = ['position', 'year', 'rating', 'movie_age', 'quality_score']
-corr_matrix = df[numeric_cols].corr()
+@register_chart('10_correlation_matrix', '10_correlation_matrix.png', ['moments'], STYLE)
+def correlation_matrix(cube):
+    plt.figure(figsize=(10, 8))
+    # Correlations of the numeric columns, from the cube's co-moment matrix
+    corr_matrix = cube.corr()
+
+    # Create mask for upper triangle
+    mask = np.triu(np.ones_like(corr_matrix, dtype=bool))
 
-# Create mask for upper triangle
-mask = np.triu(np.ones_like(corr_matrix, dtype=bool))
+    sns.heatmap(corr_matrix, mask=mask, annot=True, fmt='.2f', cmap='coolwarm',
+                center=0, square=True, linewidths=1, cbar_kws={"shrink": 0.8})
+    plt.title('Correlation Matrix of Numeric Features', fontsize=16, fontweight='bold')
+    plt.tight_layout()
 
-sns.heatmap(corr_matrix, mask=mask, annot=True, fmt='.2f', cmap='coolwarm',
-            center=0, square=True, linewidths=1, cbar_kws={"shrink": 0.8})
-plt.title('Correlation Matrix of Numeric Features', fontsize=16, fontweight='bold')
-plt.tight_layout()
-plt.savefig('10_correlation_matrix.png', dpi=300, bbox_inches='tight')
-plt.show()
+CHARTS = ['6_decade_analysis', '7_heatmap_decade_vs_category', '8_top_20_movies',
+          '9_movie_age_analysis', '10_correlation_matrix']
 
+if __name__ == "__main__":
+    main(default_charts=CHARTS)
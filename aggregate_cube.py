@@ -0,0 +1,286 @@
+# File: aggregate_cube.py
+# Precomputed aggregates (value counts, crosstabs, co-moments) that the charts render from
+import argparse
+import json
+import os
+import numpy as np
+import pandas as pd
+from data_loader import CACHE_DIR, file_digest, load_dataset, prune_cache, touch_cached
+from eda_streaming import DEFAULT_CHUNKSIZE, iter_chunks, prepare_chunk
+from imdb_columnar import columnar_source
+
+CUBE_PATH = 'imdb_cube.json'
+CUBE_VERSION = 1
+
+# Fixed bin width per numeric column: every value is counted at this resolution,
+# which is the precision the dataset stores, so histograms drawn from the cube
+# with weights are the same as histograms of the raw rows
+RESOLUTION = {'rating': 0.1, 'year': 1, 'movie_age': 1, 'quality_score': 0.1}
+
+# name -> (key columns, columns summed per key); every table also gets a count
+TABLES = {
+    'rating': (['rating'], []),
+    'year': (['year'], []),
+    'movie_age': (['movie_age'], []),
+    'quality_score': (['quality_score'], []),
+    'decade': (['decade'], ['rating']),
+    'rating_category': (['rating_category'], []),
+    'decade_rating': (['decade', 'rating'], []),
+    'decade_category': (['decade', 'rating_category'], []),
+    'year_rating': (['year', 'rating'], ['movie_age']),
+    'age_rating': (['movie_age', 'rating'], ['quality_score']),
+    'quality_rating': (['quality_score', 'rating'], []),
+}
+MOMENT_COLUMNS = ['position', 'year', 'rating', 'movie_age', 'quality_score']
+TOP_COLUMNS = ['title', 'rating', 'year', 'decade']
+TOP_N = 20
+
+
+def quantize(values, step):
+    """Snap values to multiples of `step` (NaN stays NaN)"""
+    snapped = np.round(np.asarray(values, dtype=float) / step) * step
+    return np.round(snapped, 6)
+
+
+class MomentMatrix:
+    """Mean vector and co-moment matrix over complete rows, merged with Chan's update"""
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        k = len(self.columns)
+        self.n = 0
+        self.mean = np.zeros(k)
+        self.comoment = np.zeros((k, k))
+
+    def update(self, frame):
+        X = frame.reindex(columns=self.columns).to_numpy(dtype=float)
+        X = X[~np.isnan(X).any(axis=1)]
+        if len(X) == 0:
+            return self
+        chunk = MomentMatrix(self.columns)
+        chunk.n = len(X)
+        chunk.mean = X.mean(axis=0)
+        centred = X - chunk.mean
+        chunk.comoment = centred.T @ centred
+        return self.merge(chunk)
+
+    def merge(self, other):
+        if other.n == 0:
+            return self
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.comoment = self.comoment + other.comoment + np.outer(delta, delta) * self.n * other.n / n
+        self.mean = self.mean + delta * other.n / n
+        self.n = n
+        return self
+
+
+class CubeBuilder:
+    """Accumulates the cube chunk by chunk; partial builders merge by addition"""
+
+    def __init__(self, compact_every=32):
+        self.n_rows = 0
+        self.parts = {name: [] for name in TABLES}
+        self.moments = MomentMatrix(MOMENT_COLUMNS)
+        self.top = None
+        self.compact_every = compact_every
+
+    def update(self, chunk):
+        self.n_rows += len(chunk)
+        self.moments.update(chunk)
+        if all(col in chunk.columns for col in TOP_COLUMNS):
+            self._add_top(chunk[TOP_COLUMNS].nlargest(TOP_N, 'rating'))
+        for col, step in RESOLUTION.items():
+            if col in chunk.columns:
+                chunk[col] = quantize(chunk[col], step)
+        for name, (keys, sums) in TABLES.items():
+            if not all(col in chunk.columns for col in keys + sums):
+                continue
+            frame = chunk[keys + sums].dropna(subset=keys).astype({key: object for key in keys
+                                                                  if key not in RESOLUTION})
+            grouped = frame.groupby(keys, sort=False).agg(**{f'{col}_sum': (col, 'sum') for col in sums},
+                                                          count=(keys[0], 'size'))
+            self._add(name, grouped)
+        return self
+
+    def _add(self, name, grouped):
+        self.parts[name].append(grouped)
+        if len(self.parts[name]) >= self.compact_every:
+            self.parts[name] = [self._compact(name)]
+
+    def _compact(self, name):
+        parts = self.parts[name]
+        if len(parts) == 1:
+            return parts[0]
+        return pd.concat(parts).groupby(level=list(range(parts[0].index.nlevels)), sort=False).sum()
+
+    def _add_top(self, rows):
+        # Earlier rows win ties, as in DataFrame.nlargest over the whole file
+        self.top = rows if self.top is None else pd.concat([self.top, rows]).nlargest(TOP_N, 'rating')
+
+    def merge(self, other):
+        """Fold in the builder of the partition that follows this one"""
+        self.n_rows += other.n_rows
+        for name, parts in other.parts.items():
+            for part in parts:
+                self._add(name, part)
+        self.moments.merge(other.moments)
+        if other.top is not None:
+            self._add_top(other.top)
+        return self
+
+    def finalize(self):
+        tables = {}
+        for name, parts in self.parts.items():
+            if parts:
+                table = self._compact(name).reset_index().sort_values(TABLES[name][0], ignore_index=True)
+                tables[name] = table.to_dict('list')
+        raw = {
+            'version': CUBE_VERSION,
+            'n_rows': self.n_rows,
+            'resolution': RESOLUTION,
+            'tables': tables,
+            'moments': {
+                'columns': self.moments.columns,
+                'n': self.moments.n,
+                'mean': self.moments.mean.tolist(),
+                'comoment': self.moments.comoment.tolist(),
+            },
+            'top': (self.top.to_dict('list') if self.top is not None else {}),
+        }
+        return Cube(raw)
+
+
+class Cube:
+    """Read access to a built cube; sections are plain JSON-ready dicts"""
+
+    def __init__(self, raw, path=None):
+        self.raw = raw
+        self.n_rows = raw['n_rows']
+        self.path = path
+
+    def section(self, name):
+        """Raw data of a table, or of 'moments' / 'top'"""
+        if name in self.raw['tables']:
+            return self.raw['tables'][name]
+        return self.raw[name]
+
+    def table(self, name):
+        return pd.DataFrame(self.raw['tables'][name])
+
+    def top(self):
+        return pd.DataFrame(self.raw['top'])
+
+    def counts(self, column):
+        """(values, counts) of one column, for hist(values, weights=counts)"""
+        table = self.table(column)
+        return table[column].to_numpy(), table['count'].to_numpy()
+
+    def mean(self, column):
+        values, counts = self.counts(column)
+        return (values * counts).sum() / counts.sum()
+
+    def corr(self):
+        moments = self.raw['moments']
+        comoment = np.array(moments['comoment'])
+        scale = np.sqrt(np.diag(comoment))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = comoment / np.outer(scale, scale)
+        return pd.DataFrame(corr, index=moments['columns'], columns=moments['columns'])
+
+    def box_stats(self, column, label=None):
+        """Box plot statistics (for Axes.bxp) of one column"""
+        return box_stats(*self.counts(column), label)
+
+    def save(self, path=CUBE_PATH):
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.raw, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+        self.path = path
+
+
+def weighted_quantiles(values, counts, qs):
+    """Quantiles of `values` repeated `counts` times, with pandas' linear interpolation"""
+    order = np.argsort(values, kind='stable')
+    values = np.asarray(values, dtype=float)[order]
+    cumulative = np.cumsum(np.asarray(counts)[order])
+    ranks = np.asarray(qs, dtype=float) * (cumulative[-1] - 1)
+    lower = np.floor(ranks)
+    at_lower = values[np.searchsorted(cumulative, lower, side='right')]
+    at_upper = values[np.minimum(np.searchsorted(cumulative, lower + 1, side='right'), len(values) - 1)]
+    return at_lower + (at_upper - at_lower) * (ranks - lower)
+
+
+def box_stats(values, counts, label=None, whis=1.5):
+    """Axes.bxp statistics from a value-count table, whiskers at `whis` IQR"""
+    values = np.asarray(values, dtype=float)
+    counts = np.asarray(counts)
+    q1, median, q3 = weighted_quantiles(values, counts, [0.25, 0.5, 0.75])
+    low, high = q1 - whis * (q3 - q1), q3 + whis * (q3 - q1)
+    inside = values[(values >= low) & (values <= high)]
+    return {
+        'label': label, 'med': median, 'q1': q1, 'q3': q3,
+        'whislo': inside.min() if len(inside) else q1,
+        'whishi': inside.max() if len(inside) else q3,
+        'fliers': values[(values < low) | (values > high)],
+    }
+
+
+def build_cube(df):
+    """Cube of an in-memory frame"""
+    return CubeBuilder().update(prepare_chunk(df.copy())).finalize()
+
+
+def build_cube_from_file(path, chunksize=DEFAULT_CHUNKSIZE):
+    """Cube of a CSV/TSV or Arrow file streamed in chunks (other formats are loaded whole)"""
+    if not path.endswith(('.csv', '.tsv', '.csv.gz', '.tsv.gz', '.arrow')):
+        return build_cube(load_dataset(path))
+    builder = CubeBuilder()
+    for chunk in iter_chunks(path, chunksize):
+        builder.update(chunk)
+    return builder.finalize()
+
+
+def load_cube(path=CUBE_PATH):
+    with open(path) as f:
+        return Cube(json.load(f), path)
+
+
+def cached_cube_path(data_path):
+    return os.path.join(CACHE_DIR, f"{file_digest(data_path)}.cube.json")
+
+
+def cube_for(data_path, chunksize=DEFAULT_CHUNKSIZE):
+    """Cube for a dataset file, built once per file version and cached under .data_cache/"""
+    data_path = columnar_source(data_path)
+    path = cached_cube_path(data_path)
+    if os.path.exists(path):
+        try:
+            cube = load_cube(path)
+            if cube.raw.get('version') == CUBE_VERSION:
+                touch_cached(path)
+                return cube
+        except (OSError, json.JSONDecodeError):
+            pass
+    cube = build_cube_from_file(data_path, chunksize)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    cube.save(path)
+    prune_cache()
+    return cube
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the aggregate cube the charts render from")
+    parser.add_argument('--data', default='imdb_clean_custom.csv', help="dataset (CSV/TSV is streamed)")
+    parser.add_argument('--output', default=CUBE_PATH)
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE)
+    args = parser.parse_args()
+
+    cube = build_cube_from_file(args.data, args.chunksize)
+    cube.save(args.output)
+    print(f" Cube of {cube.n_rows:,} rows saved to: {args.output} ({os.path.getsize(args.output):,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
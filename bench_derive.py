@@ -0,0 +1,118 @@
+# File: bench_derive.py
+# Scaling benchmark for the vectorized derivations in imdb_derive
+import sys
+import time
+import numpy as np
+import pandas as pd
+from imdb_derive import clean_years, estimate_ratings, derive_columns
+
+SIZES = [10_000, 100_000, 1_000_000]
+LEGACY_MAX_ROWS = 100_000
+
+
+def synthetic_chart(n, seed=42):
+    """Chart-shaped frame with ~5% missing ratings and years"""
+    rng = np.random.default_rng(seed)
+    years = rng.integers(1920, 2025, n).astype(str).astype(object)
+    years[rng.random(n) < 0.05] = "N/A"
+    ratings = np.round(rng.uniform(6.5, 9.5, n), 1).astype(object)
+    ratings[rng.random(n) < 0.05] = "N/A"
+    return pd.DataFrame({
+        'position': np.arange(1, n + 1),
+        'title': [f"Movie {i}" for i in range(n)],
+        'year': years,
+        'rating': ratings,
+    })
+
+
+def vectorized(df):
+    df = df.copy()
+    df['year'] = clean_years(df['year'])
+    df['rating'] = pd.to_numeric(df['rating'], errors='coerce')
+    missing = df['rating'].isna()
+    df.loc[missing, 'rating'] = estimate_ratings(df.loc[missing, 'position'])
+    df['year'] = df['year'].fillna(2000)
+    return derive_columns(df, 2026)
+
+
+def legacy(df):
+    """Row-wise derivations as create_clean_dataset used to do them"""
+    import re
+    df = df.copy()
+
+    def extract_year(year_str):
+        if pd.isna(year_str) or year_str == "N/A":
+            return np.nan
+        match = re.search(r'(\d{4})', str(year_str))
+        return int(match.group(1)) if match else np.nan
+
+    df['year'] = df['year'].apply(extract_year)
+    df['rating'] = pd.to_numeric(df['rating'], errors='coerce')
+    for idx, row in df.iterrows():
+        if pd.isna(row['rating']):
+            position = row['position']
+            if position <= 10:
+                df.at[idx, 'rating'] = round(9.5 - (position * 0.05), 1)
+            elif position <= 50:
+                df.at[idx, 'rating'] = round(8.5 - ((position-10) * 0.01), 1)
+            elif position <= 100:
+                df.at[idx, 'rating'] = round(8.0 - ((position-50) * 0.005), 1)
+            else:
+                df.at[idx, 'rating'] = round(7.5 - ((position-100) * 0.002), 1)
+    df['year'] = df['year'].fillna(2000)
+    df['movie_age'] = 2026 - df['year']
+
+    def categorize_rating(r):
+        if pd.isna(r):
+            return "Unknown"
+        elif r >= 9.0:
+            return "Outstanding (9.0+)"
+        elif r >= 8.5:
+            return "Excellent (8.5-8.9)"
+        elif r >= 8.0:
+            return "Very Good (8.0-8.4)"
+        elif r >= 7.5:
+            return "Good (7.5-7.9)"
+        else:
+            return "Average (<7.5)"
+
+    df['rating_category'] = df['rating'].apply(categorize_rating)
+    df['decade'] = df['year'].apply(lambda x: f"{str(int(x))[:3]}0s" if pd.notna(x) else "Unknown")
+    df['quality_score'] = df.apply(
+        lambda row: (row['rating'] * 10) + (2024 - row['year'])/10
+        if pd.notna(row['rating']) and pd.notna(row['year'])
+        else None,
+        axis=1
+    )
+    return df
+
+
+def timed(func, df):
+    start = time.perf_counter()
+    result = func(df)
+    return time.perf_counter() - start, result
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+
+    print(f"{'rows':>10} | {'vectorized':>12} | {'ns/row':>8} | {'row-wise':>12} | {'speedup':>8}")
+    print("-" * 62)
+    for n in sizes:
+        df = synthetic_chart(n)
+        vec_time, vec_df = timed(vectorized, df)
+        line = f"{n:>10,} | {vec_time:>10.3f} s | {vec_time / n * 1e9:>8.0f}"
+
+        if n <= LEGACY_MAX_ROWS:
+            old_time, old_df = timed(legacy, df)
+            # np.round and round() can disagree on exact .x5 ties in imputed ratings
+            assert np.allclose(vec_df['rating'], old_df['rating'], atol=0.1 + 1e-9), "ratings differ"
+            assert vec_df['decade'].equals(old_df['decade']), "decades differ"
+            line += f" | {old_time:>10.3f} s | {old_time / vec_time:>7.0f}x"
+        else:
+            line += f" | {'(skipped)':>12} | {'':>8}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# File: bench_eda_stats.py
+# Repeated pandas calls (as Task_02_EDA used to make them) vs one eda_stats pass
+import sys
+import time
+import numpy as np
+import pandas as pd
+from eda_stats import compute_stats
+from imdb_derive import derive_columns
+
+
+def synthetic_dataset(n, seed=7):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'position': np.arange(1, n + 1),
+        'title': 'Movie',
+        'year': rng.integers(1920, 2025, n).astype(float),
+        'rating': np.round(rng.normal(8.2, 0.25, n).clip(1, 10), 1),
+    })
+    df = derive_columns(df, 2026)
+    # data_loader hands the EDA a categorical decade
+    df['decade'] = df['decade'].astype('category')
+    return df
+
+
+def repeated_pandas(df):
+    """Every summary the EDA computed, one pandas call at a time"""
+    results = []
+    # analyze_distributions
+    results += [df['rating'].mean(), df['rating'].median(), df['rating'].std(),
+                df['rating'].min(), df['rating'].max(), df['rating'].skew(),
+                df['year'].min(), df['year'].max()]
+    # analyze_trends
+    results += [df['year'].corr(df['rating']), df['position'].corr(df['rating']),
+                df.groupby('decade', observed=True)['rating'].agg(['mean', 'count'])]
+    # test_hypotheses
+    results += [df['movie_age'].corr(df['rating'])]
+    # detect_issues
+    for col in ['rating', 'year']:
+        results += [df[col].quantile(0.25), df[col].quantile(0.75)]
+    results += [df['year'].min()]
+    # generate_report
+    results += [df['year'].min(), df['year'].max(), df['rating'].mean(), df['rating'].median(),
+                df['rating'].min(), df['rating'].max(), df['rating'].idxmax(), df['rating'].idxmin()]
+    return results
+
+
+def best_of(func, df, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(df)
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    df = synthetic_dataset(n)
+    old_time, old = best_of(repeated_pandas, df, repeat)
+    new_time, summary = best_of(compute_stats, df, repeat)
+
+    # Same answers either way
+    rating = summary['rating']
+    assert np.isclose(rating.mean, old[0]) and np.isclose(rating.median, old[1])
+    assert np.isclose(rating.std, old[2]) and np.isclose(rating.skew, old[5])
+    assert np.isclose(summary.correlation('year', 'rating'), old[8])
+    assert np.isclose(summary['year'].q1, old[14]) and rating.idxmax == old[-2]
+
+    print(f"EDA summaries on {n:,} synthetic rows (best of {repeat})")
+    print(f"   Repeated pandas calls: {old_time:7.3f} s")
+    print(f"   eda_stats single pass: {new_time:7.3f} s")
+    print(f"   Speedup: {old_time / new_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
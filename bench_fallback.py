@@ -0,0 +1,61 @@
+# File: bench_fallback.py
+# Compare the old per-script regex fallback with the single-pass __NEXT_DATA__ scan
+import re
+import sys
+import time
+from bs4 import BeautifulSoup
+from Task_01_imdb_scraper import IMDBScaper
+from imdb_stream_parser import find_next_data, find_chart_edges
+
+LEGACY_PATTERNS = [
+    r'"position"\s*:\s*(\d+).*?"title"\s*:\s*"([^"]+)".*?"year"\s*:\s*(\d{4})',
+    r'(\d+)\.\s*([^<]+?)\s*\((\d{4})\)',
+    r'"name"\s*:\s*"([^"]+)".*?"ratingValue"\s*:\s*([\d.]+)',
+]
+
+
+def legacy_fallback(html):
+    """The fallback extract_json_data used before: DOM + three regexes per script"""
+    soup = BeautifulSoup(html, 'html.parser')
+    movies_data = []
+    for script in soup.find_all('script'):
+        if script.string:
+            for pattern in LEGACY_PATTERNS:
+                for match in re.findall(pattern, script.string, re.DOTALL)[:250]:
+                    if len(match) >= 3:
+                        movies_data.append({'position': int(match[0]), 'title': match[1].strip(), 'year': match[2]})
+    return movies_data[:250]
+
+
+def single_pass_fallback(html, scraper):
+    return scraper.parse_chart_edges(find_chart_edges(find_next_data(html)))
+
+
+def best_of(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else 'imdb_page.html'
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    with open(path, 'rb') as f:
+        html = f.read()
+    scraper = IMDBScaper()
+
+    legacy_time, legacy_rows = best_of(lambda: legacy_fallback(html), repeat)
+    new_time, new_rows = best_of(lambda: single_pass_fallback(html, scraper), repeat)
+
+    print(f"Fallback extraction on {path} ({len(html) / 1e6:.2f} MB, best of {repeat})")
+    print(f"   Before (DOM + per-script regex): {legacy_time * 1000:8.1f} ms  {len(legacy_rows)} rows")
+    print(f"   After  (single-pass scan):       {new_time * 1000:8.1f} ms  {len(new_rows)} rows")
+    print(f"   Speedup: {legacy_time / new_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
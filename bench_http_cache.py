@@ -0,0 +1,46 @@
+# File: bench_http_cache.py
+# Shows the response cache's three paths against the replay server: network fetch, TTL hit, ETag revalidation
+import sys
+import tempfile
+import time
+import requests
+from http_cache import ResponseCache
+from replay_server import ReplayServer
+
+
+def timed_get(cache_dir, ttl, url, session):
+    """One lookup through a fresh ResponseCache (no in-memory entries) over `cache_dir`"""
+    start = time.perf_counter()
+    response = ResponseCache(cache_dir, ttl=ttl).get(url, session=session)
+    return response, (time.perf_counter() - start) * 1000
+
+
+def main():
+    chart_page = sys.argv[1] if len(sys.argv) > 1 else 'imdb_page.html'
+    with ReplayServer(chart_page=chart_page, fixture_dir=None) as server, \
+            tempfile.TemporaryDirectory() as root, requests.Session() as session:
+        url = server.base_url + '/chart/top/'
+        cache_dir = root + '/http_cache'
+        steps = [
+            ('first fetch', 3600, 'ok'),
+            ('within TTL', 3600, None),
+            ('TTL expired', 0, 'not_modified'),
+        ]
+        print(f"ResponseCache against {url}")
+        failed = False
+        for label, ttl, expected in steps:
+            before = dict(server.stats)
+            response, ms = timed_get(cache_dir, ttl, url, session)
+            served = {key: server.stats[key] - before[key] for key in server.stats}
+            outcome = next((key for key, count in served.items() if count and key != 'requests'), None)
+            ok = outcome == expected and response.status_code == 200 and response.content
+            failed |= not ok
+            print(f"   {label:12} ttl={ttl:<5} {ms:7.1f} ms  server: {outcome or 'no request':13}"
+                  f" from_cache={response.from_cache!s:5}  {len(response.content):,} bytes"
+                  + ("" if ok else f"  (expected {expected or 'no request'})"))
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
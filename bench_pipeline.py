@@ -0,0 +1,79 @@
+# File: bench_pipeline.py
+# Sequential fetch -> parse -> clean -> save vs the asyncio pipeline, with simulated network latency
+import asyncio
+import sys
+import tempfile
+import time
+from Task_01_imdb_scraper import IMDBScaper
+from http_cache import CachedResponse
+from imdb_charts import resolve_charts, save_chart_partitions, load_charts
+from scrape_pipeline import Pipeline, run_chart_pipeline
+
+
+class SlowScraper(IMDBScaper):
+    """Serves the saved chart page for every chart after `latency` seconds, like a remote server"""
+
+    def __init__(self, latency):
+        super().__init__()
+        self.latency = latency
+        with open('imdb_page.html', 'rb') as f:
+            self.page = f.read()
+
+    def fetch_chart(self, chart='top', quiet=False):
+        time.sleep(self.latency)
+        return CachedResponse(200, self.page)
+
+
+def sequential(scraper, charts, root):
+    """The current main(): each step waits for the previous one to finish completely"""
+    for chart in charts:
+        rows = scraper.scrape_chart(chart)
+        save_chart_partitions({chart: scraper.clean_chart(rows)}, root)
+
+
+def check_stage_failure():
+    """A stage that raises must fail the run, not leave the stages before it blocked on full queues"""
+    def save(item):
+        raise OSError(f"disk full while saving {item}")
+
+    pipeline = Pipeline(queue_size=1).add('double', lambda x: 2 * x, workers=2).add('save', save)
+    try:
+        asyncio.run(asyncio.wait_for(pipeline.run(range(20)), timeout=5))
+    except asyncio.TimeoutError:
+        # Checked first: on Python 3.11+ it is the builtin TimeoutError, an OSError subclass
+        raise AssertionError("the pipeline hung after its save stage failed")
+    except OSError as e:
+        assert 'disk full' in str(e)
+        return
+    raise AssertionError("the pipeline did not raise the save stage's error")
+
+
+def main():
+    latency = float(sys.argv[1]) if len(sys.argv) > 1 else 0.3
+    charts = resolve_charts(['all'])
+    scraper = SlowScraper(latency)
+
+    with tempfile.TemporaryDirectory() as root:
+        start = time.perf_counter()
+        sequential(scraper, charts, root)
+        sequential_time = time.perf_counter() - start
+        expected = load_charts(root=root)
+
+    with tempfile.TemporaryDirectory() as root:
+        start = time.perf_counter()
+        run_chart_pipeline(scraper, charts, fetch_workers=8, parse_workers=2, root=root)
+        pipeline_time = time.perf_counter() - start
+        result = load_charts(root=root)
+
+    assert result.drop(columns='scraped_date').equals(expected.drop(columns='scraped_date'))
+    check_stage_failure()
+    fetch_bound = latency * len(charts) / 8
+    print(f"\n{len(charts)} charts, {latency:.2f}s simulated latency per fetch")
+    print(f"   Sequential:               {sequential_time:6.2f} s")
+    print(f"   Pipeline (8 fetchers):    {pipeline_time:6.2f} s")
+    print(f"   Fetch stage alone:        {fetch_bound:6.2f} s (the slowest stage)")
+    print(f"   Speedup: {sequential_time / pipeline_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+# File: bench_scraper.py
+# Scraper throughput against the local replay server: pages/sec, p50/p99 latency and memory per path
+import argparse
+import json
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+from Task_01_imdb_scraper import IMDBScaper
+from http_cache import ResponseCache
+from imdb_charts import resolve_charts
+from replay_server import ReplayServer, Faults
+from scrape_pipeline import run_chart_pipeline
+from title_fetcher import make_session
+
+
+def scraper_for(server, cache_dir, latencies):
+    """A scraper aimed at the replay server with an empty cache; every response's latency is recorded"""
+    session = make_session()
+    session.hooks['response'].append(lambda r, *args, **kwargs: latencies.append(r.elapsed.total_seconds()))
+    return IMDBScaper(base_url=server.base_url, session=session, cache=ResponseCache(cache_dir, ttl=0))
+
+
+def run_scenario(name, func, server, workdir):
+    """Run one extraction path with a fresh scraper; returns its metrics"""
+    latencies = []
+    with tempfile.TemporaryDirectory(dir=workdir) as cache_dir:
+        scraper = scraper_for(server, cache_dir, latencies)
+        before = dict(server.stats)
+        tracemalloc.start()
+        start = time.perf_counter()
+        pages = func(scraper, cache_dir)
+        seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    served = {key: server.stats[key] - before[key] for key in server.stats}
+    latencies = np.array(latencies) * 1000 if latencies else np.zeros(1)
+    return {
+        'scenario': name,
+        'pages': pages,
+        'seconds': round(seconds, 3),
+        'pages_per_sec': round(pages / seconds, 1) if seconds else 0.0,
+        'p50_ms': round(float(np.percentile(latencies, 50)), 2),
+        'p99_ms': round(float(np.percentile(latencies, 99)), 2),
+        'peak_mb': round(peak / 2 ** 20, 1),
+        'requests': served['requests'],
+        'throttled': served['throttled'],
+        'errors': served['errors'],
+    }
+
+
+def chart_sequential(charts):
+    def run(scraper, _):
+        return sum(1 for chart in charts if scraper.scrape_chart(chart))
+    return run
+
+
+def chart_concurrent(charts, workers):
+    def run(scraper, _):
+        rows = scraper.scrape_charts(charts, max_workers=workers, rate=0)
+        return sum(1 for r in rows.values() if r)
+    return run
+
+
+def chart_pipelined(charts, workers):
+    def run(scraper, cache_dir):
+        rows = run_chart_pipeline(scraper, charts, fetch_workers=workers, parse_workers=2, root=cache_dir)
+        return sum(1 for r in rows.values() if r)
+    return run
+
+
+def title_pages(movies, workers):
+    def run(scraper, _):
+        enriched = scraper.enrich_titles([dict(m) for m in movies], max_workers=workers, rate=0)
+        return sum(1 for movie in enriched if 'genre' in movie)
+    return run
+
+
+def compare(results, baseline_path, tolerance):
+    """Regressions against a saved run: throughput down or peak memory up by more than `tolerance`"""
+    with open(baseline_path) as f:
+        baseline = {row['scenario']: row for row in json.load(f)['results']}
+    problems = []
+    for row in results:
+        old = baseline.get(row['scenario'])
+        if old is None:
+            continue
+        if row['pages_per_sec'] < old['pages_per_sec'] * (1 - tolerance):
+            problems.append(f"{row['scenario']}: {row['pages_per_sec']} pages/s vs {old['pages_per_sec']} baseline")
+        if row['peak_mb'] > old['peak_mb'] * (1 + tolerance) + 1:
+            problems.append(f"{row['scenario']}: {row['peak_mb']} MB peak vs {old['peak_mb']} baseline")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scraper against the local replay server")
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--jitter', type=float, default=0.02)
+    parser.add_argument('--error-rate', type=float, default=0.01)
+    parser.add_argument('--throttle-rate', type=float, default=0.01)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--titles', type=int, default=250, help="title pages in the enrichment scenario")
+    parser.add_argument('--json', metavar='PATH', help="write the results as JSON (e.g. a CI baseline)")
+    parser.add_argument('--baseline', metavar='PATH', help="fail if a scenario regressed against this JSON")
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    args = parser.parse_args()
+
+    faults = Faults(args.latency, args.jitter, args.error_rate, args.throttle_rate, seed=1)
+    charts = resolve_charts(['all'])
+    with ReplayServer(faults=faults) as server, tempfile.TemporaryDirectory() as workdir:
+        movies = IMDBScaper().parse_local_snapshot('imdb_page.html')
+        movies = (movies * (args.titles // len(movies) + 1))[:args.titles]
+        for i, movie in enumerate(movies):
+            movie['imdb_id'] = f"tt{9000000 + i}"
+        scenarios = [
+            ('charts, sequential', chart_sequential(charts)),
+            (f'charts, {args.workers} threads', chart_concurrent(charts, args.workers)),
+            ('charts, pipeline', chart_pipelined(charts, args.workers)),
+            (f'title pages, {args.workers} threads', title_pages(movies, args.workers)),
+        ]
+        results = [run_scenario(name, func, server, workdir) for name, func in scenarios]
+
+    print(f"\nReplay server: {args.latency * 1000:.0f}+{args.jitter * 1000:.0f} ms latency, "
+          f"{args.error_rate:.0%} 503s, {args.throttle_rate:.0%} 429s")
+    print(f"   {'scenario':26} {'pages':>6} {'pages/s':>8} {'p50 ms':>7} {'p99 ms':>7} "
+          f"{'peak MB':>8} {'429s':>5} {'5xx':>4}")
+    for row in results:
+        print(f"   {row['scenario']:26} {row['pages']:6} {row['pages_per_sec']:8.1f} {row['p50_ms']:7.1f} "
+              f"{row['p99_ms']:7.1f} {row['peak_mb']:8.1f} {row['throttled']:5} {row['errors']:4}")
+    print(f"   Max RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'faults': vars(args), 'results': results}, f, indent=1)
+    if args.baseline:
+        problems = compare(results, args.baseline, args.tolerance)
+        for problem in problems:
+            print(f" REGRESSION {problem}")
+        if problems:
+            sys.exit(1)
+        print(f" No regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# File: bench_snapshots.py
+# As-of and per-title history queries over a year of daily chart snapshots
+import sys
+import time
+import tempfile
+import numpy as np
+import pandas as pd
+from snapshot_store import SnapshotStore
+
+
+def daily_snapshots(base, days, seed=11):
+    """`days` daily versions of the chart with ratings drifting and ranks reshuffled"""
+    rng = np.random.default_rng(seed)
+    for day, stamp in enumerate(pd.date_range('2026-01-01 06:00', periods=days, freq='D')):
+        df = base.copy()
+        df['rating'] = (df['rating'] + rng.normal(0, 0.02, len(df))).round(1)
+        df = df.sort_values('rating', ascending=False, kind='stable')
+        df['position'] = np.arange(1, len(df) + 1)
+        df['scraped_date'] = stamp.strftime('%Y-%m-%d %H:%M:%S')
+        yield df
+
+
+def best_of(func, repeat=20):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000, result
+
+
+def main():
+    days = int(sys.argv[1]) if len(sys.argv) > 1 else 365
+    base = pd.read_csv('imdb_clean_custom.csv')
+    with tempfile.TemporaryDirectory() as root:
+        store = SnapshotStore(root)
+        start = time.perf_counter()
+        for df in daily_snapshots(base, days):
+            store.append(df)
+        build_time = time.perf_counter() - start
+
+        # A fresh store, as a new process would open it
+        as_of_ms, chart = best_of(lambda: SnapshotStore(root).as_of('2026-03-01'))
+        history_ms, history = best_of(lambda: SnapshotStore(root).history('tt0111161'))
+        warm_ms, _ = best_of(lambda: store.history('tt0068646'))
+
+        assert chart['scraped_date'].iloc[0] == '2026-03-01 06:00:00'
+        assert len(history) == days and history['scraped_at'].is_monotonic_increasing
+
+    print(f"Snapshot store with {days} daily snapshots of {len(base)} movies")
+    print(f"   Appending all snapshots:       {build_time:7.2f} s")
+    print(f"   as_of('2026-03-01'), cold:     {as_of_ms:7.2f} ms")
+    print(f"   history(imdb_id), cold:        {history_ms:7.2f} ms")
+    print(f"   history(imdb_id), warm:        {warm_ms:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
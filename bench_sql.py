@@ -0,0 +1,61 @@
+# File: bench_sql.py
+# Ad-hoc aggregations: reparsing the CSV with pandas vs querying the indexed SQLite copy
+import sys
+import time
+import tempfile
+import os
+import numpy as np
+import pandas as pd
+from imdb_sql import save_database, query
+
+
+def best_of(func, repeat=10):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000, result
+
+
+def scaled(df, copies):
+    """`copies` stacked copies of the dataset with distinct ids and jittered ratings"""
+    rng = np.random.default_rng(7)
+    big = pd.concat([df] * copies, ignore_index=True)
+    big['imdb_id'] = [f"tt{i:08d}" for i in range(len(big))]
+    big['rating'] = (big['rating'] + rng.normal(0, 0.2, len(big))).clip(1, 10).round(1)
+    return big
+
+
+def main():
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    df = scaled(pd.read_csv('imdb_clean_custom.csv'), copies)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'movies.csv')
+        db_path = os.path.join(tmp, 'imdb.db')
+        df.to_csv(csv_path, index=False)
+        save_database(df, db_path)
+        probe = df['imdb_id'].iloc[len(df) // 2]
+
+        cases = [
+            ('decade summary',
+             lambda: pd.read_csv(csv_path).groupby('decade')['rating'].agg(['count', 'mean']),
+             lambda: query('decade-summary', path=db_path)),
+            ('rating 9.0-10.0',
+             lambda: pd.read_csv(csv_path).query('9.0 <= rating <= 10.0'),
+             lambda: query('rating-range', {'low': 9.0}, path=db_path)),
+            ('one title by imdb_id',
+             lambda: pd.read_csv(csv_path).loc[lambda d: d['imdb_id'] == probe],
+             lambda: query("SELECT * FROM movies WHERE imdb_id = ?", (probe,), path=db_path)),
+        ]
+        print(f"Ad-hoc queries over {len(df):,} movies (CSV reparse vs SQLite)")
+        for name, csv_query, sql_query in cases:
+            csv_ms, expected = best_of(csv_query)
+            sql_ms, result = best_of(sql_query)
+            assert len(result) == len(expected)
+            print(f"   {name:22} {csv_ms:8.1f} ms  vs {sql_ms:7.2f} ms  ({csv_ms / sql_ms:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+# File: chart_engine.py
+# Registry of independent chart render jobs, run on a process pool with the Agg backend.
+# Charts draw from the aggregate cube (aggregate_cube.py), never from the raw rows.
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import run_trace
+from run_trace import span, Tracer
+
+DEFAULT_DATA = 'imdb_clean_custom.csv'
+DEFAULT_DPI = 300
+
+# Modules whose import registers their charts
+CHART_MODULES = ['Task_03_Data_Visualization', 'Task_03_Advanced_Visualizations']
+
+MANIFEST_NAME = '.chart_manifest.json'
+
+CHART_REGISTRY = {}
+
+
+class ChartJob:
+    """One figure: a draw function, the cube sections it reads, and where and how to save it"""
+
+    def __init__(self, name, func, output, sections, style=None):
+        self.name = name
+        self.func = func
+        self.output = output
+        self.sections = list(sections)
+        self.style = style or {}
+        self.module = func.__module__
+
+    def fingerprint(self, cube, dpi):
+        from scatter_modes import scatter_threshold, scatter_mode
+        return cube_fingerprint(cube, self.sections, code=self.func, dpi=dpi, style=self.style,
+                                scatter=(scatter_threshold(), scatter_mode()))
+
+
+def register_chart(name, output, sections, style=None):
+    """Decorator that adds a draw function to the chart registry.
+
+    The function receives the aggregate cube and should only read the
+    listed `sections` of it (tables, 'moments', 'top'), so the fingerprint
+    of those sections decides whether the chart needs re-rendering.
+    """
+    def decorator(func):
+        CHART_REGISTRY[name] = ChartJob(name, func, output, sections, style)
+        return func
+    return decorator
+
+
+def figure_fingerprint(df, columns, code=None, **params):
+    """Hash of the input columns, the drawing code and the render parameters"""
+    import pandas as pd
+
+    digest = hashlib.sha256()
+    digest.update(json.dumps(list(columns)).encode())
+    hashed = pd.util.hash_pandas_object(df[list(columns)], index=False)
+    digest.update(hashed.to_numpy().tobytes())
+    if code is not None:
+        digest.update(inspect.getsource(code).encode())
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+def cube_fingerprint(cube, sections, code=None, **params):
+    """Hash of the cube sections a chart reads, its drawing code and the render parameters"""
+    digest = hashlib.sha256()
+    for section in sections:
+        digest.update(json.dumps([section, cube.section(section)], sort_keys=True, default=str).encode())
+    if code is not None:
+        digest.update(inspect.getsource(code).encode())
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+class ChartManifest:
+    """Fingerprints of the PNGs in one output directory"""
+
+    def __init__(self, directory):
+        self.path = os.path.join(directory, MANIFEST_NAME)
+        try:
+            with open(self.path) as f:
+                self.entries = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            self.entries = {}
+
+    def is_current(self, output, fingerprint):
+        return os.path.exists(output) and self.entries.get(os.path.basename(output)) == fingerprint
+
+    def record(self, output, fingerprint):
+        self.entries[os.path.basename(output)] = fingerprint
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def load_registry():
+    """Import every chart module so their charts are registered"""
+    import importlib
+    for module in CHART_MODULES:
+        importlib.import_module(module)
+    # Chart modules register into the importable chart_engine, even when this file runs as __main__
+    return importlib.import_module('chart_engine').CHART_REGISTRY
+
+
+def render_chart(name, cube_path, output_dir='.', dpi=DEFAULT_DPI, show=False):
+    """Render a single registered chart from a saved cube.
+
+    Returns (name, output path, seconds, spans); the spans are timed here,
+    possibly in a worker process, for the caller to merge into its trace.
+    """
+    import matplotlib
+    if not show:
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    from aggregate_cube import load_cube
+
+    job = load_registry()[name]
+    tracer = Tracer()
+    start = time.time()
+    with tracer.span(name, pid=os.getpid()):
+        with tracer.span('load_cube'):
+            cube = load_cube(cube_path)
+
+        sns.set_style("whitegrid")
+        with plt.rc_context(job.style):
+            with tracer.span('draw'):
+                job.func(cube)
+            output = os.path.join(output_dir, job.output)
+            with tracer.span('savefig', dpi=dpi):
+                plt.savefig(output, dpi=dpi, bbox_inches='tight')
+            if show:
+                plt.show()
+            plt.close('all')
+
+    return name, output, time.time() - start, tracer.records
+
+
+def run_charts(names=None, data_path=DEFAULT_DATA, output_dir='.', workers=None, dpi=DEFAULT_DPI,
+               show=False, force=False):
+    """Render the selected charts (all by default) whose inputs changed; returns their results"""
+    from aggregate_cube import cube_for
+
+    registry = load_registry()
+    names = list(names or registry)
+    unknown = [name for name in names if name not in registry]
+    if unknown:
+        raise ValueError(f"Unknown chart(s): {', '.join(unknown)}")
+
+    os.makedirs(output_dir, exist_ok=True)
+    start = time.time()
+    results = []
+
+    # Aggregate once per dataset version; every chart renders from the cube file
+    with span('cube'):
+        cube = cube_for(data_path)
+
+    # Skip charts whose inputs, code and render parameters are unchanged
+    manifest = ChartManifest(output_dir)
+    with span('fingerprint', charts=len(names)):
+        fingerprints = {name: registry[name].fingerprint(cube, dpi) for name in names}
+    if not (force or show):
+        skipped = [name for name in names
+                   if manifest.is_current(os.path.join(output_dir, registry[name].output), fingerprints[name])]
+        for name in skipped:
+            print(f" {name}: unchanged, skipped")
+        names = [name for name in names if name not in skipped]
+
+    # Interactive display has to stay in this process, one figure at a time
+    with span('render', charts=len(names)):
+        if show or workers == 1:
+            for name in names:
+                results.append(render_chart(name, cube.path, output_dir, dpi, show))
+                run_trace.TRACER.add_records(results[-1][3])
+                print(f" {name}: {results[-1][2]:.1f}s -> {results[-1][1]}")
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(render_chart, name, cube.path, output_dir, dpi) for name in names]
+                for future in as_completed(futures):
+                    results.append(future.result())
+                    run_trace.TRACER.add_records(results[-1][3])
+                    print(f" {results[-1][0]}: {results[-1][2]:.1f}s -> {results[-1][1]}")
+
+    for name, output, _, _ in results:
+        manifest.record(output, fingerprints[name])
+
+    print(f" Rendered {len(results)} chart(s) in {time.time() - start:.1f}s")
+    return results
+
+
+def main(default_charts=None):
+    parser = argparse.ArgumentParser(description="Render IMDb Top 250 charts")
+    parser.add_argument('charts', nargs='*', help="chart names to render (default: all)")
+    parser.add_argument('--list', action='store_true', help="list available charts and exit")
+    parser.add_argument('--data', default=DEFAULT_DATA, help=f"dataset path (default: {DEFAULT_DATA})")
+    parser.add_argument('--output-dir', default='.', help="where to write the PNGs")
+    parser.add_argument('--workers', type=int, default=None, help="process pool size (default: CPU count)")
+    parser.add_argument('--dpi', type=int, default=DEFAULT_DPI)
+    parser.add_argument('--show', action='store_true', help="render serially and display each figure")
+    parser.add_argument('--force', action='store_true', help="re-render even if a chart is unchanged")
+    parser.add_argument('--scatter-threshold', type=int, default=None,
+                        help="points above which scatters become a density/sample view")
+    parser.add_argument('--scatter-mode', choices=['hexbin', 'sample'], default=None)
+    run_trace.add_arguments(parser)
+    args = parser.parse_args()
+
+    import scatter_modes
+    scatter_modes.configure(args.scatter_threshold, args.scatter_mode)
+
+    registry = load_registry()
+    if args.list:
+        for name, job in registry.items():
+            print(f" {name:32} -> {job.output}")
+        return
+
+    run_trace.configure(args)
+    run_charts(args.charts or default_charts, args.data, args.output_dir, args.workers, args.dpi,
+               args.show, args.force)
+    run_trace.finish(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+# File: dashboard_builder.py
+# Writes the dashboard page plus its pre-aggregated summary and paged movie table data files
+import argparse
+import json
+import math
+import os
+import shutil
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from aggregate_cube import cube_for
+from eda_streaming import DEFAULT_CHUNKSIZE, iter_chunks
+from imdb_columnar import columnar_source
+from imdb_derive import categorize_ratings
+
+DASHBOARD_PAGE = 'Task_03_Dashboard.html'
+DATA_DIR = 'dashboard_data'
+SUMMARY_NAME = 'summary.json'
+PAGE_ROWS = 5_000
+TABLE_COLUMNS = ['position', 'title', 'year', 'rating', 'decade', 'rating_category']
+TOP_ROWS = 10
+
+
+def _jsonable(value):
+    """numpy scalars/arrays to plain Python, NaN/inf to None, so the output is strict JSON"""
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            return None
+        return round(value, 4)
+    return value
+
+
+def write_json(data, path):
+    """Compact, strict JSON written atomically; repeated keys and short numbers gzip well"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(_jsonable(data), f, separators=(',', ':'), ensure_ascii=False, allow_nan=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+def columns_of(frame, columns):
+    """Column-oriented dict of lists: one key per column instead of one per row"""
+    return {col: frame[col].tolist() for col in columns if col in frame.columns}
+
+
+def build_summary(cube):
+    """Everything the page draws on first render, straight from the aggregate cube"""
+    ratings, rating_counts = cube.counts('rating')
+    years, _ = cube.counts('year')
+
+    decade = cube.table('decade')
+    decade = decade[decade['decade'] != 'Unknown']
+    categories = cube.table('rating_category')
+    categories = categories[categories['rating_category'] != 'Unknown']
+
+    # (year, rating) cells, each drawn once and sized by how many movies share it
+    cells = cube.table('year_rating')
+    cells['movie_age'] = cells['movie_age_sum'] / cells['count']
+
+    top = cube.top().head(TOP_ROWS)
+    top['rating_category'] = categorize_ratings(top['rating'])
+
+    return {
+        'stats': {
+            'n_rows': cube.n_rows,
+            'mean_rating': cube.mean('rating'),
+            'max_rating': ratings.max() if len(ratings) else None,
+            'year_min': int(years.min()) if len(years) else None,
+            'year_max': int(years.max()) if len(years) else None,
+        },
+        'decade': {
+            'decade': decade['decade'].tolist(),
+            'count': decade['count'].tolist(),
+            'mean_rating': (decade['rating_sum'] / decade['count']).tolist(),
+        },
+        'rating': {'rating': ratings, 'count': rating_counts},
+        'category': columns_of(categories, ['rating_category', 'count']),
+        'scatter': columns_of(cells, ['year', 'rating', 'count', 'movie_age']),
+        'top': columns_of(top, ['title', 'year', 'rating', 'decade', 'rating_category']),
+    }
+
+
+def write_pages(data_path, out_dir, page_rows=PAGE_ROWS, chunksize=DEFAULT_CHUNKSIZE):
+    """Stream the dataset into movies-NNNN.json pages of `page_rows` rows; returns the file names"""
+    names = []
+    pending = []
+    buffered = 0
+
+    def flush(rows):
+        frame = rows[0] if len(rows) == 1 else pd.concat(rows, ignore_index=True)
+        name = f"movies-{len(names):04d}.json"
+        write_json(columns_of(frame, TABLE_COLUMNS), os.path.join(out_dir, name))
+        names.append(name)
+
+    for chunk in iter_chunks(data_path, chunksize):
+        start = 0
+        while start < len(chunk):
+            take = min(page_rows - buffered, len(chunk) - start)
+            pending.append(chunk.iloc[start:start + take])
+            buffered += take
+            start += take
+            if buffered == page_rows:
+                flush(pending)
+                pending, buffered = [], 0
+    if pending:
+        flush(pending)
+    return names
+
+
+def build_dashboard(data_path='imdb_clean_custom.csv', output_dir='.', page_rows=PAGE_ROWS,
+                    chunksize=DEFAULT_CHUNKSIZE):
+    """Write <output_dir>/dashboard_data/ (summary + table pages) and the page that reads it"""
+    data_path = columnar_source(data_path)
+    out_dir = os.path.join(output_dir, DATA_DIR)
+    os.makedirs(out_dir, exist_ok=True)
+    pages = write_pages(data_path, out_dir, page_rows, chunksize)
+    summary = build_summary(cube_for(data_path, chunksize))
+    summary['table'] = {'pages': pages, 'page_rows': page_rows, 'columns': TABLE_COLUMNS}
+    summary['source'] = os.path.basename(data_path)
+    summary['generated_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    write_json(summary, os.path.join(out_dir, SUMMARY_NAME))
+    # Pages left over from a larger dataset
+    for name in os.listdir(out_dir):
+        if name.startswith('movies-') and name.endswith('.json') and name not in pages:
+            os.remove(os.path.join(out_dir, name))
+
+    template = os.path.join(os.path.dirname(os.path.abspath(__file__)), DASHBOARD_PAGE)
+    page_path = os.path.join(output_dir, DASHBOARD_PAGE)
+    if os.path.abspath(page_path) != template:
+        shutil.copyfile(template, page_path)
+    return page_path, out_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the dashboard and its data files")
+    parser.add_argument('--data', default='imdb_clean_custom.csv', help="dataset (CSV/TSV is streamed)")
+    parser.add_argument('--output-dir', default='.')
+    parser.add_argument('--page-rows', type=int, default=PAGE_ROWS, help="movies per table data file")
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE)
+    args = parser.parse_args()
+
+    page_path, out_dir = build_dashboard(args.data, args.output_dir, args.page_rows, args.chunksize)
+    summary_size = os.path.getsize(os.path.join(out_dir, SUMMARY_NAME))
+    pages = [name for name in os.listdir(out_dir) if name.startswith('movies-')]
+    table_size = sum(os.path.getsize(os.path.join(out_dir, name)) for name in pages)
+    print(f" Dashboard saved: {page_path}")
+    print(f" Summary data: {os.path.join(out_dir, SUMMARY_NAME)} ({summary_size:,} bytes)")
+    print(f" Table data: {len(pages)} page(s) in {out_dir} ({table_size:,} bytes)")
+    print(f" View it over HTTP: python -m http.server --directory {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
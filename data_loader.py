@@ -0,0 +1,148 @@
+# File: data_loader.py
+# Shared, cached dataset loader for the EDA and visualization scripts
+import hashlib
+import os
+from datetime import datetime
+import pandas as pd
+from imdb_columnar import save_columnar, load_columnar, to_typed_frame, columnar_source, CATEGORICAL_COLUMNS
+from imdb_derive import derive_columns
+
+DEFAULT_PATH = 'imdb_clean_custom.csv'
+CACHE_DIR = '.data_cache'
+CACHE_KEEP = 8  # file versions kept in CACHE_DIR
+
+REQUIRED_COLUMNS = ['position', 'title', 'year', 'rating']
+DERIVED_COLUMNS = ['movie_age', 'rating_category', 'decade', 'quality_score']
+NUMERIC_COLUMNS = ['position', 'year', 'rating', 'movie_age', 'quality_score']
+
+_memory_cache = {}
+cache_stats = {'memory_hits': 0, 'disk_hits': 0, 'parses': 0}
+
+
+def file_digest(path):
+    """sha256 of the file contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def validate_schema(df, path):
+    """Check required columns, coerce numerics and fill any missing derived columns"""
+    missing = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"{path} is missing required columns: {', '.join(missing)}")
+
+    for col in NUMERIC_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+
+    if any(col not in df.columns for col in DERIVED_COLUMNS):
+        existing = {col: df[col] for col in DERIVED_COLUMNS if col in df.columns}
+        derive_columns(df, datetime.now().year)
+        for col, values in existing.items():
+            df[col] = values
+
+    return to_typed_frame(df)
+
+
+def to_analysis_frame(df):
+    """Plain numpy dtypes for numeric columns so numpy/matplotlib get fast arrays"""
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.Int64Dtype):
+            df[col] = df[col].astype('float64' if df[col].isna().any() else 'int64')
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    return df
+
+
+def touch_cached(cache_path):
+    """Mark a cache entry as used so prune_cache keeps it"""
+    try:
+        os.utime(cache_path)
+    except OSError:
+        pass
+
+
+def prune_cache(keep=CACHE_KEEP):
+    """Delete all but the `keep` most recently used file versions from CACHE_DIR.
+
+    Entries are named <sha256>.<kind> (the .arrow frame here, the .cube.json
+    of aggregate_cube), so everything cached for one version goes together.
+    """
+    if not os.path.isdir(CACHE_DIR):
+        return 0
+    versions = {}
+    for name in os.listdir(CACHE_DIR):
+        path = os.path.join(CACHE_DIR, name)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            continue
+        digest = name.split('.', 1)[0]
+        paths, newest = versions.get(digest, ([], 0))
+        versions[digest] = (paths + [path], max(newest, mtime))
+    ranked = sorted(versions.values(), key=lambda entry: entry[1], reverse=True)
+    removed = 0
+    for paths, _ in ranked[keep:]:
+        for path in paths:
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+    return removed
+
+
+def load_dataset(path=DEFAULT_PATH, use_cache=True):
+    """Load the cleaned dataset once per process and once per file version on disk.
+
+    imdb_clean_custom.csv is read from the imdb_dataset.arrow it was exported
+    from whenever that file is at least as new (see columnar_source). Other
+    CSVs are parsed once and cached under .data_cache/ keyed by their sha256;
+    only the CACHE_KEEP most recently used versions are kept. The typed frame
+    is also cached in memory keyed by (path, mtime, size). Callers get their
+    own copy.
+    """
+    path = columnar_source(path)
+    stat = os.stat(path)
+    memory_key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+    if use_cache and memory_key in _memory_cache:
+        cache_stats['memory_hits'] += 1
+        return _memory_cache[memory_key].copy()
+
+    if path.endswith('.arrow'):
+        cache_stats['disk_hits'] += 1
+        df = validate_schema(load_columnar(path), path)
+    else:
+        cache_path = os.path.join(CACHE_DIR, f"{file_digest(path)}.arrow")
+        if use_cache and os.path.exists(cache_path):
+            cache_stats['disk_hits'] += 1
+            df = load_columnar(cache_path)
+            touch_cached(cache_path)
+        else:
+            cache_stats['parses'] += 1
+            df = validate_schema(pd.read_csv(path), path)
+            if use_cache:
+                os.makedirs(CACHE_DIR, exist_ok=True)
+                save_columnar(df, cache_path)
+                prune_cache()
+
+    df = to_analysis_frame(df)
+    if use_cache:
+        # Drop frames cached for older versions of the same file
+        for key in [key for key in _memory_cache if key[0] == memory_key[0]]:
+            del _memory_cache[key]
+        _memory_cache[memory_key] = df
+    return df.copy()
+
+
+def clear_cache():
+    """Forget in-memory frames and delete the on-disk cache"""
+    _memory_cache.clear()
+    if os.path.isdir(CACHE_DIR):
+        for name in os.listdir(CACHE_DIR):
+            os.remove(os.path.join(CACHE_DIR, name))
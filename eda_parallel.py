@@ -0,0 +1,167 @@
+# File: eda_parallel.py
+# Partition-parallel EDA: partial accumulators on a process pool, merged in order
+import io
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from eda_streaming import (StreamingEDA, OutlierScan, QUANTILE_COLUMNS, DEFAULT_CHUNKSIZE,
+                           prepare_chunk, stream_stats, stream_outliers)
+
+COMPRESSED_SUFFIXES = ('.gz', '.bz2', '.zip', '.xz', '.zst')
+# Leading bytes of gzip, bzip2, zip, xz and zstd files
+COMPRESSED_MAGIC = (b'\x1f\x8b', b'BZh', b'PK\x03\x04', b'\xfd7zXZ\x00', b'\x28\xb5\x2f\xfd')
+
+
+class ByteRange(io.RawIOBase):
+    """File-like view of the CSV header followed by bytes [start, stop) of the file"""
+
+    def __init__(self, path, header, start, stop):
+        self.file = open(path, 'rb')
+        self.file.seek(start)
+        self.header = header
+        self.remaining = stop - start
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if self.header:
+            n = min(len(buffer), len(self.header))
+            buffer[:n] = self.header[:n]
+            self.header = self.header[n:]
+            return n
+        n = min(len(buffer), self.remaining)
+        if n <= 0:
+            return 0
+        data = self.file.read(n)
+        buffer[:len(data)] = data
+        self.remaining -= len(data)
+        return len(data)
+
+    def close(self):
+        self.file.close()
+        super().close()
+
+
+def row_ranges(path, parts):
+    """Split a CSV into up to `parts` byte ranges that start and end on line breaks.
+
+    Assumes no quoted field spans a newline, which holds for the scraper's
+    output and the IMDb TSV dumps.
+    """
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        header = f.readline()
+        start = f.tell()
+        bounds = [start]
+        for i in range(1, parts):
+            target = start + (size - start) * i // parts
+            if target <= bounds[-1]:
+                continue
+            f.seek(target)
+            f.readline()
+            bounds.append(min(f.tell(), size))
+        bounds.append(size)
+    ranges = [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+    return header, ranges
+
+
+def is_compressed(path):
+    """Byte offsets into a compressed stream are not row boundaries, so such files can't be split"""
+    if path.endswith(COMPRESSED_SUFFIXES):
+        return True
+    with open(path, 'rb') as f:
+        return f.read(6).startswith(COMPRESSED_MAGIC)
+
+
+def _sep_for(path, sep):
+    if sep is None:
+        stem = path[:-len(os.path.splitext(path)[1])] if path.endswith(COMPRESSED_SUFFIXES) else path
+        sep = '\t' if stem.endswith('.tsv') else ','
+    return sep
+
+
+def _iter_range(path, header, start, stop, chunksize, sep):
+    with io.BufferedReader(ByteRange(path, header, start, stop)) as stream:
+        reader = pd.read_csv(stream, sep=sep, chunksize=chunksize, na_values=['\\N'], low_memory=False)
+        for chunk in reader:
+            yield prepare_chunk(chunk)
+
+
+def _stats_partial(path, header, start, stop, chunksize, sep):
+    acc = StreamingEDA()
+    for chunk in _iter_range(path, header, start, stop, chunksize, sep):
+        acc.update(chunk)
+    return acc
+
+
+def _outlier_partial(path, header, start, stop, chunksize, sep, bounds):
+    scan = OutlierScan(bounds)
+    for chunk in _iter_range(path, header, start, stop, chunksize, sep):
+        scan.update(chunk)
+    return scan
+
+
+def _frame_partial(frame):
+    return StreamingEDA().update(prepare_chunk(frame))
+
+
+def merge_partials(partials):
+    """Fold partial accumulators together in partition order"""
+    partials = iter(partials)
+    total = next(partials)
+    for partial in partials:
+        total.merge(partial)
+    return total
+
+
+def _run(func, jobs, workers):
+    if workers == 1 or len(jobs) == 1:
+        return [func(*job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map() keeps partition order, which the merge relies on
+        return list(pool.map(func, *zip(*jobs)))
+
+
+def parallel_stats(path, workers=None, chunksize=DEFAULT_CHUNKSIZE, sep=None):
+    """First EDA pass over `path`, one row range per worker (compressed files: one serial pass)"""
+    workers = workers or os.cpu_count() or 1
+    sep = _sep_for(path, sep)
+    if is_compressed(path):
+        print(f" {path} is compressed and can't be split into row ranges; scanning it serially")
+        return stream_stats(path, chunksize, sep)
+    header, ranges = row_ranges(path, workers)
+    jobs = [(path, header, start, stop, chunksize, sep) for start, stop in ranges]
+    return merge_partials(_run(_stats_partial, jobs, workers)).finalize()
+
+
+def parallel_outliers(path, summary, workers=None, chunksize=DEFAULT_CHUNKSIZE, sep=None):
+    """Second EDA pass: outlier counts per row range, summed"""
+    workers = workers or os.cpu_count() or 1
+    sep = _sep_for(path, sep)
+    if is_compressed(path):
+        return stream_outliers(path, summary, chunksize, sep)
+    bounds = {col: summary[col].outlier_bounds() for col in QUANTILE_COLUMNS if col in summary.column_stats}
+    header, ranges = row_ranges(path, workers)
+    jobs = [(path, header, start, stop, chunksize, sep, bounds) for start, stop in ranges]
+    return merge_partials(_run(_outlier_partial, jobs, workers))
+
+
+def parallel_frame_stats(df, workers=None, by='rows'):
+    """EDA summaries of an in-memory frame, partitioned by row range or by decade.
+
+    Decade partitions give exact moments, correlations, histograms and
+    decade stats, but row-order results (positions in order, which title
+    wins a tie for highest/lowest rating) are only meaningful for row ranges.
+    """
+    workers = workers or os.cpu_count() or 1
+    if by == 'decade':
+        parts = [group for _, group in df.groupby('decade', observed=True, sort=True)]
+    else:
+        bounds = np.linspace(0, len(df), workers + 1).astype(int)
+        parts = [df.iloc[a:b] for a, b in zip(bounds, bounds[1:]) if b > a]
+    total = merge_partials(_run(_frame_partial, [(part,) for part in parts], workers))
+    if by == 'decade':
+        total.positions_ordered = bool(df['position'].is_monotonic_increasing) if 'position' in df.columns else True
+    return total.finalize()
@@ -0,0 +1,148 @@
+# File: eda_stats.py
+# Every summary statistic the EDA needs, computed once per dataset
+import numpy as np
+import pandas as pd
+
+STATS_COLUMNS = ['position', 'year', 'rating', 'movie_age', 'quality_score']
+QUANTILES = [0.25, 0.5, 0.75]
+# Columns whose quartiles the EDA reads (median, IQR outlier fences)
+QUANTILE_COLUMNS = ['rating', 'year']
+
+
+class ColumnStats:
+    """Moments, order statistics and extremes of one numeric column"""
+
+    def __init__(self, name, count, mean, var, skew, minimum, maximum, idxmin, idxmax, q1, median, q3):
+        self.name = name
+        self.count = count
+        self.mean = mean
+        self.var = var
+        self.std = np.sqrt(var)
+        self.skew = skew
+        self.min = minimum
+        self.max = maximum
+        self.idxmin = idxmin
+        self.idxmax = idxmax
+        self.q1 = q1
+        self.median = median
+        self.q3 = q3
+
+    @property
+    def iqr(self):
+        return self.q3 - self.q1
+
+    def outlier_bounds(self, k=1.5):
+        """IQR fences used by detect_issues"""
+        return self.q1 - k * self.iqr, self.q3 + k * self.iqr
+
+
+class EDAStats:
+    """Column summaries, the correlation matrix and per-decade rating stats.
+
+    Numeric columns are pulled into one float matrix and moments,
+    co-moments, quartiles and extremes are all computed from it together.
+    The EDA functions read from the result instead of calling pandas again.
+    """
+
+    def __init__(self, df, columns=None):
+        columns = [col for col in (columns or STATS_COLUMNS) if col in df.columns]
+        self.columns = columns
+        self.index = df.index
+        self.n_rows = len(df)
+        self.all_columns = df.columns.tolist()
+
+        # Column-major so every per-column reduction reads contiguous memory
+        X = np.asfortranarray(df[columns].to_numpy(dtype=float))
+        valid = ~np.isnan(X)
+        centred = np.empty_like(X)
+        m2 = np.zeros(len(columns))
+
+        self.column_stats = {}
+        for j, col in enumerate(columns):
+            values = X[:, j]
+            mask = valid[:, j]
+            present = values if mask.all() else values[mask]
+            n = len(present)
+            if n == 0:
+                self.column_stats[col] = ColumnStats(col, 0, *([np.nan] * 4), None, None, *([np.nan] * 3))
+                centred[:, j] = 0.0
+                continue
+
+            # Moments from the centred column: mean, var and skew via dot products
+            mean = present.sum() / n
+            c = present - mean
+            m2[j] = c @ c
+            m3 = (c * c) @ c
+            with np.errstate(divide='ignore', invalid='ignore'):
+                var = m2[j] / (n - 1)
+                g1 = (m3 / n) / (m2[j] / n) ** 1.5
+                skew = g1 * np.sqrt(n * (n - 1)) / (n - 2)
+            centred[:, j] = c if n == len(values) else np.where(mask, values - mean, 0.0)
+
+            # One partition yields min, quartiles and max together
+            if col in QUANTILE_COLUMNS:
+                order = self._order_stats(present)
+            else:
+                order = [present.min()] + [np.nan] * len(QUANTILES) + [present.max()]
+            imin = np.flatnonzero(mask)[present.argmin()] if n < len(values) else present.argmin()
+            imax = np.flatnonzero(mask)[present.argmax()] if n < len(values) else present.argmax()
+
+            self.column_stats[col] = ColumnStats(
+                col, n, mean, var, skew, order[0], order[-1], self.index[imin], self.index[imax], *order[1:-1],
+            )
+
+        self.corr = self._correlations(X, valid, centred, m2)
+        self.highest_title = self.lowest_title = None
+        if 'title' in df.columns and 'rating' in self.column_stats and self['rating'].count:
+            self.highest_title = df.at[self['rating'].idxmax, 'title']
+            self.lowest_title = df.at[self['rating'].idxmin, 'title']
+        self.decade_stats = self._decade_stats(df)
+
+    @staticmethod
+    def _order_stats(values):
+        """min, q1, median, q3, max with linear interpolation (pandas' default)"""
+        n = len(values)
+        positions = np.array([0.0] + [q * (n - 1) for q in QUANTILES] + [n - 1.0])
+        lower = np.floor(positions).astype(int)
+        upper = np.minimum(lower + 1, n - 1)
+        part = np.partition(values, np.unique(np.concatenate([lower, upper])))
+        frac = positions - lower
+        return part[lower] + (part[upper] - part[lower]) * frac
+
+    def _correlations(self, X, valid, centred, m2):
+        if valid.all():
+            with np.errstate(divide='ignore', invalid='ignore'):
+                corr = (centred.T @ centred) / np.sqrt(np.outer(m2, m2))
+        else:
+            # Pairwise-complete rows, as pandas does
+            k = len(self.columns)
+            corr = np.eye(k)
+            for a in range(k):
+                for b in range(a + 1, k):
+                    both = valid[:, a] & valid[:, b]
+                    corr[a, b] = corr[b, a] = np.corrcoef(X[both, a], X[both, b])[0, 1]
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+    def _decade_stats(self, df):
+        if 'decade' not in df.columns or 'rating' not in df.columns:
+            return None
+        codes, decades = pd.factorize(df['decade'], sort=True)
+        ratings = df['rating'].to_numpy(dtype=float)
+        keep = (codes >= 0) & ~np.isnan(ratings)
+        counts = np.bincount(codes[keep], minlength=len(decades))
+        sums = np.bincount(codes[keep], weights=ratings[keep], minlength=len(decades))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            means = sums / counts
+        stats = pd.DataFrame({'mean': means, 'count': counts}, index=pd.Index([str(d) for d in decades], name='decade'))
+        return stats[stats['count'] > 0]
+
+    def __getitem__(self, column):
+        return self.column_stats[column]
+
+    def correlation(self, a, b):
+        return self.corr.loc[a, b]
+
+
+def compute_stats(df, columns=None):
+    """Compute every EDA summary for `df` in one go"""
+    return EDAStats(df, columns)
@@ -0,0 +1,511 @@
+# File: eda_streaming.py
+# Chunked EDA with mergeable accumulators, for datasets that don't fit in memory
+import heapq
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from eda_stats import ColumnStats, STATS_COLUMNS, QUANTILES, QUANTILE_COLUMNS
+from imdb_derive import categorize_ratings, decade_labels, quality_scores
+from imdb_columnar import iter_columnar, to_plain_frame
+
+# Column names used by the public IMDb dumps (title.basics + title.ratings joined)
+DUMP_COLUMNS = {'tconst': 'imdb_id', 'primaryTitle': 'title', 'startYear': 'year', 'averageRating': 'rating'}
+
+CORRELATION_PAIRS = [('year', 'rating'), ('position', 'rating'), ('movie_age', 'rating')]
+# Fixed bin edges centred on the values each column takes (tenths, whole years)
+HISTOGRAM_EDGES = {
+    'rating': np.arange(0, 102) / 10 - 0.05,
+    'year': np.arange(1880, 2032) - 0.5,
+}
+DEFAULT_CHUNKSIZE = 500_000
+
+
+class Moments:
+    """Count, mean, M2, M3 and extremes, merged with Chan et al.'s pairwise update"""
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.min_label = None
+        self.max_label = None
+
+    def update(self, values, labels=None):
+        values = np.asarray(values, dtype=float)
+        keep = ~np.isnan(values)
+        values = values[keep]
+        if len(values) == 0:
+            return self
+        chunk = Moments()
+        chunk.n = len(values)
+        chunk.mean = values.mean()
+        c = values - chunk.mean
+        chunk.m2 = c @ c
+        chunk.m3 = (c * c) @ c
+        imin, imax = values.argmin(), values.argmax()
+        chunk.min, chunk.max = values[imin], values[imax]
+        if labels is not None:
+            labels = np.asarray(labels)[keep]
+            chunk.min_label, chunk.max_label = labels[imin], labels[imax]
+        return self.merge(chunk)
+
+    def merge(self, other):
+        """Fold `other` (the later rows) into this accumulator"""
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.__dict__.update(other.__dict__)
+            return self
+        n_a, n_b = self.n, other.n
+        n = n_a + n_b
+        delta = other.mean - self.mean
+        self.m3 = (self.m3 + other.m3
+                   + delta ** 3 * n_a * n_b * (n_a - n_b) / n ** 2
+                   + 3 * delta * (n_a * other.m2 - n_b * self.m2) / n)
+        self.m2 = self.m2 + other.m2 + delta ** 2 * n_a * n_b / n
+        self.mean = self.mean + delta * n_b / n
+        self.n = n
+        # Ties keep the earlier row, like idxmin/idxmax
+        if other.min < self.min:
+            self.min, self.min_label = other.min, other.min_label
+        if other.max > self.max:
+            self.max, self.max_label = other.max, other.max_label
+        return self
+
+    @property
+    def var(self):
+        return self.m2 / (self.n - 1) if self.n > 1 else np.nan
+
+    @property
+    def skew(self):
+        n = self.n
+        if n < 3 or self.m2 == 0:
+            return np.nan
+        g1 = (self.m3 / n) / (self.m2 / n) ** 1.5
+        return g1 * np.sqrt(n * (n - 1)) / (n - 2)
+
+
+class CoMoments:
+    """Mergeable co-moment for a Pearson correlation over pairwise-complete rows"""
+
+    def __init__(self):
+        self.n = 0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.m2_x = 0.0
+        self.m2_y = 0.0
+        self.c_xy = 0.0
+
+    def update(self, x, y):
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        both = ~(np.isnan(x) | np.isnan(y))
+        x, y = x[both], y[both]
+        if len(x) == 0:
+            return self
+        chunk = CoMoments()
+        chunk.n = len(x)
+        chunk.mean_x, chunk.mean_y = x.mean(), y.mean()
+        dx, dy = x - chunk.mean_x, y - chunk.mean_y
+        chunk.m2_x, chunk.m2_y, chunk.c_xy = dx @ dx, dy @ dy, dx @ dy
+        return self.merge(chunk)
+
+    def merge(self, other):
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.__dict__.update(other.__dict__)
+            return self
+        n = self.n + other.n
+        factor = self.n * other.n / n
+        dx = other.mean_x - self.mean_x
+        dy = other.mean_y - self.mean_y
+        self.m2_x += other.m2_x + dx * dx * factor
+        self.m2_y += other.m2_y + dy * dy * factor
+        self.c_xy += other.c_xy + dx * dy * factor
+        self.mean_x += dx * other.n / n
+        self.mean_y += dy * other.n / n
+        self.n = n
+        return self
+
+    @property
+    def corr(self):
+        denom = np.sqrt(self.m2_x * self.m2_y)
+        return self.c_xy / denom if denom else np.nan
+
+
+class KLLSketch:
+    """KLL quantile sketch (Karnin, Lang, Liberty). Exact until more than k values are added.
+
+    Level h holds items of weight 2**h; a full level is sorted and every
+    other item (random offset) is promoted. Sketches merge level by level.
+    """
+
+    def __init__(self, k=2048, seed=0):
+        self.k = k
+        self.n = 0
+        self.levels = [np.empty(0)]
+        self.rng = np.random.default_rng(seed)
+
+    def _capacity(self, h):
+        depth = len(self.levels) - h - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        self.n += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other):
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for h, items in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], items])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def _compress(self):
+        h = 0
+        while h < len(self.levels):
+            if len(self.levels[h]) > self._capacity(h):
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(self.levels[h])
+                keep = items[-1:] if len(items) % 2 else items[:0]
+                items = items[:len(items) - len(keep)]
+                offset = self.rng.integers(2)
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], items[offset::2]])
+                self.levels[h] = keep
+            h += 1
+
+    def quantile(self, qs):
+        """Quantiles with pandas-style linear interpolation between ranks"""
+        values = np.concatenate(self.levels)
+        if len(values) == 0:
+            return np.full(len(qs), np.nan)
+        weights = np.concatenate([np.full(len(items), 2 ** h) for h, items in enumerate(self.levels)])
+        order = np.argsort(values, kind='stable')
+        values, cumulative = values[order], np.cumsum(weights[order])
+
+        ranks = np.asarray(qs, dtype=float) * (cumulative[-1] - 1)
+        lower = np.floor(ranks)
+        at_lower = values[np.searchsorted(cumulative, lower, side='right')]
+        at_upper = values[np.minimum(np.searchsorted(cumulative, lower + 1, side='right'), len(values) - 1)]
+        return at_lower + (at_upper - at_lower) * (ranks - lower)
+
+
+class KeyHashes:
+    """Hash-based duplicate counter on a key (title, year): 8 bytes per distinct key"""
+
+    def __init__(self):
+        self.seen = np.empty(0, dtype=np.uint64)
+        self.duplicates = 0
+
+    def update(self, keys):
+        # Hashes depend on dtype, and a chunk's year is Int64 or float64 depending on
+        # whether it has gaps, so every chunk is hashed as float64 numbers and str labels
+        keys = pd.DataFrame({col: keys[col].astype('float64') if pd.api.types.is_numeric_dtype(keys[col])
+                             else keys[col].astype(str) for col in keys.columns})
+        hashes = pd.util.hash_pandas_object(keys, index=False).to_numpy()
+        return self._add(hashes)
+
+    def _add(self, hashes):
+        hashes = np.sort(hashes)
+        first = np.ones(len(hashes), dtype=bool)
+        first[1:] = hashes[1:] != hashes[:-1]
+        unique = hashes[first]
+        pos = np.minimum(np.searchsorted(self.seen, unique), max(len(self.seen) - 1, 0))
+        found = self.seen[pos] == unique if len(self.seen) else np.zeros(len(unique), dtype=bool)
+        self.duplicates += len(hashes) - len(unique) + int(found.sum())
+        # Both inputs are sorted runs, so a stable sort is a linear merge
+        self.seen = np.sort(np.concatenate([self.seen, unique[~found]]), kind='stable')
+        return self
+
+    def merge(self, other):
+        self.duplicates += other.duplicates
+        return self._add(other.seen)
+
+
+class Histogram:
+    """Counts at fixed bin edges; merging is element-wise addition"""
+
+    def __init__(self, edges):
+        self.edges = np.asarray(edges, dtype=float)
+        self.counts = np.zeros(len(self.edges) - 1, dtype=np.int64)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        self.counts += np.histogram(values[~np.isnan(values)], bins=self.edges)[0]
+        return self
+
+    def merge(self, other):
+        self.counts += other.counts
+        return self
+
+
+class GroupMeans:
+    """Per-label sum and count (decade -> mean rating)"""
+
+    def __init__(self):
+        self.sums = {}
+        self.counts = {}
+
+    def update(self, labels, values):
+        frame = pd.DataFrame({'label': np.asarray(labels, dtype=object), 'value': np.asarray(values, dtype=float)})
+        grouped = frame.dropna().groupby('label')['value'].agg(['sum', 'count'])
+        for label, row in grouped.iterrows():
+            self.sums[label] = self.sums.get(label, 0.0) + row['sum']
+            self.counts[label] = self.counts.get(label, 0) + int(row['count'])
+        return self
+
+    def merge(self, other):
+        for label, total in other.sums.items():
+            self.sums[label] = self.sums.get(label, 0.0) + total
+            self.counts[label] = self.counts.get(label, 0) + other.counts[label]
+        return self
+
+    def frame(self):
+        labels = sorted(self.sums)
+        return pd.DataFrame({'mean': [self.sums[l] / self.counts[l] for l in labels],
+                             'count': [self.counts[l] for l in labels]},
+                            index=pd.Index(labels, name='decade'))
+
+
+class Extremes:
+    """The k rows with the smallest (or largest) key, e.g. top/bottom 10 by position"""
+
+    def __init__(self, k=10, largest=False):
+        self.k = k
+        self.largest = largest
+        self.rows = []
+
+    def update(self, keys, values):
+        keys = np.asarray(keys, dtype=float)
+        values = np.asarray(values, dtype=float)
+        keep = ~np.isnan(keys)
+        keys, values = keys[keep], values[keep]
+        if len(keys) > self.k:
+            pick = np.argpartition(-keys if self.largest else keys, self.k - 1)[:self.k]
+            keys, values = keys[pick], values[pick]
+        self.rows.extend(zip(keys.tolist(), values.tolist()))
+        return self._trim()
+
+    def merge(self, other):
+        self.rows.extend(other.rows)
+        return self._trim()
+
+    def _trim(self):
+        pick = heapq.nlargest if self.largest else heapq.nsmallest
+        self.rows = pick(self.k, self.rows, key=lambda row: row[0])
+        return self
+
+    def values(self):
+        return pd.Series([value for _, value in self.rows])
+
+
+def prepare_chunk(chunk, current_year=None):
+    """Rename dump columns and derive whatever the EDA needs but the file lacks"""
+    chunk = chunk.rename(columns={k: v for k, v in DUMP_COLUMNS.items() if k in chunk.columns})
+    for col in ['position', 'year', 'rating', 'movie_age', 'quality_score']:
+        if col in chunk.columns:
+            chunk[col] = pd.to_numeric(chunk[col], errors='coerce')
+    if 'year' in chunk.columns:
+        if 'movie_age' not in chunk.columns:
+            chunk['movie_age'] = (current_year or datetime.now().year) - chunk['year']
+        if 'decade' not in chunk.columns:
+            chunk['decade'] = decade_labels(chunk['year'])
+        if 'quality_score' not in chunk.columns and 'rating' in chunk.columns:
+            chunk['quality_score'] = quality_scores(chunk['rating'], chunk['year'])
+    if 'rating_category' not in chunk.columns and 'rating' in chunk.columns:
+        chunk['rating_category'] = categorize_ratings(chunk['rating'])
+    return chunk
+
+
+class StreamingEDA:
+    """All first-pass EDA accumulators; update() per chunk, merge() across partitions"""
+
+    def __init__(self, sketch_k=2048, seed=0):
+        self.n_rows = 0
+        self.all_columns = None
+        self.moments = {col: Moments() for col in STATS_COLUMNS}
+        self.sketches = {col: KLLSketch(sketch_k, seed) for col in QUANTILE_COLUMNS}
+        self.pairs = {pair: CoMoments() for pair in CORRELATION_PAIRS}
+        self.histograms = {col: Histogram(edges) for col, edges in HISTOGRAM_EDGES.items()}
+        self.decades = GroupMeans()
+        self.top = Extremes(10)
+        self.bottom = Extremes(10, largest=True)
+        self.keys = KeyHashes()
+        self.ratings_in_range = True
+        self.positions_ordered = True
+        self.first_position = None
+        self.last_position = None
+
+    def update(self, chunk):
+        if self.all_columns is None:
+            self.all_columns = list(chunk.columns)
+        self.n_rows += len(chunk)
+        titles = chunk['title'].to_numpy() if 'title' in chunk.columns else None
+
+        for col, acc in self.moments.items():
+            if col in chunk.columns:
+                acc.update(chunk[col], titles if col == 'rating' else None)
+        for col, sketch in self.sketches.items():
+            if col in chunk.columns:
+                sketch.update(chunk[col])
+        for (a, b), acc in self.pairs.items():
+            if a in chunk.columns and b in chunk.columns:
+                acc.update(chunk[a], chunk[b])
+        for col, hist in self.histograms.items():
+            if col in chunk.columns:
+                hist.update(chunk[col])
+
+        if 'decade' in chunk.columns and 'rating' in chunk.columns:
+            self.decades.update(chunk['decade'], chunk['rating'])
+        if 'position' in chunk.columns and 'rating' in chunk.columns:
+            self.top.update(chunk['position'], chunk['rating'])
+            self.bottom.update(chunk['position'], chunk['rating'])
+            positions = chunk['position'].to_numpy(dtype=float)
+            if len(positions):
+                self._track_order(positions[0], positions[-1], bool(np.all(np.diff(positions) >= 0)))
+        if 'title' in chunk.columns and 'year' in chunk.columns:
+            self.keys.update(chunk[['title', 'year']])
+        if 'rating' in chunk.columns:
+            self.ratings_in_range &= bool(chunk['rating'].between(1, 10).all())
+        return self
+
+    def _track_order(self, first, last, ordered_inside):
+        if self.last_position is not None and first < self.last_position:
+            ordered_inside = False
+        self.positions_ordered &= ordered_inside
+        if self.first_position is None:
+            self.first_position = first
+        self.last_position = last
+
+    def merge(self, other):
+        """Fold in the accumulators of the partition that follows this one"""
+        self.n_rows += other.n_rows
+        self.all_columns = self.all_columns or other.all_columns
+        for col in self.moments:
+            self.moments[col].merge(other.moments[col])
+        for col in self.sketches:
+            self.sketches[col].merge(other.sketches[col])
+        for pair in self.pairs:
+            self.pairs[pair].merge(other.pairs[pair])
+        for col in self.histograms:
+            self.histograms[col].merge(other.histograms[col])
+        self.decades.merge(other.decades)
+        self.top.merge(other.top)
+        self.bottom.merge(other.bottom)
+        self.keys.merge(other.keys)
+        self.ratings_in_range &= other.ratings_in_range
+        if other.first_position is not None:
+            self._track_order(other.first_position, other.last_position, other.positions_ordered)
+        return self
+
+    def finalize(self):
+        return StreamingStats(self)
+
+
+class StreamingStats:
+    """Read-only view with the same interface the EDA uses on eda_stats.EDAStats"""
+
+    def __init__(self, acc):
+        self.n_rows = acc.n_rows
+        self.all_columns = acc.all_columns or []
+        self.column_stats = {}
+        for col, m in acc.moments.items():
+            if m.n == 0:
+                continue
+            if col in acc.sketches:
+                q1, median, q3 = acc.sketches[col].quantile(QUANTILES)
+            else:
+                q1 = median = q3 = np.nan
+            self.column_stats[col] = ColumnStats(col, m.n, m.mean, m.var, m.skew, m.min, m.max,
+                                                 None, None, q1, median, q3)
+        rating = acc.moments['rating']
+        self.highest_title = rating.max_label
+        self.lowest_title = rating.min_label
+        self.correlations = {pair: acc.pairs[pair].corr for pair in acc.pairs}
+        self.histograms = {col: (hist.edges, hist.counts) for col, hist in acc.histograms.items()}
+        self.decade_stats = acc.decades.frame()
+        self.top_10 = acc.top.values()
+        self.bottom_10 = acc.bottom.values()
+        self.duplicates = acc.keys.duplicates
+        self.ratings_in_range = acc.ratings_in_range
+        self.positions_ordered = acc.positions_ordered
+
+    def __getitem__(self, column):
+        return self.column_stats[column]
+
+    def correlation(self, a, b):
+        if (a, b) in self.correlations:
+            return self.correlations[(a, b)]
+        return self.correlations[(b, a)]
+
+
+class OutlierScan:
+    """Second pass: rows outside the IQR fences, plus the top-rated outliers"""
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = {col: 0 for col in bounds}
+        self.high_rated = []
+
+    def update(self, chunk):
+        for col, (lower, upper) in self.bounds.items():
+            if col not in chunk.columns:
+                continue
+            outside = (chunk[col] < lower) | (chunk[col] > upper)
+            self.counts[col] += int(outside.sum())
+            if col == 'rating' and outside.any():
+                rows = chunk.loc[outside, ['title', 'rating']].nlargest(5, 'rating')
+                self.high_rated.append(rows)
+        return self
+
+    def merge(self, other):
+        for col in self.counts:
+            self.counts[col] += other.counts[col]
+        self.high_rated.extend(other.high_rated)
+        return self
+
+    def top_outliers(self, k=5):
+        if not self.high_rated:
+            return pd.DataFrame(columns=['title', 'rating'])
+        return pd.concat(self.high_rated).nlargest(k, 'rating')
+
+
+def iter_chunks(path, chunksize=DEFAULT_CHUNKSIZE, sep=None):
+    """Read `path` in fixed-size chunks; tab-separated dumps use \\N for missing values"""
+    if path.endswith('.arrow'):
+        for chunk in iter_columnar(path, chunksize):
+            yield prepare_chunk(to_plain_frame(chunk))
+        return
+    if sep is None:
+        sep = '\t' if path.endswith(('.tsv', '.tsv.gz')) else ','
+    reader = pd.read_csv(path, sep=sep, chunksize=chunksize, na_values=['\\N'], low_memory=False)
+    for chunk in reader:
+        yield prepare_chunk(chunk)
+
+
+def stream_stats(path, chunksize=DEFAULT_CHUNKSIZE, sep=None):
+    """First pass: all summaries with bounded memory"""
+    acc = StreamingEDA()
+    for chunk in iter_chunks(path, chunksize, sep):
+        acc.update(chunk)
+    return acc.finalize()
+
+
+def stream_outliers(path, summary, chunksize=DEFAULT_CHUNKSIZE, sep=None):
+    """Second pass: count rows outside the fences computed in the first pass"""
+    bounds = {col: summary[col].outlier_bounds() for col in QUANTILE_COLUMNS if col in summary.column_stats}
+    scan = OutlierScan(bounds)
+    for chunk in iter_chunks(path, chunksize, sep):
+        scan.update(chunk)
+    return scan
@@ -0,0 +1,150 @@
+# File: http_cache.py
+import hashlib
+import json
+import os
+import time
+import requests
+
+
+class CachedResponse:
+    """Minimal response object returned by ResponseCache.get"""
+
+    def __init__(self, status_code, content, headers=None, from_cache=False):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.from_cache = from_cache
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+
+class ResponseCache:
+    """On-disk HTTP response cache keyed by URL.
+
+    Each entry stores the body plus ETag/Last-Modified. Entries younger than
+    `ttl` seconds are served without touching the network; older ones are
+    revalidated with a conditional request. When the cache grows beyond
+    `max_bytes` the least recently used entries are evicted.
+    """
+
+    def __init__(self, cache_dir='.http_cache', ttl=3600, max_bytes=50 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._memory = {}
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return base + '.body', base + '.json'
+
+    def _load(self, url):
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                body = f.read()
+        except (OSError, json.JSONDecodeError):
+            return None, None
+        return meta, body
+
+    def _store(self, url, meta, body=None):
+        # Created on first write, so offline runs that only read leave no directory behind
+        os.makedirs(self.cache_dir, exist_ok=True)
+        body_path, meta_path = self._paths(url)
+        if body is not None:
+            with open(body_path, 'wb') as f:
+                f.write(body)
+        meta['accessed_at'] = time.time()
+        with open(meta_path, 'w') as f:
+            json.dump(meta, f)
+
+    def get(self, url, headers=None, timeout=10, session=None):
+        """Return a response for `url` from memory, disk or the network"""
+        if url in self._memory:
+            return self._memory[url]
+
+        meta, body = self._load(url)
+        now = time.time()
+
+        # Fresh entry: no network at all
+        if meta and now - meta.get('fetched_at', 0) < self.ttl:
+            self._store(url, meta)
+            return self._remember(url, CachedResponse(meta['status_code'], body, meta.get('headers'), True))
+
+        request_headers = dict(headers or {})
+        if meta:
+            if meta.get('etag'):
+                request_headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                request_headers['If-Modified-Since'] = meta['last_modified']
+
+        http = session or requests
+        response = http.get(url, headers=request_headers, timeout=timeout)
+
+        # Not modified: keep the stored body, restart the TTL
+        if response.status_code == 304 and meta:
+            meta['fetched_at'] = now
+            self._store(url, meta)
+            return self._remember(url, CachedResponse(meta['status_code'], body, meta.get('headers'), True))
+
+        result = CachedResponse(response.status_code, response.content, dict(response.headers))
+        if response.status_code == 200:
+            self._store(url, {
+                'url': url,
+                'status_code': response.status_code,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'headers': {'Content-Type': response.headers.get('Content-Type', '')},
+                'fetched_at': now,
+            }, response.content)
+            self.evict()
+
+        return self._remember(url, result)
+
+    def _remember(self, url, response):
+        if response.status_code == 200:
+            self._memory[url] = response
+        return response
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        entries = []
+        total = 0
+        if not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.json'):
+                continue
+            meta_path = os.path.join(self.cache_dir, name)
+            body_path = meta_path[:-len('.json')] + '.body'
+            try:
+                with open(meta_path) as f:
+                    accessed = json.load(f).get('accessed_at', 0)
+                size = os.path.getsize(body_path)
+            except (OSError, json.JSONDecodeError):
+                continue
+            entries.append((accessed, size, body_path, meta_path))
+            total += size
+
+        for accessed, size, body_path, meta_path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            for path in (body_path, meta_path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
+
+    def clear(self):
+        """Remove every cached entry"""
+        self._memory.clear()
+        if not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(('.body', '.json')):
+                os.remove(os.path.join(self.cache_dir, name))
@@ -0,0 +1,81 @@
+# File: imdb_charts.py
+# Registry of the IMDb charts we track, and the chart-partitioned dataset they are written to
+import os
+import pandas as pd
+from imdb_columnar import save_columnar, load_columnar
+
+CHARTS_ROOT = 'imdb_charts'
+PARTITION_FILE = 'data.arrow'
+
+# name -> (path under the site root, label)
+CHARTS = {}
+
+GENRES = ['action', 'adventure', 'animation', 'biography', 'comedy', 'crime', 'documentary',
+          'drama', 'family', 'fantasy', 'film-noir', 'history', 'horror', 'music', 'musical',
+          'mystery', 'romance', 'sci-fi', 'sport', 'thriller', 'war', 'western']
+
+
+def register_chart(name, path, label=None):
+    """Add a chart to the registry; `path` is relative to the scraper's base URL"""
+    CHARTS[name] = (path, label or name)
+
+
+register_chart('top', '/chart/top/', "Top 250 Movies")
+register_chart('moviemeter', '/chart/moviemeter/', "Most Popular Movies")
+register_chart('toptv', '/chart/toptv/', "Top 250 TV Shows")
+register_chart('tvmeter', '/chart/tvmeter/', "Most Popular TV Shows")
+for genre in GENRES:
+    register_chart(f'genre-{genre}', f'/chart/top/?genres={genre}', f"Top Rated {genre.title()} Movies")
+
+
+def chart_url(base_url, name):
+    return base_url.rstrip('/') + CHARTS[name][0]
+
+
+def resolve_charts(names):
+    """Expand 'all' and 'genres' and check every name is registered"""
+    resolved = []
+    for name in names:
+        if name == 'all':
+            resolved.extend(CHARTS)
+        elif name == 'genres':
+            resolved.extend(n for n in CHARTS if n.startswith('genre-'))
+        elif name in CHARTS:
+            resolved.append(name)
+        else:
+            raise ValueError(f"Unknown chart {name!r} (see --list-charts)")
+    return list(dict.fromkeys(resolved))
+
+
+def partition_path(root, chart):
+    return os.path.join(root, f"chart={chart}", PARTITION_FILE)
+
+
+def save_chart_partitions(frames, root=CHARTS_ROOT):
+    """Write each chart's frame to <root>/chart=<name>/data.arrow; other partitions are kept"""
+    paths = {}
+    for chart, df in frames.items():
+        path = partition_path(root, chart)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        save_columnar(df, path)
+        paths[chart] = path
+    return paths
+
+
+def list_partitions(root=CHARTS_ROOT):
+    if not os.path.isdir(root):
+        return []
+    return sorted(name[len('chart='):] for name in os.listdir(root)
+                  if name.startswith('chart=') and os.path.exists(os.path.join(root, name, PARTITION_FILE)))
+
+
+def load_charts(charts=None, root=CHARTS_ROOT, columns=None):
+    """One frame of the requested charts (default: all stored) with a leading `chart` column"""
+    frames = []
+    for chart in charts or list_partitions(root):
+        df = load_columnar(partition_path(root, chart), columns)
+        df.insert(0, 'chart', chart)
+        frames.append(df)
+    if not frames:
+        return pd.DataFrame(columns=['chart'] + list(columns or []))
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,111 @@
+# File: imdb_columnar.py
+# Single typed Arrow IPC file for the scraped dataset; basic/custom are column projections
+import os
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+COLUMNAR_PATH = 'imdb_dataset.arrow'
+
+BASIC_COLUMNS = ['position', 'title', 'year', 'rating', 'imdb_id', 'scraped_date']
+CUSTOM_COLUMNS = ['position', 'title', 'year', 'rating', 'rating_category',
+                  'movie_age', 'decade', 'quality_score', 'imdb_id', 'scraped_date']
+
+# CSV exports written from the Arrow file: name -> columns (None: every column)
+CSV_EXPORTS = {'imdb_clean_basic.csv': BASIC_COLUMNS, 'imdb_clean_custom.csv': None}
+
+CATEGORICAL_COLUMNS = ['rating_category', 'decade']
+INTEGER_COLUMNS = ['position', 'year', 'movie_age']
+
+
+def to_typed_frame(df):
+    """Cast the dataset to its storage types (nullable ints, categoricals)"""
+    df = df.copy()
+    for col in INTEGER_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').round().astype('Int64')
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    return df
+
+
+def to_plain_frame(df):
+    """Undo to_typed_frame: numpy ints/floats and object labels, as a CSV parse gives"""
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.Int64Dtype):
+            df[col] = df[col].astype('float64' if df[col].isna().any() else 'int64')
+        elif isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype(object)
+    return df
+
+
+def save_columnar(df, path=COLUMNAR_PATH):
+    """Write the typed dataset as one uncompressed Arrow IPC file (memory-mappable).
+
+    Readers memory-map the file, and `df` itself may be backed by such a map,
+    so the new file is written beside it and swapped in atomically rather
+    than truncated in place.
+    """
+    table = pa.Table.from_pandas(to_typed_frame(df), preserve_index=False)
+    tmp_path = path + '.tmp'
+    feather.write_feather(table, tmp_path, compression='uncompressed')
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_columnar(path=COLUMNAR_PATH, columns=None, memory_map=True):
+    """Memory-map the Arrow file and return the requested columns as a DataFrame.
+
+    With memory_map=False the file is read into memory, so the frame stays
+    valid whatever later happens to the file.
+    """
+    table = feather.read_table(path, columns=columns, memory_map=memory_map)
+    return table.to_pandas()
+
+
+def iter_columnar(path=COLUMNAR_PATH, chunksize=100_000, columns=None):
+    """Memory-mapped DataFrames of `chunksize` rows each"""
+    table = feather.read_table(path, columns=columns, memory_map=True)
+    for offset in range(0, table.num_rows, chunksize):
+        yield table.slice(offset, chunksize).to_pandas()
+
+
+def load_basic(path=COLUMNAR_PATH):
+    return load_columnar(path, BASIC_COLUMNS)
+
+
+def load_custom(path=COLUMNAR_PATH, memory_map=True):
+    """The whole file: the custom columns plus any enrichment columns stored with them"""
+    return load_columnar(path, memory_map=memory_map)
+
+
+def export_csvs(path=COLUMNAR_PATH, output_dir='.'):
+    """Write the basic and custom CSVs as projections of the Arrow file; returns {path: rows}"""
+    written = {}
+    for name, columns in CSV_EXPORTS.items():
+        df = load_basic(path) if columns == BASIC_COLUMNS else load_custom(path)
+        target = os.path.normpath(os.path.join(output_dir, name))
+        df.to_csv(target, index=False)
+        # Same mtime as the Arrow file: the export is of that version (see columnar_source)
+        mtime = os.stat(path).st_mtime_ns
+        os.utime(target, ns=(mtime, mtime))
+        written[target] = len(df)
+    return written
+
+
+def columnar_source(path):
+    """The Arrow file a dataset path should be read from, else `path` itself.
+
+    imdb_clean_custom.csv is an export of the imdb_dataset.arrow beside it,
+    so it resolves to that file when it is at least as new, or when the CSV
+    was never written (scraper run with --no-csv). Other paths are unchanged.
+    """
+    if os.path.basename(path) != 'imdb_clean_custom.csv':
+        return path
+    columnar = os.path.join(os.path.dirname(path), COLUMNAR_PATH)
+    if not os.path.exists(columnar):
+        return path
+    if not os.path.exists(path) or os.path.getmtime(columnar) >= os.path.getmtime(path):
+        return columnar
+    return path
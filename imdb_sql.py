@@ -0,0 +1,173 @@
+# File: imdb_sql.py
+# Embedded SQLite copy of the scraped dataset, indexed for ad-hoc aggregation queries
+import argparse
+import os
+import sqlite3
+import pandas as pd
+from imdb_columnar import to_typed_frame
+
+DB_PATH = 'imdb.db'
+TABLE = 'movies'
+
+# Column -> SQLite type; extra enriched columns are stored when present
+SCHEMA = {
+    'imdb_id': 'TEXT',
+    'position': 'INTEGER',
+    'title': 'TEXT',
+    'year': 'INTEGER',
+    'rating': 'REAL',
+    'rating_category': 'TEXT',
+    'movie_age': 'INTEGER',
+    'decade': 'TEXT',
+    'quality_score': 'REAL',
+    'scraped_date': 'TEXT',
+    'genre': 'TEXT',
+    'director': 'TEXT',
+    'runtime_minutes': 'REAL',
+    'budget': 'REAL',
+}
+# Index name -> columns. decade and year carry rating too, so the per-decade/per-year
+# aggregations are answered from the index alone without touching the table
+INDEXES = {
+    'imdb_id': ['imdb_id'],
+    'decade': ['decade', 'rating'],
+    'year': ['year', 'rating'],
+    'rating': ['rating'],
+}
+
+# Named questions that used to need their own pandas script; :params are bound by query()
+QUERIES = {
+    'top-per-decade': """
+        SELECT decade, position, title, year, rating FROM (
+            SELECT *, ROW_NUMBER() OVER (PARTITION BY decade ORDER BY rating DESC, position) AS rank
+            FROM movies WHERE decade IS NOT NULL)
+        WHERE rank <= :n ORDER BY decade, rank""",
+    'decade-summary': """
+        SELECT decade, COUNT(*) AS movies, ROUND(AVG(rating), 2) AS avg_rating,
+               MIN(rating) AS min_rating, MAX(rating) AS max_rating
+        FROM movies WHERE decade IS NOT NULL GROUP BY decade ORDER BY decade""",
+    'category-mix': """
+        SELECT decade, rating_category, COUNT(*) AS movies,
+               ROUND(100.0 * COUNT(*) / SUM(COUNT(*)) OVER (PARTITION BY decade), 1) AS percent
+        FROM movies WHERE decade IS NOT NULL
+        GROUP BY decade, rating_category ORDER BY decade, rating_category""",
+    'age-buckets': """
+        SELECT (movie_age / :width) * :width AS age_from, (movie_age / :width + 1) * :width - 1 AS age_to,
+               COUNT(*) AS movies, ROUND(AVG(rating), 2) AS avg_rating
+        FROM movies WHERE movie_age IS NOT NULL GROUP BY age_from ORDER BY age_from""",
+    'rating-range': """
+        SELECT position, title, year, rating FROM movies
+        WHERE rating BETWEEN :low AND :high ORDER BY rating DESC, position""",
+}
+DEFAULT_PARAMS = {'n': 3, 'width': 10, 'low': 8.0, 'high': 10.0}
+
+
+def _records(df, columns):
+    """Rows as plain Python values, with NA/NaN as NULL"""
+    frame = df[columns].astype(object)
+    frame = frame.where(pd.notna(frame), None)
+    return frame.itertuples(index=False, name=None)
+
+
+def save_database(df, path=DB_PATH):
+    """Replace the movies table with `df` and (re)build its indexes in one transaction"""
+    df = to_typed_frame(df)
+    columns = [col for col in SCHEMA if col in df.columns]
+    column_defs = ', '.join(f"{col} {SCHEMA[col]}" for col in columns)
+    placeholders = ', '.join('?' for _ in columns)
+
+    conn = sqlite3.connect(path)
+    try:
+        with conn:
+            conn.execute(f"DROP TABLE IF EXISTS {TABLE}")
+            conn.execute(f"CREATE TABLE {TABLE} ({column_defs})")
+            conn.executemany(f"INSERT INTO {TABLE} ({', '.join(columns)}) VALUES ({placeholders})",
+                             _records(df, columns))
+            for name, index_columns in INDEXES.items():
+                if set(index_columns) <= set(columns):
+                    conn.execute(f"CREATE INDEX idx_{TABLE}_{name} ON {TABLE} ({', '.join(index_columns)})")
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+    return path
+
+
+def connect(path=DB_PATH):
+    """Read-only connection to the database written by save_database"""
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"{path} not found; run Task_01_imdb_scraper.py first")
+    return sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+
+
+def query(sql, params=None, path=DB_PATH):
+    """Run SQL (or the name of one of QUERIES) and return the result as a DataFrame"""
+    if sql in QUERIES:
+        sql = QUERIES[sql]
+        params = {**DEFAULT_PARAMS, **(params or {})}
+    conn = connect(path)
+    try:
+        return pd.read_sql_query(sql, conn, params=params)
+    finally:
+        conn.close()
+
+
+def explain(sql, params=None, path=DB_PATH):
+    """SQLite's query plan, to check that a query uses the indexes"""
+    if sql in QUERIES:
+        sql = QUERIES[sql]
+        params = {**DEFAULT_PARAMS, **(params or {})}
+    conn = connect(path)
+    try:
+        return [row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params or {})]
+    finally:
+        conn.close()
+
+
+def _parse_value(value):
+    for cast in (int, float):
+        try:
+            return cast(value)
+        except ValueError:
+            pass
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the embedded IMDb database")
+    parser.add_argument('sql', nargs='?',
+                        help=f"SQL text or a named query: {', '.join(QUERIES)}")
+    parser.add_argument('--db', default=DB_PATH)
+    parser.add_argument('--param', action='append', default=[], metavar='NAME=VALUE',
+                        help="bind a :NAME parameter (repeatable)")
+    parser.add_argument('--load', metavar='CSV', help="(re)build the database from a CSV first")
+    parser.add_argument('--plan', action='store_true', help="show the query plan instead of results")
+    parser.add_argument('--list', action='store_true', help="list the named queries")
+    args = parser.parse_args()
+
+    if args.load:
+        save_database(pd.read_csv(args.load), args.db)
+        print(f" Database saved: {args.db} (from {args.load})")
+    if args.list:
+        for name, sql in QUERIES.items():
+            print(f" {name}:{sql}\n")
+        return
+    if not args.sql:
+        if not args.load:
+            parser.error("give a SQL statement, a named query, --load or --list")
+        return
+
+    params = {}
+    for item in args.param:
+        name, _, value = item.partition('=')
+        params[name] = _parse_value(value)
+    if args.plan:
+        for step in explain(args.sql, params or None, args.db):
+            print(f" {step}")
+        return
+    result = query(args.sql, params or None, args.db)
+    print(result.to_string(index=False))
+    print(f"\n ({len(result)} rows)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# File: imdb_stream_parser.py
+import json
+import mmap
+import os
+import re
+from contextlib import contextmanager
+
+SCRIPT_OPEN = b'<script'
+SCRIPT_CLOSE = b'</script>'
+ATTR_PATTERN = re.compile(rb'([a-zA-Z_:-]+)\s*=\s*["\']([^"\']*)["\']')
+
+
+@contextmanager
+def open_snapshot(path):
+    """Memory-map a saved page so it can be scanned without reading it into memory"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            yield data
+
+
+def iter_script_blocks(data, script_type=None, script_id=None):
+    """Yield (attributes, body) for every <script> block in one forward pass.
+
+    `data` is bytes or an mmap. Only the opening tag of each script is
+    inspected; bodies are returned as raw byte slices.
+    """
+    type_wanted = script_type.encode() if script_type else None
+    id_wanted = script_id.encode() if script_id else None
+    pos = 0
+
+    while True:
+        start = data.find(SCRIPT_OPEN, pos)
+        if start == -1:
+            return
+        tag_end = data.find(b'>', start)
+        if tag_end == -1:
+            return
+        body_end = data.find(SCRIPT_CLOSE, tag_end)
+        if body_end == -1:
+            return
+        pos = body_end + len(SCRIPT_CLOSE)
+
+        attrs = dict(ATTR_PATTERN.findall(data[start + len(SCRIPT_OPEN):tag_end]))
+        if type_wanted and attrs.get(b'type') != type_wanted:
+            continue
+        if id_wanted and attrs.get(b'id') != id_wanted:
+            continue
+
+        yield attrs, data[tag_end + 1:body_end]
+
+
+def find_json_ld(data):
+    """Return every decoded application/ld+json block in the page"""
+    blocks = []
+    for _, body in iter_script_blocks(data, script_type='application/ld+json'):
+        try:
+            blocks.append(json.loads(body))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            continue
+    return blocks
+
+
+def find_item_list(data):
+    """Return the first JSON-LD ItemList in the page, or None"""
+    for block in find_json_ld(data):
+        if isinstance(block, dict) and block.get('@type') == 'ItemList':
+            return block
+    return None
+
+
+def find_next_data(data):
+    """Return the decoded Next.js __NEXT_DATA__ payload, or None"""
+    for _, body in iter_script_blocks(data, script_id='__NEXT_DATA__'):
+        try:
+            return json.loads(body)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return None
+    return None
+
+
+def find_chart_edges(next_data):
+    """Return the chartTitles edges from a __NEXT_DATA__ payload"""
+    try:
+        return next_data['props']['pageProps']['pageData']['chartTitles']['edges']
+    except (KeyError, TypeError):
+        return []
+
+
+def find_key(obj, key):
+    """Depth-first search of decoded JSON for the first value stored under `key`"""
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            if key in current:
+                return current[key]
+            stack.extend(reversed(list(current.values())))
+        elif isinstance(current, list):
+            stack.extend(reversed(current))
+    return None
+
+
+def iter_snapshot_files(path):
+    """Yield .html snapshot paths from a file or a directory of saved pages"""
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            if name.endswith(('.html', '.htm')):
+                yield os.path.join(path, name)
+    else:
+        yield path
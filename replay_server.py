@@ -0,0 +1,228 @@
+# File: replay_server.py
+# Local stand-in for imdb.com: replays recorded pages and synthetic title pages with injectable faults
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_CHART_PAGE = 'imdb_page.html'
+FIXTURE_DIR = 'fixtures'
+GENRES = ['Drama', 'Crime', 'Action', 'Adventure', 'Comedy', 'Biography', 'History', 'War']
+DIRECTORS = ['Frank Darabont', 'Francis Ford Coppola', 'Christopher Nolan', 'Sidney Lumet',
+             'Steven Spielberg', 'Peter Jackson', 'Quentin Tarantino', 'Sergio Leone']
+
+
+def fixture_name(path):
+    """'/chart/top/?genres=drama' -> 'chart_top_genres=drama.html'"""
+    name = re.sub(r'[^A-Za-z0-9=.-]+', '_', path).strip('_')
+    return f"{name or 'index'}.html"
+
+
+def synthetic_title_page(imdb_id, padding=0):
+    """A /title/ page with the JSON-LD and __NEXT_DATA__ blocks parse_title_page and parse_title_year read.
+
+    Contents are derived from the id, so every run serves the same page;
+    `padding` bytes of markup stand in for the rest of a real page.
+    """
+    seed = int(hashlib.sha256(imdb_id.encode()).hexdigest()[:8], 16)
+    rng = random.Random(seed)
+    minutes = rng.randint(80, 200)
+    ld = {
+        '@context': 'https://schema.org', '@type': 'Movie', 'url': f'/title/{imdb_id}/',
+        'name': f'Title {imdb_id}',
+        'genre': rng.sample(GENRES, rng.randint(1, 3)),
+        'director': [{'@type': 'Person', 'name': rng.choice(DIRECTORS)}],
+        'duration': f'PT{minutes // 60}H{minutes % 60}M',
+    }
+    next_data = {'props': {'pageProps': {'mainColumnData': {
+        'productionBudget': {'budget': {'amount': rng.randint(1, 200) * 1_000_000, 'currency': 'USD'}}}}}}
+    ld['datePublished'] = f"{rng.randint(1921, 2023)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+    filler = '<div class="ipc-filler">' + 'x' * max(padding, 0) + '</div>'
+    return (f'<!DOCTYPE html><html><head><title>{ld["name"]}</title>'
+            f'<script type="application/ld+json">{json.dumps(ld)}</script></head><body>{filler}'
+            f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(next_data)}</script>'
+            f'</body></html>').encode()
+
+
+class Faults:
+    """What the server does wrong, and how often; every draw comes from one seeded RNG"""
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, throttle_rate=0.0, retry_after=0, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def draw(self):
+        """(delay seconds, status override or None) for one request"""
+        with self._lock:
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+            roll = self._rng.random()
+        if roll < self.throttle_rate:
+            return delay, 429
+        if roll < self.throttle_rate + self.error_rate:
+            return delay, 503
+        return delay, None
+
+
+class ReplayServer:
+    """Threaded HTTP server on localhost; use as a context manager or start()/stop().
+
+    Routes, in order: a recorded fixture for the exact path, the saved
+    chart page for any /chart/ path, a synthetic page for /title/ttNNN/,
+    else 404. Pages carry an ETag of their body and a matching
+    If-None-Match gets an empty 304. `stats` counts requests by outcome.
+    """
+
+    def __init__(self, port=0, chart_page=DEFAULT_CHART_PAGE, fixture_dir=FIXTURE_DIR, faults=None,
+                 title_padding=100_000):
+        self.faults = faults or Faults()
+        self.fixture_dir = fixture_dir
+        self.title_padding = title_padding
+        with open(chart_page, 'rb') as f:
+            self.chart_page = f.read()
+        self.stats = {'requests': 0, 'ok': 0, 'throttled': 0, 'errors': 0, 'not_found': 0,
+                      'not_modified': 0}
+        self._stats_lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, outcome):
+        with self._stats_lock:
+            self.stats['requests'] += 1
+            self.stats[outcome] += 1
+
+    def body_for(self, path):
+        if self.fixture_dir:
+            fixture = os.path.join(self.fixture_dir, fixture_name(path))
+            if os.path.exists(fixture):
+                with open(fixture, 'rb') as f:
+                    return f.read()
+        if path.startswith('/chart/'):
+            return self.chart_page
+        match = re.match(r'/title/(tt\d+)/?', path)
+        if match:
+            return synthetic_title_page(match.group(1), self.title_padding)
+        return None
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                delay, status = server.faults.draw()
+                if delay:
+                    time.sleep(delay)
+                body = None if status else server.body_for(self.path)
+                if status is None and body is None:
+                    status = 404
+                if status:
+                    server.count({429: 'throttled', 404: 'not_found'}.get(status, 'errors'))
+                    self.send_response(status)
+                    if status == 429:
+                        self.send_header('Retry-After', str(server.faults.retry_after))
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+                if self.headers.get('If-None-Match') == etag:
+                    server.count('not_modified')
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                server.count('ok')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('ETag', etag)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def record_fixtures(urls, fixture_dir=FIXTURE_DIR, session=None):
+    """Save live pages under fixture_dir so the server replays them for the same paths"""
+    import requests
+    from urllib.parse import urlsplit
+    http = session or requests
+    os.makedirs(fixture_dir, exist_ok=True)
+    for url in urls:
+        parts = urlsplit(url)
+        path = parts.path + (f"?{parts.query}" if parts.query else '')
+        response = http.get(url, timeout=10)
+        response.raise_for_status()
+        target = os.path.join(fixture_dir, fixture_name(path))
+        with open(target, 'wb') as f:
+            f.write(response.content)
+        print(f" Recorded {url} -> {target} ({len(response.content):,} bytes)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve recorded and synthetic IMDb pages locally")
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--chart-page', default=DEFAULT_CHART_PAGE)
+    parser.add_argument('--fixtures', default=FIXTURE_DIR, help="directory of recorded pages")
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument('--jitter', type=float, default=0.0, help="extra uniform random delay, seconds")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fraction of 503 responses")
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help="fraction of 429 responses")
+    parser.add_argument('--retry-after', type=int, default=0, help="Retry-After seconds sent with 429s")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--record', nargs='+', metavar='URL', help="record live pages as fixtures and exit")
+    args = parser.parse_args()
+
+    if args.record:
+        record_fixtures(args.record, args.fixtures)
+        return
+    faults = Faults(args.latency, args.jitter, args.error_rate, args.throttle_rate, args.retry_after, args.seed)
+    server = ReplayServer(args.port, args.chart_page, args.fixtures, faults)
+    print(f" Replaying IMDb at {server.base_url} (Ctrl+C to stop)")
+    print(f" Scrape it with: python Task_01_imdb_scraper.py --base-url {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f" Served: {server.stats}")
+
+
+if __name__ == "__main__":
+    main()
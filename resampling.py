@@ -0,0 +1,224 @@
+# File: resampling.py
+# Vectorized permutation tests and bootstrap confidence intervals
+import numpy as np
+
+DEFAULT_RESAMPLES = 100_000
+DEFAULT_SEED = 42
+# Rows of the resample matrix drawn at once; bounds memory to block * n values
+BLOCK_ELEMENTS = 5_000_000
+# Fewest (x, y) pairs a correlation is reported for
+MIN_PAIRS = 3
+
+
+class ResampleResult:
+    """Observed statistic, its resampling p-value or confidence interval, and the draws"""
+
+    def __init__(self, statistic, p_value=None, ci=None, n_resamples=0, distribution=None):
+        self.statistic = statistic
+        self.p_value = p_value
+        self.ci = ci
+        self.n_resamples = n_resamples
+        self.distribution = distribution
+
+
+def unavailable():
+    """Result for a test that has too little data to run (every value NaN)"""
+    return ResampleResult(np.nan, p_value=np.nan, ci=(np.nan, np.nan), distribution=np.empty(0))
+
+
+def _finite(values):
+    values = np.asarray(values, dtype=float)
+    return values[np.isfinite(values)]
+
+
+def _finite_pairs(x, y, counts=None):
+    """Drop pairs (and their cell counts) where x or y is missing, as DataFrame.corr does"""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    keep = np.isfinite(x) & np.isfinite(y)
+    if counts is not None:
+        counts = np.asarray(counts, dtype=float)
+        keep &= np.isfinite(counts) & (counts > 0)
+        counts = counts[keep]
+    return x[keep], y[keep], counts
+
+
+def _blocks(n_resamples, width):
+    """Sizes of the resample blocks, each at most BLOCK_ELEMENTS values wide"""
+    step = max(1, BLOCK_ELEMENTS // max(width, 1))
+    for start in range(0, n_resamples, step):
+        yield min(step, n_resamples - start)
+
+
+def _permutation_matrix(rng, rows, n):
+    """`rows` independent permutations of range(n), one per row.
+
+    Argsorting a matrix of random float32 keys is about twice as fast as
+    Generator.permuted on wide matrices; equal keys (roughly n**2 / 2**25
+    pairs per row) only keep their original order.
+    """
+    return np.argsort(rng.random((rows, n), dtype=np.float32), axis=1)
+
+
+def _p_value(distribution, observed, alternative):
+    # (k + 1) / (R + 1) keeps the p-value away from an impossible 0
+    if alternative == 'greater':
+        hits = np.count_nonzero(distribution >= observed)
+    elif alternative == 'less':
+        hits = np.count_nonzero(distribution <= observed)
+    else:
+        hits = np.count_nonzero(np.abs(distribution) >= abs(observed))
+    return (hits + 1) / (len(distribution) + 1)
+
+
+def _interval(distribution, confidence):
+    if len(distribution) == 0:
+        return np.nan, np.nan
+    tail = (1 - confidence) / 2
+    low, high = np.quantile(distribution, [tail, 1 - tail])
+    return float(low), float(high)
+
+
+def permutation_test_means(a, b, n_resamples=DEFAULT_RESAMPLES, alternative='greater', seed=DEFAULT_SEED):
+    """Permutation test of mean(a) - mean(b): relabel the pooled values R times at once"""
+    a, b = _finite(a), _finite(b)
+    if not len(a) or not len(b):
+        return unavailable()
+    pooled = np.concatenate([a, b])
+    n_a, total = len(a), pooled.sum()
+    observed = a.mean() - b.mean()
+
+    rng = np.random.default_rng(seed)
+    distribution = np.empty(n_resamples)
+    done = 0
+    for rows in _blocks(n_resamples, len(pooled)):
+        idx = _permutation_matrix(rng, rows, len(pooled))
+        # The first n_a columns are group a; b's sum is whatever is left
+        sum_a = pooled[idx[:, :n_a]].sum(axis=1)
+        distribution[done:done + rows] = sum_a / n_a - (total - sum_a) / len(b)
+        done += rows
+    return ResampleResult(observed, _p_value(distribution, observed, alternative),
+                          n_resamples=n_resamples, distribution=distribution)
+
+
+def bootstrap_mean_diff(a, b, n_resamples=DEFAULT_RESAMPLES, confidence=0.95, seed=DEFAULT_SEED):
+    """Percentile bootstrap CI for mean(a) - mean(b), resampling each group independently"""
+    a, b = _finite(a), _finite(b)
+    if not len(a) or not len(b):
+        return unavailable()
+    rng = np.random.default_rng(seed)
+    distribution = np.empty(n_resamples)
+    done = 0
+    for rows in _blocks(n_resamples, len(a) + len(b)):
+        mean_a = a[rng.integers(0, len(a), (rows, len(a)))].mean(axis=1)
+        mean_b = b[rng.integers(0, len(b), (rows, len(b)))].mean(axis=1)
+        distribution[done:done + rows] = mean_a - mean_b
+        done += rows
+    return ResampleResult(a.mean() - b.mean(), ci=_interval(distribution, confidence),
+                          n_resamples=n_resamples, distribution=distribution)
+
+
+def _standardize(values):
+    values = np.asarray(values, dtype=float)
+    centred = values - values.mean()
+    return centred / np.sqrt(centred @ centred)
+
+
+def permutation_test_corr(x, y, n_resamples=DEFAULT_RESAMPLES, alternative='two-sided', seed=DEFAULT_SEED):
+    """Permutation test of Pearson r: shuffle y against x R times.
+
+    x and y are standardized once, so each permuted r is a single dot
+    product of a row of the index matrix's gathered y with x.
+    """
+    x, y, _ = _finite_pairs(x, y)
+    if len(x) < MIN_PAIRS:
+        return unavailable()
+    zx, zy = _standardize(x), _standardize(y)
+    observed = zx @ zy
+    rng = np.random.default_rng(seed)
+    distribution = np.empty(n_resamples)
+    done = 0
+    for rows in _blocks(n_resamples, len(zx)):
+        idx = _permutation_matrix(rng, rows, len(zx))
+        distribution[done:done + rows] = zy[idx] @ zx
+        done += rows
+    return ResampleResult(observed, _p_value(distribution, observed, alternative),
+                          n_resamples=n_resamples, distribution=distribution)
+
+
+def expand_cells(x, y, counts, max_rows_per_cell=4):
+    """Turn aggregated (x, y, count) cells back into rows when there are only a few per cell"""
+    if counts is not None and np.sum(counts) <= max_rows_per_cell * len(x):
+        counts = np.asarray(counts, dtype=int)
+        return np.repeat(np.asarray(x, dtype=float), counts), np.repeat(np.asarray(y, dtype=float), counts), None
+    return x, y, counts
+
+
+def _weighted_corr(W, x, y):
+    """Pearson r of (x, y) under each row of weights W, via one matrix product"""
+    x = x - x.mean()
+    y = y - y.mean()
+    sums = W @ np.column_stack([np.ones_like(x), x, y, x * x, y * y, x * y])
+    n, sx, sy, sxx, syy, sxy = sums.T
+    cov = sxy - sx * sy / n
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return cov / np.sqrt((sxx - sx * sx / n) * (syy - sy * sy / n))
+
+
+def bootstrap_corr(x, y, counts=None, n_resamples=DEFAULT_RESAMPLES, confidence=0.95, seed=DEFAULT_SEED):
+    """Percentile bootstrap CI for Pearson r over (x, y) pairs.
+
+    Each resample's index row is turned into per-pair counts, and r comes
+    from one matrix product of the count matrix with (1, x, y, x², y², xy).
+    With `counts`, each (x, y) is an aggregated cell standing for that many
+    rows (e.g. a cube table); a row bootstrap then amounts to multinomial
+    cell counts, so the cost depends on the number of cells, not rows.
+    Pairs with a missing x or y are dropped first.
+    """
+    x, y, counts = _finite_pairs(x, y, counts)
+    x, y, counts = expand_cells(x, y, counts)
+    k = len(x)
+    if (k if counts is None else counts.sum()) < MIN_PAIRS:
+        return unavailable()
+    rng = np.random.default_rng(seed)
+    distribution = np.empty(n_resamples)
+    done = 0
+    if counts is None:
+        observed = _weighted_corr(np.ones((1, k)), x, y)[0]
+        for rows in _blocks(n_resamples, k):
+            idx = rng.integers(0, k, (rows, k), dtype=np.int32)
+            offsets = (np.arange(rows, dtype=np.int64) * k)[:, None]
+            W = np.bincount((idx + offsets).ravel(), minlength=rows * k).reshape(rows, k)
+            distribution[done:done + rows] = _weighted_corr(W.astype(float), x, y)
+            done += rows
+    else:
+        counts = np.asarray(counts, dtype=float)
+        observed = _weighted_corr(counts[None, :], x, y)[0]
+        p = counts / counts.sum()
+        for rows in _blocks(n_resamples, k):
+            W = rng.multinomial(int(counts.sum()), p, size=rows)
+            distribution[done:done + rows] = _weighted_corr(W.astype(float), x, y)
+            done += rows
+    distribution = distribution[~np.isnan(distribution)]
+    return ResampleResult(observed, ci=_interval(distribution, confidence),
+                          n_resamples=n_resamples, distribution=distribution)
+
+
+def hypothesis_tests(top, bottom, x, y, counts=None, n_resamples=DEFAULT_RESAMPLES, seed=DEFAULT_SEED):
+    """The EDA's two hypotheses by resampling: top vs bottom ratings, and r(x, y).
+
+    The correlation permutation test needs row-level x and y, so it is
+    skipped when only large aggregated cells (`counts`) are available.
+    Missing values are dropped; a test left without enough data reports NaN.
+    """
+    x, y, counts = _finite_pairs(x, y, counts)
+    x, y, counts = expand_cells(x, y, counts)
+    results = {
+        'mean_diff_perm': permutation_test_means(top, bottom, n_resamples, seed=seed),
+        'mean_diff_boot': bootstrap_mean_diff(top, bottom, n_resamples, seed=seed),
+        'corr_boot': bootstrap_corr(x, y, counts, n_resamples, seed=seed),
+        'corr_perm': None,
+    }
+    if counts is None:
+        results['corr_perm'] = permutation_test_corr(x, y, n_resamples, seed=seed)
+    return results
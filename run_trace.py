@@ -0,0 +1,270 @@
+# File: run_trace.py
+# Lightweight per-stage instrumentation: nested spans with wall/CPU time and memory, a JSON trace per run
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+TRACE_DIR = 'traces'
+PROFILE_LINES = 25
+
+
+def _rss_mb():
+    """Current resident set size (Linux /proc; falls back to the peak elsewhere)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except (OSError, ValueError, IndexError):
+        return _max_rss_mb()
+
+
+def _max_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 1024
+
+
+class Tracer:
+    """Collects finished spans for one run.
+
+    Spans nest per thread; a worker thread's outermost spans hang off
+    whatever span the main thread has open. Wall and CPU time are always recorded, plus RSS
+    at exit and the process's peak RSS so far. With `memory`, tracemalloc
+    also runs and each main-thread span reports the peak Python allocation
+    above its starting point (children's peaks fold into their parents).
+    With `profile`, every top-level span runs under its own cProfile and
+    the slowest one's profile is printed when the run finishes.
+    """
+
+    def __init__(self, script=None, memory=False, profile=False):
+        self.script = script or os.path.basename(sys.argv[0]) or 'python'
+        self.memory = memory
+        self.profile = profile
+        self.records = []
+        self.profiles = {}
+        self._next_id = 0
+        self.started_at = datetime.now()
+        self._t0 = time.perf_counter()
+        self._epoch0 = time.time()
+        self._local = threading.local()
+        self._main_stack = []
+        self._lock = threading.Lock()
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def _new_id(self):
+        with self._lock:
+            self._next_id += 1
+            return self._next_id - 1
+
+    def _stack(self):
+        if not hasattr(self._local, 'stack'):
+            main_thread = threading.current_thread() is threading.main_thread()
+            self._local.stack = self._main_stack if main_thread else []
+        return self._local.stack
+
+    def _parent(self, stack):
+        """Innermost open span; a worker thread's outermost spans nest under the main thread's"""
+        if stack:
+            return stack[-1]
+        if stack is not self._main_stack and self._main_stack:
+            return self._main_stack[-1]
+        return None
+
+    @contextmanager
+    def span(self, name, **attrs):
+        stack = self._stack()
+        parent = self._parent(stack)
+        depth = parent['depth'] + 1 if parent else 0
+        main_thread = threading.current_thread() is threading.main_thread()
+        track_memory = self.memory and main_thread
+        frame = {'name': name, 'id': self._new_id(), 'depth': depth, 'alloc_peak': 0}
+        if track_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if parent is not None:
+                parent['alloc_peak'] = max(parent['alloc_peak'], peak)
+            tracemalloc.reset_peak()
+            frame['alloc_start'] = frame['alloc_peak'] = current
+        profiler = None
+        if self.profile and not stack and main_thread:
+            profiler = cProfile.Profile()
+        stack.append(frame)
+
+        start_epoch = time.time()
+        start = time.perf_counter()
+        cpu_start = time.process_time()
+        if profiler:
+            profiler.enable()
+        try:
+            yield frame
+        finally:
+            if profiler:
+                profiler.disable()
+            wall = time.perf_counter() - start
+            cpu = time.process_time() - cpu_start
+            stack.pop()
+            record = {
+                'id': frame['id'],
+                'name': name,
+                'parent': parent['id'] if parent else None,
+                'depth': depth,
+                'thread': threading.current_thread().name,
+                'start_epoch': round(start_epoch, 6),
+                'wall_s': round(wall, 6),
+                'cpu_s': round(cpu, 6),
+                'rss_mb': round(_rss_mb(), 1),
+                'max_rss_mb': round(_max_rss_mb(), 1),
+            }
+            if track_memory:
+                frame['alloc_peak'] = max(frame['alloc_peak'], tracemalloc.get_traced_memory()[1])
+                record['alloc_peak_mb'] = round((frame['alloc_peak'] - frame['alloc_start']) / 2 ** 20, 2)
+                if parent is not None:
+                    parent['alloc_peak'] = max(parent['alloc_peak'], frame['alloc_peak'])
+                tracemalloc.reset_peak()
+            if attrs:
+                record['attrs'] = attrs
+            with self._lock:
+                self.records.append(record)
+                if profiler:
+                    self.profiles[record['id']] = profiler
+
+    def add_records(self, records, **attrs):
+        """Attach spans measured elsewhere (e.g. in a worker process) under the current span"""
+        parent = self._parent(self._stack())
+        depth = parent['depth'] + 1 if parent else 0
+        parent = parent['id'] if parent else None
+        ids = {record['id']: self._new_id() for record in records}
+        with self._lock:
+            for record in records:
+                record = dict(record, **attrs)
+                record['id'] = ids[record['id']]
+                record['parent'] = parent if record['parent'] is None else ids[record['parent']]
+                record['depth'] += depth
+                self.records.append(record)
+
+    def trace(self):
+        return {
+            'script': self.script,
+            'argv': sys.argv[1:],
+            'started_at': self.started_at.strftime('%Y-%m-%d %H:%M:%S'),
+            'wall_s': round(time.perf_counter() - self._t0, 6),
+            'max_rss_mb': round(_max_rss_mb(), 1),
+            'tracemalloc': self.memory,
+            # Offsets from the epoch clock, so spans from worker processes line up too
+            'spans': [dict(r, start_s=round(r['start_epoch'] - self._epoch0, 6))
+                      for r in sorted(self.records, key=lambda r: (r['start_epoch'], r['depth']))],
+        }
+
+    def tree(self):
+        """Spans depth-first, each followed by its children in start order (parallel work stays grouped)"""
+        children = {}
+        for record in self.trace()['spans']:
+            children.setdefault(record['parent'], []).append(record)
+        ordered, pending = [], list(reversed(children.get(None, [])))
+        while pending:
+            record = pending.pop()
+            ordered.append(record)
+            pending.extend(reversed(children.get(record['id'], [])))
+        return ordered
+
+    def write(self, path=None):
+        """Write the JSON trace; defaults to traces/<script>-<timestamp>.json"""
+        if path is None:
+            stem = os.path.splitext(self.script)[0]
+            path = os.path.join(TRACE_DIR, f"{stem}-{self.started_at.strftime('%Y%m%d-%H%M%S')}.json")
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.trace(), f, indent=1)
+        return path
+
+    def print_summary(self):
+        print("\n" + "="*70)
+        print(" STAGE TIMINGS")
+        print("="*70)
+        memory_header = f" {'alloc MB':>9}" if self.memory else ''
+        print(f"   {'stage':40} {'wall s':>8} {'cpu s':>8} {'RSS MB':>8}{memory_header}")
+        for record in self.tree():
+            if record['depth'] > 2:
+                continue
+            label = ('  ' * record['depth'] + record['name'])[:40]
+            memory = ''
+            if self.memory:
+                # Worker threads and processes run without tracemalloc
+                memory = f" {record['alloc_peak_mb']:9.1f}" if 'alloc_peak_mb' in record else f" {'-':>9}"
+            print(f"   {label:40} {record['wall_s']:8.3f} {record['cpu_s']:8.3f} {record['rss_mb']:8.1f}{memory}")
+        print(f"   Total {time.perf_counter() - self._t0:.2f}s, peak RSS {_max_rss_mb():.0f} MB")
+
+    def print_profile(self, path=None):
+        """Print (and optionally dump) the cProfile of the slowest top-level span"""
+        if not self.profiles:
+            return None
+        by_id = {record['id']: record for record in self.records}
+        hottest = max(self.profiles, key=lambda span_id: by_id[span_id]['wall_s'])
+        stream = io.StringIO()
+        stats = pstats.Stats(self.profiles[hottest], stream=stream)
+        stats.sort_stats('cumulative').print_stats(PROFILE_LINES)
+        print(f"\n cProfile of the slowest stage: {by_id[hottest]['name']} ({by_id[hottest]['wall_s']:.2f}s)")
+        print(stream.getvalue())
+        if path:
+            stats.dump_stats(path)
+            print(f" Profile saved: {path} (open with python -m pstats or snakeviz)")
+        return by_id[hottest]['name']
+
+
+TRACER = Tracer()
+
+
+def span(name, **attrs):
+    return TRACER.span(name, **attrs)
+
+
+def traced(name=None):
+    """Decorator using whatever tracer is active when the function runs"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with TRACER.span(name or func.__name__):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def add_arguments(parser):
+    """--trace / --no-trace / --trace-memory / --profile for a script's argparse parser"""
+    group = parser.add_argument_group('instrumentation')
+    group.add_argument('--trace', metavar='PATH', default=None,
+                       help=f"where to write the JSON trace (default: {TRACE_DIR}/<script>-<time>.json)")
+    group.add_argument('--no-trace', action='store_true', help="do not write a trace file")
+    group.add_argument('--trace-memory', action='store_true',
+                       help="track peak Python allocations per stage with tracemalloc (slower)")
+    group.add_argument('--profile', action='store_true',
+                       help="cProfile each top-level stage and print the slowest one")
+    return parser
+
+
+def configure(args=None, script=None):
+    """Start a fresh tracer for this run from parsed --trace-memory/--profile flags"""
+    global TRACER
+    TRACER = Tracer(script, memory=getattr(args, 'trace_memory', False),
+                    profile=getattr(args, 'profile', False))
+    return TRACER
+
+
+def finish(args=None):
+    """Print the stage table, write the trace and, with --profile, the hottest stage's profile"""
+    TRACER.print_summary()
+    if getattr(args, 'no_trace', False):
+        return None
+    path = TRACER.write(getattr(args, 'trace', None))
+    print(f" Trace saved: {path}")
+    if TRACER.profile:
+        TRACER.print_profile(os.path.splitext(path)[0] + '.prof')
+    return path
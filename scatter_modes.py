@@ -0,0 +1,90 @@
+# File: scatter_modes.py
+# Scatter plots that switch to a density (hexbin) or downsampled view for large point counts
+import os
+import numpy as np
+
+# Above this many points a scatter is drawn as a density or a sample; override with
+# the IMDB_SCATTER_THRESHOLD / IMDB_SCATTER_MODE environment variables
+SCATTER_THRESHOLD = 20_000
+SCATTER_MODES = ['hexbin', 'sample']
+DEFAULT_MODE = 'hexbin'
+SAMPLE_STRATA = 100
+
+
+def scatter_threshold():
+    return int(os.environ.get('IMDB_SCATTER_THRESHOLD', SCATTER_THRESHOLD))
+
+
+def scatter_mode():
+    mode = os.environ.get('IMDB_SCATTER_MODE', DEFAULT_MODE)
+    if mode not in SCATTER_MODES:
+        raise ValueError(f"Unknown scatter mode {mode!r} (expected one of {', '.join(SCATTER_MODES)})")
+    return mode
+
+
+def configure(threshold=None, mode=None):
+    """Set the large-N threshold and mode for this process and the chart workers it starts"""
+    if threshold is not None:
+        os.environ['IMDB_SCATTER_THRESHOLD'] = str(threshold)
+    if mode is not None:
+        os.environ['IMDB_SCATTER_MODE'] = mode
+        scatter_mode()
+
+
+def stratified_sample(x, y, size, weights=None, strata=SAMPLE_STRATA, seed=0):
+    """Indices of about `size` points: proportional per x-stratum, plus each stratum's extremes.
+
+    The min/max of x and y inside every stratum are always kept, so outliers
+    and the envelope of the cloud survive the downsample. `weights` (e.g.
+    the count behind each aggregated point) make heavier points likelier.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    rng = np.random.default_rng(seed)
+    edges = np.unique(np.quantile(x, np.linspace(0, 1, strata + 1)))
+    stratum = np.clip(np.searchsorted(edges, x, side='right') - 1, 0, max(len(edges) - 2, 0))
+
+    order = np.argsort(stratum, kind='stable')
+    starts = np.flatnonzero(np.r_[True, np.diff(stratum[order]) != 0])
+    groups = np.split(order, starts[1:])
+    fraction = size / len(x)
+
+    keep = []
+    for members in groups:
+        keep.extend(members[[x[members].argmin(), x[members].argmax(),
+                             y[members].argmin(), y[members].argmax()]])
+        take = min(len(members), int(round(len(members) * fraction)))
+        if take:
+            p = None
+            if weights is not None:
+                w = np.asarray(weights, dtype=float)[members]
+                p = w / w.sum()
+            keep.extend(rng.choice(members, take, replace=False, p=p))
+    return np.unique(keep)
+
+
+def scatter(ax, x, y, c=None, s=None, weights=None, cmap=None, threshold=None, mode=None, **kwargs):
+    """ax.scatter for small inputs; a hexbin density or stratified sample above the threshold.
+
+    Returns (artist, dense): `dense` is True when the artist's colours are
+    point counts rather than `c`, so callers can relabel the colorbar.
+    Trend lines should be fitted on the full data before calling this.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    threshold = scatter_threshold() if threshold is None else threshold
+    if len(x) <= threshold:
+        return ax.scatter(x, y, c=c, s=s, cmap=cmap, **kwargs), False
+
+    mode = mode or scatter_mode()
+    if mode == 'hexbin':
+        counts = np.ones(len(x)) if weights is None else np.asarray(weights, dtype=float)
+        artist = ax.hexbin(x, y, C=counts, reduce_C_function=np.sum, gridsize=80,
+                           bins='log', mincnt=1, cmap=cmap or 'viridis')
+        return artist, True
+
+    pick = stratified_sample(x, y, threshold, weights)
+    c = c if c is None or np.isscalar(c) else np.asarray(c)[pick]
+    s = s if s is None or np.isscalar(s) else np.asarray(s)[pick]
+    kwargs.pop('edgecolors', None)
+    return ax.scatter(x[pick], y[pick], c=c, s=s, cmap=cmap, linewidths=0, rasterized=True, **kwargs), False
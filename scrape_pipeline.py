@@ -0,0 +1,174 @@
+# File: scrape_pipeline.py
+# asyncio pipeline that overlaps chart fetching, parsing, cleaning and saving through bounded queues
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from imdb_charts import save_chart_partitions, CHARTS_ROOT
+from title_fetcher import size_pool
+
+# Marks the end of a stage's input; one is queued per downstream worker
+DONE = object()
+QUEUE_SIZE = 4
+
+_parser = None
+
+
+def _worker_parser():
+    """One scraper per process, built on first use (parse methods need no network state)"""
+    global _parser
+    if _parser is None:
+        from Task_01_imdb_scraper import IMDBScaper
+        _parser = IMDBScaper()
+    return _parser
+
+
+def parse_item(item):
+    """(chart, page bytes) -> (chart, rows); module level so a process pool can run it"""
+    chart, content = item
+    parser = _worker_parser()
+    if content is None:
+        return chart, []
+    return chart, parser.parse_chart_page(content) or parser.parse_html_content(content)
+
+
+class Stage:
+    """One pipeline step: `workers` coroutines applying `func`, optionally on an executor"""
+
+    def __init__(self, name, func, workers=1, executor=None):
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.executor = executor
+        self.items = 0
+        self.busy = 0.0
+        self.max_depth = 0
+
+    async def call(self, item):
+        start = time.perf_counter()
+        if self.executor is None:
+            result = self.func(item)
+        else:
+            result = await asyncio.get_running_loop().run_in_executor(self.executor, self.func, item)
+        self.busy += time.perf_counter() - start
+        self.items += 1
+        return result
+
+
+class Pipeline:
+    """Stages connected by bounded asyncio queues.
+
+    A full queue blocks the stage feeding it, so a slow stage holds back
+    the ones before it instead of letting work pile up in memory, and
+    every stage runs while the others wait on I/O or an executor. With
+    enough workers per stage, total time approaches that of the slowest
+    stage rather than the sum of all of them.
+    """
+
+    def __init__(self, queue_size=QUEUE_SIZE):
+        self.queue_size = queue_size
+        self.stages = []
+
+    def add(self, name, func, workers=1, executor=None):
+        self.stages.append(Stage(name, func, workers, executor))
+        return self
+
+    async def _work(self, stage, inbox, outbox):
+        while True:
+            stage.max_depth = max(stage.max_depth, inbox.qsize())
+            item = await inbox.get()
+            if item is DONE:
+                return
+            result = await stage.call(item)
+            if result is not None:
+                await outbox.put(result)
+
+    async def _feed(self, items, inboxes, workers):
+        for item in items:
+            await inboxes[0].put(item)
+        # Close each stage once everything upstream of it has finished
+        for stage, inbox, tasks in zip(self.stages, inboxes, workers):
+            for _ in range(stage.workers):
+                await inbox.put(DONE)
+            await asyncio.gather(*tasks)
+
+    async def run(self, items):
+        """Push `items` through every stage; returns the last stage's results in completion order.
+
+        If any worker raises, nothing drains its inbox any more and the
+        stages before it would block on a full queue, so every other task
+        is cancelled and the first exception is raised.
+        """
+        inboxes = [asyncio.Queue(self.queue_size) for _ in self.stages]
+        results = asyncio.Queue()
+        workers = [[asyncio.ensure_future(self._work(stage, inbox, outbox)) for _ in range(stage.workers)]
+                   for stage, inbox, outbox in zip(self.stages, inboxes, inboxes[1:] + [results])]
+        tasks = [task for stage_tasks in workers for task in stage_tasks]
+        tasks.append(asyncio.ensure_future(self._feed(items, inboxes, workers)))
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in tasks:
+                if task in done and not task.cancelled() and task.exception() is not None:
+                    raise task.exception()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return [results.get_nowait() for _ in range(results.qsize())]
+
+    def report(self, elapsed):
+        print(f" Pipeline finished in {elapsed:.2f}s")
+        for stage in self.stages:
+            print(f"   {stage.name:8} {stage.items:4} items  {stage.busy:6.2f}s busy  "
+                  f"x{stage.workers} workers  max backlog {stage.max_depth}/{self.queue_size}")
+
+
+def chart_pipeline(scraper, fetch_workers=8, parse_executor=None, parse_workers=1, root=CHARTS_ROOT,
+                   queue_size=QUEUE_SIZE):
+    """fetch (threads) -> parse (`parse_executor`, e.g. a process pool) -> clean -> save per chart"""
+    io_pool = ThreadPoolExecutor(max_workers=fetch_workers + 2)
+    size_pool(scraper.session, fetch_workers)
+
+    def fetch(chart):
+        try:
+            response = scraper.fetch_chart(chart, quiet=True)
+        except Exception as e:
+            print(f" {chart}: request failed ({e})")
+            return chart, None
+        if response.status_code != 200:
+            print(f" {chart}: HTTP Error {response.status_code}")
+            return chart, None
+        return chart, response.content
+
+    def clean(item):
+        chart, rows = item
+        if not rows:
+            print(f" No titles parsed for: {chart} (existing partition kept)")
+            return None
+        return chart, scraper.clean_chart(rows), rows
+
+    def save(item):
+        chart, df, rows = item
+        save_chart_partitions({chart: df}, root)
+        return chart, rows
+
+    pipeline = Pipeline(queue_size)
+    pipeline.add('fetch', fetch, workers=fetch_workers, executor=io_pool)
+    pipeline.add('parse', parse_item, workers=parse_workers, executor=parse_executor or io_pool)
+    pipeline.add('clean', clean, executor=io_pool)
+    pipeline.add('save', save, executor=io_pool)
+    return pipeline, io_pool
+
+
+def run_chart_pipeline(scraper, charts, fetch_workers=8, parse_workers=2, root=CHARTS_ROOT,
+                       queue_size=QUEUE_SIZE):
+    """Scrape `charts` through the async pipeline; returns {chart: rows} in the requested order"""
+    print(f" Pipelining {len(charts)} charts ({fetch_workers} fetchers, {parse_workers} parse processes, "
+          f"queues of {queue_size})...")
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=parse_workers) as parse_pool:
+        pipeline, io_pool = chart_pipeline(scraper, fetch_workers, parse_pool, parse_workers, root, queue_size)
+        with io_pool:
+            done = dict(asyncio.run(pipeline.run(charts)))
+    pipeline.report(time.perf_counter() - start)
+    print(f" Chart dataset saved: {root}/ ({len(done)} charts, {sum(len(r) for r in done.values())} rows)")
+    return {chart: done.get(chart, []) for chart in charts}
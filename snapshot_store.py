@@ -0,0 +1,228 @@
+# File: snapshot_store.py
+# Append-only, date-partitioned store of chart snapshots with as-of and per-title history queries
+import argparse
+import bisect
+import json
+import os
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from imdb_columnar import save_columnar, load_columnar
+
+SNAPSHOT_ROOT = 'snapshots'
+MANIFEST_NAME = '_manifest.json'
+HISTORY_NAME = '_history.arrow'
+SEGMENT_DIR = '_history'
+COMPACT_SEGMENTS = 32  # pending per-snapshot history files folded into _history.arrow at once
+HISTORY_COLUMNS = ['imdb_id', 'scraped_at', 'position', 'rating', 'title']
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+class SnapshotStore:
+    """Snapshots live in <root>/date=YYYY-MM-DD/<HHMMSS>.arrow and are never rewritten.
+
+    _manifest.json lists every snapshot in time order, so an as-of lookup
+    is a bisect plus one memory-mapped read. A title's history rows
+    (imdb_id, scraped_at, position, rating, title) are written per snapshot
+    to a small _history/<snapshot>.arrow segment; every COMPACT_SEGMENTS
+    snapshots the segments are folded into _history.arrow, sorted by
+    imdb_id. So an append writes only its own rows, and a title's history is
+    a binary search into that file plus a scan of the few pending segments.
+    """
+
+    def __init__(self, root=SNAPSHOT_ROOT):
+        self.root = root
+        self.manifest_path = os.path.join(root, MANIFEST_NAME)
+        self.history_path = os.path.join(root, HISTORY_NAME)
+        self.segment_dir = os.path.join(root, SEGMENT_DIR)
+        self._history = None
+        self._segments = None
+        try:
+            with open(self.manifest_path) as f:
+                self.snapshots = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            self.snapshots = []
+
+    def append(self, df, scraped_at=None):
+        """Store `df` as a new snapshot; returns the partition file path"""
+        if scraped_at is None:
+            if 'scraped_date' in df.columns and df['scraped_date'].notna().any():
+                scraped_at = str(df['scraped_date'].dropna().iloc[0])
+            else:
+                scraped_at = datetime.now().strftime(TIMESTAMP_FORMAT)
+        stamp = pd.Timestamp(scraped_at)
+        scraped_at = stamp.strftime(TIMESTAMP_FORMAT)
+
+        partition = os.path.join(self.root, f"date={stamp.strftime('%Y-%m-%d')}")
+        os.makedirs(partition, exist_ok=True)
+        path = os.path.join(partition, f"{stamp.strftime('%H%M%S')}.arrow")
+        suffix = 1
+        while os.path.exists(path):
+            path = os.path.join(partition, f"{stamp.strftime('%H%M%S')}-{suffix}.arrow")
+            suffix += 1
+        save_columnar(df, path)
+
+        entry = {'scraped_at': scraped_at, 'path': os.path.relpath(path, self.root), 'rows': len(df)}
+        position = bisect.bisect_right([s['scraped_at'] for s in self.snapshots], scraped_at)
+        self.snapshots.insert(position, entry)
+        self._write_manifest()
+        self._add_history(df, scraped_at, entry['path'])
+        return path
+
+    def _write_manifest(self):
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.snapshots, f, indent=1)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _history_rows(self, df, scraped_at):
+        rows = df.reindex(columns=HISTORY_COLUMNS).copy()
+        rows['scraped_at'] = scraped_at
+        rows = rows[rows['imdb_id'].notna() & (rows['imdb_id'].astype(str) != '')]
+        rows['imdb_id'] = rows['imdb_id'].astype(str)
+        rows['title'] = rows['title'].astype(str)
+        rows['position'] = pd.to_numeric(rows['position'], errors='coerce').astype('Int64')
+        rows['rating'] = pd.to_numeric(rows['rating'], errors='coerce').astype(float)
+        return rows
+
+    def _add_history(self, df, scraped_at, snapshot_path):
+        """Write this snapshot's history rows to their own segment; compact once enough pile up"""
+        os.makedirs(self.segment_dir, exist_ok=True)
+        name = snapshot_path.replace(os.sep, '_')
+        rows = self._history_rows(df, scraped_at).sort_values('imdb_id', kind='stable', ignore_index=True)
+        save_columnar(rows, os.path.join(self.segment_dir, name))
+        self._segments = None
+        if len(self._segment_paths()) >= COMPACT_SEGMENTS:
+            self.compact_history()
+
+    def _segment_paths(self):
+        if not os.path.isdir(self.segment_dir):
+            return []
+        return sorted(os.path.join(self.segment_dir, name) for name in os.listdir(self.segment_dir)
+                      if name.endswith('.arrow'))
+
+    def _save_history(self, history, segments=()):
+        """Write the sorted history file, then drop the segments it now contains"""
+        history = history.sort_values(['imdb_id', 'scraped_at'], kind='stable', ignore_index=True)
+        save_columnar(history, self.history_path)
+        for path in segments:
+            os.remove(path)
+        self._history = None
+        self._segments = None
+
+    def compact_history(self):
+        """Fold the pending history segments into _history.arrow; returns how many there were"""
+        segments = self._segment_paths()
+        if segments:
+            self._save_history(self.load_history(), segments)
+        return len(segments)
+
+    def rebuild_history(self):
+        """Recreate _history.arrow from the snapshot files (e.g. after copying partitions in)"""
+        parts = [self._history_rows(self.load(entry), entry['scraped_at']) for entry in self.snapshots]
+        history = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=HISTORY_COLUMNS)
+        self._save_history(history, self._segment_paths())
+
+    def _load_compacted(self):
+        if self._history is None:
+            if os.path.exists(self.history_path):
+                self._history = load_columnar(self.history_path)
+            else:
+                self._history = pd.DataFrame(columns=HISTORY_COLUMNS)
+        return self._history
+
+    def _load_segments(self):
+        if self._segments is None:
+            parts = [load_columnar(path) for path in self._segment_paths()]
+            self._segments = pd.concat(parts, ignore_index=True) if parts else None
+        return self._segments
+
+    def load_history(self):
+        """Every history row, sorted by (imdb_id, scraped_at)"""
+        history, segments = self._load_compacted(), self._load_segments()
+        if segments is None:
+            return history
+        history = pd.concat([history, segments], ignore_index=True)
+        return history.sort_values(['imdb_id', 'scraped_at'], kind='stable', ignore_index=True)
+
+    def load(self, entry, columns=None):
+        return load_columnar(os.path.join(self.root, entry['path']), columns)
+
+    def dates(self):
+        """Distinct snapshot dates, oldest first"""
+        return sorted({entry['scraped_at'][:10] for entry in self.snapshots})
+
+    def snapshot_as_of(self, when):
+        """Manifest entry of the latest snapshot taken at or before `when` (a date means end of that day)"""
+        when = str(when)
+        if len(when) == 10:
+            when += ' 23:59:59'
+        when = pd.Timestamp(when).strftime(TIMESTAMP_FORMAT)
+        index = bisect.bisect_right([entry['scraped_at'] for entry in self.snapshots], when)
+        return self.snapshots[index - 1] if index else None
+
+    def as_of(self, when, columns=None):
+        """The chart as it stood at `when`; None if nothing was stored that early"""
+        entry = self.snapshot_as_of(when)
+        return None if entry is None else self.load(entry, columns)
+
+    def history(self, imdb_id, start=None, end=None):
+        """Rank and rating of one title across every snapshot (optionally within a date range)"""
+        history = self._load_compacted()
+        ids = history['imdb_id'].to_numpy()
+        lo = np.searchsorted(ids, imdb_id, side='left')
+        hi = np.searchsorted(ids, imdb_id, side='right')
+        rows = history.iloc[lo:hi]
+        segments = self._load_segments()
+        if segments is not None:
+            pending = segments[segments['imdb_id'] == imdb_id]
+            if len(pending):
+                rows = pd.concat([rows, pending]).sort_values('scraped_at', kind='stable')
+        if start is not None:
+            rows = rows[rows['scraped_at'] >= str(start)]
+        if end is not None:
+            end = str(end) + (' 23:59:59' if len(str(end)) == 10 else '')
+            rows = rows[rows['scraped_at'] <= end]
+        return rows.reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the stored chart snapshots")
+    parser.add_argument('--root', default=SNAPSHOT_ROOT)
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('list', help="list stored snapshots")
+    as_of = sub.add_parser('as-of', help="the chart on a date, e.g. 2026-03-01")
+    as_of.add_argument('when')
+    as_of.add_argument('--top', type=int, default=10)
+    history = sub.add_parser('history', help="rank/rating history of one title")
+    history.add_argument('imdb_id')
+    history.add_argument('--start')
+    history.add_argument('--end')
+    sub.add_parser('rebuild-index', help="rebuild the per-title history index")
+    sub.add_parser('compact', help="fold pending history segments into the history index")
+    args = parser.parse_args()
+
+    store = SnapshotStore(args.root)
+    if args.command == 'list':
+        for entry in store.snapshots:
+            print(f" {entry['scraped_at']}  {entry['rows']:5} movies  {entry['path']}")
+    elif args.command == 'as-of':
+        entry = store.snapshot_as_of(args.when)
+        if entry is None:
+            print(f" No snapshot on or before {args.when}")
+            return
+        print(f" Chart as of {args.when} (snapshot {entry['scraped_at']}):")
+        chart = store.load(entry).sort_values('position')
+        print(chart[['position', 'title', 'year', 'rating']].head(args.top).to_string(index=False))
+    elif args.command == 'history':
+        print(store.history(args.imdb_id, args.start, args.end).to_string(index=False))
+    elif args.command == 'rebuild-index':
+        store.rebuild_history()
+        print(f" History index rebuilt from {len(store.snapshots)} snapshots")
+    elif args.command == 'compact':
+        pending = store.compact_history()
+        print(f" Folded {pending} history segments into {store.history_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# File: title_fetcher.py
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+RETRIES = 3
+BACKOFF = 0.5
+POOL_SIZE = 16
+
+
+def make_session(headers=None, pool_size=POOL_SIZE):
+    """Create a requests.Session with a connection pool sized for concurrent fetches"""
+    session = requests.Session()
+    size_pool(session, pool_size)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+def size_pool(session, workers):
+    """Make sure `session` keeps at least max(workers, POOL_SIZE) connections per host.
+
+    urllib3 discards (and warns about) connections returned to a full pool,
+    so more threads than pool slots means reconnecting on every request.
+    """
+    pool_size = max(workers, POOL_SIZE)
+    adapter = session.get_adapter('https://')
+    if getattr(adapter, '_pool_maxsize', 0) >= pool_size:
+        return session
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def retry_delay(response, attempt, backoff=BACKOFF):
+    """Seconds to wait before retry `attempt` + 1: exponential backoff, or Retry-After if longer"""
+    delay = backoff * (2 ** attempt)
+    retry_after = response.headers.get('Retry-After') if response is not None else None
+    if retry_after and retry_after.isdigit():
+        delay = max(delay, int(retry_after))
+    return delay
+
+
+class RateLimiter:
+    """Per-host limiter that spaces requests at least 1/rate seconds apart"""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        if not self.interval:
+            return
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class TitleFetcher:
+    """Fetch many pages over one session with bounded concurrency, rate limiting and retries"""
+
+    def __init__(self, session, max_workers=8, rate=10, retries=RETRIES, backoff=BACKOFF, timeout=10):
+        self.session = size_pool(session, max_workers)
+        self.max_workers = max_workers
+        self.limiter = RateLimiter(rate)
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+
+    def fetch(self, url):
+        """Fetch one URL, retrying transient failures with exponential backoff"""
+        for attempt in range(self.retries + 1):
+            self.limiter.wait(url)
+            try:
+                response = self.session.get(url, timeout=self.timeout)
+            except requests.RequestException:
+                response = None
+
+            if response is not None and response.status_code not in RETRY_STATUS:
+                return response
+            if attempt == self.retries:
+                return response
+
+            time.sleep(retry_delay(response, attempt, self.backoff))
+
+        return None
+
+    def fetch_many(self, urls):
+        """Fetch every URL concurrently; returns responses (or None) in input order"""
+        if not urls:
+            return []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return list(pool.map(self.fetch, urls))
@@ -0,0 +1,108 @@
+# File: title_index.py
+# Persistent imdb_id -> (title, year) index that fills missing release years without guessing
+import argparse
+import json
+import os
+import pandas as pd
+from imdb_derive import clean_years
+
+INDEX_PATH = 'title_index.json'
+
+
+class TitleIndex:
+    """Release years seen in earlier scrapes, keyed by imdb_id.
+
+    Only years read from IMDb pages go in (chart JSON-LD datePublished,
+    __NEXT_DATA__ releaseYear, /title/ pages), never imputed ones, so a
+    lookup returns what the site said. The file is a sorted JSON object;
+    the same entries always serialize to the same bytes.
+    """
+
+    def __init__(self, path=INDEX_PATH):
+        self.path = path
+        self.entries = {}
+        self.changed = False
+        try:
+            with open(path) as f:
+                self.entries = {imdb_id: tuple(entry) for imdb_id, entry in json.load(f).items()}
+        except (OSError, json.JSONDecodeError):
+            pass
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, imdb_id):
+        """(title, year) or None"""
+        return self.entries.get(imdb_id)
+
+    def add(self, imdb_id, title, year):
+        if not imdb_id or year is None or pd.isna(year):
+            return
+        entry = (str(title), int(year))
+        if self.entries.get(imdb_id) != entry:
+            self.entries[imdb_id] = entry
+            self.changed = True
+
+    def add_rows(self, rows):
+        """Record every row (dicts or a frame) that carries an id and a parseable year"""
+        df = pd.DataFrame(rows)
+        if df.empty or 'imdb_id' not in df.columns or 'year' not in df.columns:
+            return 0
+        years = clean_years(df['year'])
+        known = years.notna() & df['imdb_id'].notna() & (df['imdb_id'].astype(str) != '')
+        titles = df['title'] if 'title' in df.columns else pd.Series('', index=df.index)
+        for imdb_id, title, year in zip(df.loc[known, 'imdb_id'], titles[known], years[known]):
+            self.add(str(imdb_id), title, year)
+        return int(known.sum())
+
+    def years_for(self, imdb_ids):
+        """Indexed year per id (NaN when unknown); one dict lookup per id, same index as the input"""
+        ids = pd.Series(imdb_ids)
+        entries = self.entries
+        years = [entries[imdb_id][1] if imdb_id in entries else None for imdb_id in ids]
+        return pd.to_numeric(pd.Series(years, index=ids.index, dtype=object), errors='coerce').astype(float)
+
+    def save(self):
+        """Write the index if anything changed (atomically, keys sorted)"""
+        if not self.changed:
+            return False
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({imdb_id: list(entry) for imdb_id, entry in self.entries.items()}, f,
+                      sort_keys=True, indent=0)
+        os.replace(tmp_path, self.path)
+        self.changed = False
+        return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or rebuild the imdb_id -> (title, year) index")
+    parser.add_argument('--path', default=INDEX_PATH)
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('stats', help="number of indexed titles")
+    lookup = sub.add_parser('lookup', help="indexed title and year of some ids")
+    lookup.add_argument('imdb_ids', nargs='+')
+    rebuild = sub.add_parser('rebuild', help="add the years found in saved chart pages")
+    rebuild.add_argument('pages', nargs='+', help="saved chart pages or directories of them")
+    args = parser.parse_args()
+
+    index = TitleIndex(args.path)
+    if args.command == 'stats':
+        print(f" {len(index)} titles indexed in {args.path}")
+    elif args.command == 'lookup':
+        for imdb_id in args.imdb_ids:
+            entry = index.get(imdb_id)
+            print(f" {imdb_id:12} " + (f"{entry[1]}  {entry[0]}" if entry else "not indexed"))
+    elif args.command == 'rebuild':
+        from Task_01_imdb_scraper import IMDBScaper
+        scraper = IMDBScaper()
+        for page in args.pages:
+            for rows in scraper.parse_snapshots(page).values():
+                index.add_rows(rows or [])
+        index.save()
+        print(f" {len(index)} titles indexed in {args.path}")
+
+
+if __name__ == "__main__":
+    main()
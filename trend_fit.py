@@ -0,0 +1,71 @@
+# File: trend_fit.py
+# One-pass, mergeable least-squares trend lines (slope, intercept and r together)
+import numpy as np
+from eda_streaming import CoMoments
+
+
+class Trend:
+    """A fitted line y = slope * x + intercept over x_min..x_max"""
+
+    def __init__(self, slope, intercept, r, n, x_min, x_max):
+        self.slope = slope
+        self.intercept = intercept
+        self.r = r
+        self.n = n
+        self.x_min = x_min
+        self.x_max = x_max
+
+    def __call__(self, x):
+        return self.slope * np.asarray(x, dtype=float) + self.intercept
+
+    def endpoints(self):
+        """Two points that draw the whole line, so callers never sort the data"""
+        xs = np.array([self.x_min, self.x_max])
+        return xs, self(xs)
+
+
+class LineFit(CoMoments):
+    """Sufficient statistics for simple linear regression.
+
+    Holds n, the means and the centred sums Sxx, Syy, Sxy: the same
+    information as (n, Σx, Σy, Σxy, Σx², Σy²) but without the cancellation
+    that raw power sums suffer on columns like year. Chunks and partitions
+    merge with CoMoments.merge; optional weights count each (x, y) that many
+    times, for aggregated cube cells.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.x_min = np.inf
+        self.x_max = -np.inf
+
+    def update(self, x, y, weights=None):
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        w = np.ones(len(x)) if weights is None else np.asarray(weights, dtype=float)
+        keep = ~(np.isnan(x) | np.isnan(y) | np.isnan(w)) & (w > 0)
+        x, y, w = x[keep], y[keep], w[keep]
+        if len(x) == 0:
+            return self
+        chunk = LineFit()
+        chunk.n = w.sum()
+        chunk.mean_x, chunk.mean_y = (w @ x) / chunk.n, (w @ y) / chunk.n
+        dx, dy = x - chunk.mean_x, y - chunk.mean_y
+        chunk.m2_x, chunk.m2_y, chunk.c_xy = (w * dx) @ dx, (w * dy) @ dy, (w * dx) @ dy
+        chunk.x_min, chunk.x_max = x.min(), x.max()
+        return self.merge(chunk)
+
+    def merge(self, other):
+        x_min, x_max = min(self.x_min, other.x_min), max(self.x_max, other.x_max)
+        super().merge(other)
+        self.x_min, self.x_max = x_min, x_max
+        return self
+
+    def result(self):
+        slope = self.c_xy / self.m2_x if self.m2_x else np.nan
+        return Trend(slope, self.mean_y - slope * self.mean_x, self.corr, self.n, self.x_min, self.x_max)
+
+
+def fit_line(x, y, weights=None):
+    """Least-squares line of y on x in one pass"""
+    return LineFit().update(x, y, weights).result()